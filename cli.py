@@ -1,8 +1,6 @@
-from src.core.log import configure_logging
 from src.app.typer import app
 
-# Configure logging on startup
-configure_logging()
+# Logging is configured by the commands that need it, keeping trivial commands fast
 
 if __name__ == "__main__":
     app()
@@ -1,6 +1,7 @@
 import typer
 from typing import Optional
-from src.modules.agent.commands import app as agent_app, run_agent_command
+from src.core.profiling import ProfileMode
+from src.modules.agent.commands import OutputMode, app as agent_app, run_agent_command
 
 
 app = typer.Typer(help="Information-to-Action Agent CLI")
@@ -14,12 +15,39 @@ def ping_command():
 
 @app.command(name="run")
 def run_command(
-    url: Optional[str] = typer.Option(None, "--url", "-u", help="URL to an article or YouTube video"),
+    url: Optional[str] = typer.Option(None, "--url", "-u", help="URL to an article, YouTube video, playlist or channel"),
     text: Optional[str] = typer.Option(None, "--text", "-t", help="Direct text input"),
-    auto_schedule: bool = typer.Option(False, "--auto-schedule", help="Auto-schedule all actions without asking")
+    file: Optional[str] = typer.Option(None, "--file", "-f", help="Local text, Markdown or HTML file (streamed in chunks)"),
+    auto_schedule: bool = typer.Option(False, "--auto-schedule", help="Auto-schedule all actions without asking"),
+    calendars: Optional[list[str]] = typer.Option(
+        None, "--calendar", "-c", help="Schedule into ACCOUNT[/CALENDAR_ID] (repeatable; default: CALENDAR_ACCOUNTS)"
+    ),
+    server: Optional[str] = typer.Option(None, "--server", help="Submit work to a running `agent serve` at this URL"),
+    timings: bool = typer.Option(False, "--timings", help="Print a per-stage timing breakdown at exit"),
+    metrics_out: Optional[str] = typer.Option(
+        None, "--metrics-out", help="Export metrics to a Prometheus textfile (or JSON with a .json suffix)"
+    ),
+    profile_mode: Optional[ProfileMode] = typer.Option(
+        None, "--profile", help="Profile the run (cpu: cProfile + sampled stacks, mem: tracemalloc) into logs/"
+    ),
+    output: OutputMode = typer.Option(
+        OutputMode.text, "--output", "-o",
+        help="jsonl: no rendering or prompts; one JSON record per item and stage on stdout (inputs from stdin if none given)"
+    )
 ):
     """Run the full agent workflow: summarize, extract actions, and schedule."""
-    run_agent_command(url=url, text=text, auto_schedule=auto_schedule)
+    run_agent_command(
+        url=url,
+        text=text,
+        file=file,
+        auto_schedule=auto_schedule,
+        calendars=calendars,
+        server=server,
+        timings=timings,
+        metrics_out=metrics_out,
+        profile_mode=profile_mode,
+        output=output
+    )
 
 
 # Add agent commands as a sub-app
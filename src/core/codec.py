@@ -0,0 +1,246 @@
+"""Compact binary encoding for stored records.
+
+Records (job payloads and results, dumped DTOs) are encoded in the MessagePack wire
+format, restricted to the types the stores need: None, bool, int, float, str, bytes,
+lists, dicts and datetimes. Strings are stored as raw UTF-8, so large article and
+transcript texts are never escaped (JSON spends six bytes on each non-ASCII character);
+strings above a threshold can also be zlib-compressed, stored as an extension type.
+Encoded records start with a short magic header.
+"""
+import datetime
+import struct
+import zlib
+from typing import Any, Optional
+
+# Serialized layout: magic, version, then one MessagePack value
+_HEADER = struct.Struct("<3sB")
+_MAGIC = b"AGR"
+_VERSION = 1
+
+# Extension types
+_EXT_ZSTR = 1  # zlib-compressed UTF-8 string
+_EXT_DATETIME = 2  # ISO 8601 string
+
+# Fast, and still several times smaller for prose
+COMPRESS_LEVEL = 1
+
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+_I8 = struct.Struct(">b")
+_I16 = struct.Struct(">h")
+_I32 = struct.Struct(">i")
+_I64 = struct.Struct(">q")
+_F64 = struct.Struct(">d")
+
+
+def dumps(obj: Any, compress_min: Optional[int] = None) -> bytes:
+    """
+    Encode a record.
+
+    Args:
+        obj: Value built from None, bool, int, float, str, bytes, list/tuple, dict and datetime
+        compress_min: Compress UTF-8 strings of at least this many bytes; None disables compression
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        TypeError: If the value contains an unsupported type
+    """
+    out = bytearray(_HEADER.pack(_MAGIC, _VERSION))
+    _pack(obj, out, compress_min)
+    return bytes(out)
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode a record written by `dumps`.
+
+    Raises:
+        ValueError: If the data is not an encoded record
+    """
+    if len(data) < _HEADER.size or _HEADER.unpack_from(data)[0] != _MAGIC:
+        raise ValueError("Not an encoded record")
+    version = _HEADER.unpack_from(data)[1]
+    if version != _VERSION:
+        raise ValueError(f"Unsupported record version {version}")
+    try:
+        obj, position = _unpack(data, _HEADER.size)
+    except (IndexError, struct.error, zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt record: {e}") from None
+    if position != len(data):
+        raise ValueError("Corrupt record: trailing data")
+    return obj
+
+
+def _pack(obj: Any, out: bytearray, compress_min: Optional[int]) -> None:
+    if obj is None:
+        out += b"\xc0"
+    elif obj is True:
+        out += b"\xc3"
+    elif obj is False:
+        out += b"\xc2"
+    elif isinstance(obj, str):
+        data = obj.encode()
+        if compress_min is not None and len(data) >= compress_min:
+            compressed = zlib.compress(data, COMPRESS_LEVEL)
+            if len(compressed) < len(data):
+                _pack_ext(_EXT_ZSTR, compressed, out)
+                return
+        _pack_header(len(data), 0xa0, 0x1f, b"\xd9", b"\xda", b"\xdb", out)
+        out += data
+    elif isinstance(obj, int):
+        _pack_int(obj, out)
+    elif isinstance(obj, float):
+        out += b"\xcb" + _F64.pack(obj)
+    elif isinstance(obj, dict):
+        _pack_header(len(obj), 0x80, 0x0f, None, b"\xde", b"\xdf", out)
+        for key, value in obj.items():
+            _pack(key, out, compress_min)
+            _pack(value, out, compress_min)
+    elif isinstance(obj, (list, tuple)):
+        _pack_header(len(obj), 0x90, 0x0f, None, b"\xdc", b"\xdd", out)
+        for item in obj:
+            _pack(item, out, compress_min)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        _pack_header(len(data), None, 0, b"\xc4", b"\xc5", b"\xc6", out)
+        out += data
+    elif isinstance(obj, datetime.datetime):
+        _pack_ext(_EXT_DATETIME, obj.isoformat().encode(), out)
+    else:
+        raise TypeError(f"Cannot encode {type(obj).__name__}")
+
+
+def _pack_header(
+    length: int,
+    fix: Optional[int],
+    fix_max: int,
+    tag8: Optional[bytes],
+    tag16: bytes,
+    tag32: bytes,
+    out: bytearray
+) -> None:
+    if fix is not None and length <= fix_max:
+        out.append(fix | length)
+    elif tag8 is not None and length <= 0xff:
+        out += tag8 + _U8.pack(length)
+    elif length <= 0xffff:
+        out += tag16 + _U16.pack(length)
+    else:
+        out += tag32 + _U32.pack(length)
+
+
+def _pack_int(value: int, out: bytearray) -> None:
+    if 0 <= value <= 0x7f:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xff)
+    elif value < 0:
+        if value >= -0x80:
+            out += b"\xd0" + _I8.pack(value)
+        elif value >= -0x8000:
+            out += b"\xd1" + _I16.pack(value)
+        elif value >= -0x80000000:
+            out += b"\xd2" + _I32.pack(value)
+        elif value >= -0x8000000000000000:
+            out += b"\xd3" + _I64.pack(value)
+        else:
+            raise TypeError(f"Integer out of range: {value}")
+    elif value <= 0xff:
+        out += b"\xcc" + _U8.pack(value)
+    elif value <= 0xffff:
+        out += b"\xcd" + _U16.pack(value)
+    elif value <= 0xffffffff:
+        out += b"\xce" + _U32.pack(value)
+    elif value <= 0xffffffffffffffff:
+        out += b"\xcf" + _U64.pack(value)
+    else:
+        raise TypeError(f"Integer out of range: {value}")
+
+
+def _pack_ext(code: int, data: bytes, out: bytearray) -> None:
+    _pack_header(len(data), None, 0, b"\xc7", b"\xc8", b"\xc9", out)
+    out.append(code)
+    out += data
+
+
+# Fixed-width formats: tag -> struct
+_SCALARS = {
+    0xcc: _U8, 0xcd: _U16, 0xce: _U32, 0xcf: _U64,
+    0xd0: _I8, 0xd1: _I16, 0xd2: _I32, 0xd3: _I64,
+    0xcb: _F64,
+}
+# Length-prefixed formats: tag -> (length struct, kind)
+_SIZED = {
+    0xd9: (_U8, "str"), 0xda: (_U16, "str"), 0xdb: (_U32, "str"),
+    0xc4: (_U8, "bin"), 0xc5: (_U16, "bin"), 0xc6: (_U32, "bin"),
+    0xc7: (_U8, "ext"), 0xc8: (_U16, "ext"), 0xc9: (_U32, "ext"),
+    0xdc: (_U16, "array"), 0xdd: (_U32, "array"),
+    0xde: (_U16, "map"), 0xdf: (_U32, "map"),
+}
+
+
+def _unpack(data: bytes, position: int) -> tuple[Any, int]:
+    tag = data[position]
+    position += 1
+    if tag <= 0x7f:
+        return tag, position
+    if tag >= 0xe0:
+        return tag - 0x100, position
+    if 0xa0 <= tag <= 0xbf:
+        end = position + (tag & 0x1f)
+        return data[position:end].decode(), end
+    if 0x90 <= tag <= 0x9f:
+        return _unpack_array(data, position, tag & 0x0f)
+    if 0x80 <= tag <= 0x8f:
+        return _unpack_map(data, position, tag & 0x0f)
+    if tag == 0xc0:
+        return None, position
+    if tag == 0xc2:
+        return False, position
+    if tag == 0xc3:
+        return True, position
+    scalar = _SCALARS.get(tag)
+    if scalar is not None:
+        return scalar.unpack_from(data, position)[0], position + scalar.size
+    sized = _SIZED.get(tag)
+    if sized is None:
+        raise ValueError(f"Corrupt record: unsupported tag 0x{tag:02x}")
+    length_struct, kind = sized
+    length = length_struct.unpack_from(data, position)[0]
+    position += length_struct.size
+    if kind == "array":
+        return _unpack_array(data, position, length)
+    if kind == "map":
+        return _unpack_map(data, position, length)
+    if kind == "ext":
+        code = data[position]
+        position += 1
+        end = position + length
+        if code == _EXT_ZSTR:
+            return zlib.decompress(data[position:end]).decode(), end
+        if code == _EXT_DATETIME:
+            return datetime.datetime.fromisoformat(data[position:end].decode()), end
+        raise ValueError(f"Corrupt record: unsupported extension type {code}")
+    end = position + length
+    chunk = data[position:end]
+    return (chunk.decode() if kind == "str" else bytes(chunk)), end
+
+
+def _unpack_array(data: bytes, position: int, length: int) -> tuple[list, int]:
+    items = []
+    for _ in range(length):
+        item, position = _unpack(data, position)
+        items.append(item)
+    return items, position
+
+
+def _unpack_map(data: bytes, position: int, length: int) -> tuple[dict, int]:
+    result = {}
+    for _ in range(length):
+        key, position = _unpack(data, position)
+        result[key], position = _unpack(data, position)
+    return result, position
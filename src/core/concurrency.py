@@ -0,0 +1,46 @@
+"""Bounded thread-pool helpers for I/O-bound fan-out."""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def imap_unordered(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = 4,
+    max_pending: int = 0
+) -> Iterator[tuple[T, "Future[R]"]]:
+    """
+    Apply `fn` to items on a thread pool, yielding results as they complete.
+
+    At most `max_pending` calls are queued or running at a time, so a long input never
+    materializes all its results at once and a slow consumer applies backpressure.
+
+    Args:
+        fn: Function to call per item
+        items: Input items, consumed lazily
+        max_workers: Pool size
+        max_pending: Maximum submitted but not yet yielded calls (default: 2 * max_workers)
+
+    Yields:
+        `(item, future)` pairs in completion order; `future.result()` returns or raises
+    """
+    max_pending = max_pending or 2 * max_workers
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch") as executor:
+        pending = {executor.submit(fn, item): item for item in islice(items, max_pending)}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    for refill in islice(items, 1):
+                        pending[executor.submit(fn, refill)] = refill
+                    yield item, future
+        finally:
+            # Consumer stopped early: don't start the calls that are still queued
+            for future in pending:
+                future.cancel()
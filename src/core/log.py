@@ -1,10 +1,17 @@
-"""Logging configuration."""
+"""Logging configuration.
+
+Records are put on an in-memory queue by the calling thread and written to disk by a
+QueueListener thread, so file I/O never blocks request or worker threads.
+"""
+import copy
+import datetime
+import json
 import logging
-import logging.config
+import logging.handlers
 from pathlib import Path
 from uuid import uuid4
 
-from src.core.settings import settings
+_configured = False
 
 
 class AddErrorIdFilter(logging.Filter):
@@ -16,8 +23,57 @@ class AddErrorIdFilter(logging.Filter):
         return True
 
 
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that merges message args but leaves formatting to the listener's handlers.
+
+    The stock QueueHandler renders the full formatted line (traceback included) into `msg`,
+    which would defeat structured formatters downstream.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects (JSON Lines)."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "error_id", None):
+            entry["error_id"] = record.error_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
 def configure_logging():
-    """Configure logging with rotating file handler."""
+    """Configure queued logging to a rotating file handler (idempotent)."""
+    global _configured
+    if _configured:
+        return
+    
+    # Imported here so that importing this module doesn't load pydantic-settings
+    import atexit
+    import logging.config
+    from src.core.settings import get_settings
+    
+    settings = get_settings()
     
     # Standard format for all logs
     default_fmt = {
@@ -25,59 +81,65 @@ def configure_logging():
     }
 
     # Ensure log file directory exists
-    log_filepath = "logs/logs.log"
+    log_filepath = "logs/logs.jsonl" if settings.LOG_FORMAT == "json" else "logs/logs.log"
     Path(log_filepath).parent.mkdir(parents=True, exist_ok=True)
 
     logging_configuration = {
         "version": 1,
         "disable_existing_loggers": False,
         "filters": {"add_error_id": {"()": AddErrorIdFilter}},
-        "formatters": {"default": default_fmt},
+        "formatters": {"default": default_fmt, "json": {"()": JsonFormatter}},
         "handlers": {
             "file": {
                 "class": "logging.handlers.RotatingFileHandler",
-                "formatter": "default",
+                "formatter": "json" if settings.LOG_FORMAT == "json" else "default",
                 "filename": log_filepath,
                 "maxBytes": 3 * 1024 * 1024,  # 3MB
                 "backupCount": 10,
                 "encoding": "utf-8",
+            },
+            # Only the queue handler is attached to loggers; the listener thread owns the file
+            "queue": {
+                "class": "src.core.log.RecordQueueHandler",
+                "handlers": ["file"],
+                "respect_handler_level": True,
                 "filters": ["add_error_id"],
             },
         },
         "root": {
-            "handlers": ["file"],
+            "handlers": ["queue"],
             "level": "INFO",
             "filters": ["add_error_id"],
         },
         "loggers": {
             "src": {
-                "handlers": ["file"],
+                "handlers": ["queue"],
                 "level": settings.LOG_LEVEL,
                 "propagate": False
             },
             # Suppress noisy third-party loggers
             "google": {
-                "handlers": ["file"],
+                "handlers": ["queue"],
                 "level": "WARNING",
                 "propagate": False
             },
             "googleapiclient": {
-                "handlers": ["file"],
+                "handlers": ["queue"],
                 "level": "WARNING",
                 "propagate": False
             },
             "google_auth_oauthlib": {
-                "handlers": ["file"],
+                "handlers": ["queue"],
                 "level": "WARNING",
                 "propagate": False
             },
             "urllib3": {
-                "handlers": ["file"],
+                "handlers": ["queue"],
                 "level": "WARNING",
                 "propagate": False
             },
             "requests": {
-                "handlers": ["file"],
+                "handlers": ["queue"],
                 "level": "WARNING",
                 "propagate": False
             },
@@ -85,3 +147,8 @@ def configure_logging():
     }
 
     logging.config.dictConfig(logging_configuration)
+    listener = logging.getHandlerByName("queue").listener
+    listener.start()
+    # Drain the queue before the interpreter exits
+    atexit.register(listener.stop)
+    _configured = True
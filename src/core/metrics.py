@@ -0,0 +1,239 @@
+"""In-process metrics: timed spans, counters and latency histograms.
+
+Spans wrap pipeline stages (`kind="stage"`) and external calls (`kind="call"`). Each
+finished span feeds the latency histogram and counters, so the registry can be exported
+as a Prometheus textfile or a JSON dump at any time.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Finished spans kept for breakdowns; counters and histograms are unbounded aggregates
+MAX_SPANS = 10_000
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Span:
+    """A timed unit of work with free-form attributes (sizes, cache flags, ...)."""
+    name: str
+    kind: str
+    parent: Optional[str] = None
+    attributes: dict = field(default_factory=dict)
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    def set(self, **attributes) -> None:
+        """Attach attributes, e.g. `span.set(bytes=len(body), cache_hit=False)`."""
+        self.attributes.update(attributes)
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=lambda: [0] * len(DEFAULT_BUCKETS))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+@dataclass
+class StageTiming:
+    """Aggregated timings of one span name."""
+    name: str
+    kind: str
+    calls: int
+    total: float
+    max: float
+    errors: int
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, **extra) -> str:
+    pairs = list(labels) + [(key, str(value)) for key, value in extra.items()]
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, histograms and recent spans."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._spans: deque[Span] = deque(maxlen=MAX_SPANS)
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Increment a counter."""
+        key = _labels(**labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record a histogram observation."""
+        key = _labels(**labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            series.setdefault(key, Histogram()).observe(value)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "stage", **attributes) -> Iterator[Span]:
+        """
+        Time a block of work and record it on exit.
+
+        Args:
+            name: Span name, e.g. "summarize" or "gemini.generate_content"
+            kind: "stage" for pipeline stages, "call" for external calls
+            **attributes: Initial attributes; more can be added with `span.set()`
+
+        Yields:
+            The live Span
+        """
+        parent = _current_span.get()
+        span = Span(name=name, kind=kind, parent=parent.name if parent else None, attributes=attributes)
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            _current_span.reset(token)
+            self._record(span)
+
+    def _record(self, span: Span) -> None:
+        status = "error" if span.error else "ok"
+        self.observe("agent_span_duration_seconds", span.duration, span=span.name, kind=span.kind)
+        self.inc("agent_span_total", span=span.name, kind=span.kind, status=status)
+        for key, value in span.attributes.items():
+            if key == "cache_hit" and value is not None:
+                self.inc("agent_cache_total", span=span.name, result="hit" if value else "miss")
+            elif key.endswith(("bytes", "chars")) and isinstance(value, int):
+                self.inc(f"agent_{key}_total", value, span=span.name)
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> list[Span]:
+        """Recently finished spans, oldest first."""
+        with self._lock:
+            return list(self._spans)
+
+    def timings(self) -> list[StageTiming]:
+        """Per-span-name aggregates in first-seen order."""
+        timings: dict[tuple[str, str], StageTiming] = {}
+        for span in self.spans():
+            timing = timings.setdefault(
+                (span.name, span.kind),
+                StageTiming(name=span.name, kind=span.kind, calls=0, total=0.0, max=0.0, errors=0)
+            )
+            timing.calls += 1
+            timing.total += span.duration
+            timing.max = max(timing.max, span.duration)
+            timing.errors += 1 if span.error else 0
+        return list(timings.values())
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in series.items():
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{name}_bucket{_format_labels(labels, le=f'{bound:g}')} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total:.6f}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        """JSON-serializable snapshot of counters, histograms and span timings."""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(labels), "value": value} for labels, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(labels),
+                        "buckets": dict(zip((f"{b:g}" for b in h.buckets), h.counts)),
+                        "sum": h.total,
+                        "count": h.count,
+                    }
+                    for labels, h in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+        timings = [
+            {"name": t.name, "kind": t.kind, "calls": t.calls, "total": t.total, "mean": t.mean,
+             "max": t.max, "errors": t.errors}
+            for t in self.timings()
+        ]
+        return {"counters": counters, "histograms": histograms, "timings": timings}
+
+    def write(self, path: str | Path) -> Path:
+        """
+        Export metrics to a file, atomically.
+
+        A `.json` suffix writes a JSON dump; anything else writes a Prometheus textfile
+        (suitable for the node_exporter textfile collector).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            body = json.dumps(self.to_dict(), indent=2)
+        else:
+            body = self.to_prometheus()
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(body, encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    def reset(self) -> None:
+        """Drop all recorded data."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._spans.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,171 @@
+"""CPU and memory profiling hooks for agent runs.
+
+`cpu` runs cProfile alongside a lightweight stack sampler and writes a `.pstats` file
+(snakeviz, `python -m pstats`) and a `.collapsed` file of folded stacks (flamegraph.pl,
+speedscope). `mem` traces allocations with tracemalloc and writes a `.tracemalloc`
+snapshot loadable with `tracemalloc.Snapshot.load`.
+"""
+import datetime
+import io
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = Path("logs")
+
+
+class ProfileMode(str, Enum):
+    """Supported profilers."""
+    cpu = "cpu"
+    mem = "mem"
+
+
+@dataclass
+class ProfileReport:
+    """Files written by a profiling session and a top-N text summary."""
+    mode: ProfileMode
+    files: list[Path] = field(default_factory=list)
+    summary: str = ""
+
+
+class StackSampler:
+    """Samples Python stacks of all threads at a fixed interval into folded-stack counts."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        # Frame labels per code object; keeps the sampler cheap since cProfile also sees this thread
+        labels: dict = {}
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = (
+                            f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                        )
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write_collapsed(self, path: Path) -> None:
+        """Write samples in the `frame;frame;frame count` folded format."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile(
+    mode: ProfileMode,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    top: int = 20
+) -> Iterator[ProfileReport]:
+    """
+    Profile the enclosed block.
+
+    Args:
+        mode: `cpu` or `mem`
+        output_dir: Directory for profile files
+        top: Number of entries in the printed summary
+
+    Yields:
+        ProfileReport, filled in when the block exits (also on error)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = output_dir / f"profile-{mode.value}-{datetime.datetime.now():%Y%m%d-%H%M%S}"
+    report = ProfileReport(mode=mode)
+    if mode is ProfileMode.cpu:
+        with _profile_cpu(stem, top, report):
+            yield report
+    else:
+        with _profile_mem(stem, top, report):
+            yield report
+    logger.info("Profile written: %s", ', '.join(str(path) for path in report.files))
+
+
+@contextmanager
+def _profile_cpu(stem: Path, top: int, report: ProfileReport) -> Iterator[None]:
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+    sampler.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+
+        pstats_path = stem.with_suffix(".pstats")
+        profiler.dump_stats(pstats_path)
+        collapsed_path = stem.with_suffix(".collapsed")
+        sampler.write_collapsed(collapsed_path)
+        report.files = [pstats_path, collapsed_path]
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        report.summary = buffer.getvalue().strip()
+
+
+@contextmanager
+def _profile_mem(stem: Path, top: int, report: ProfileReport) -> Iterator[None]:
+    import tracemalloc
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(25)
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if not already_tracing:
+            tracemalloc.stop()
+
+        snapshot_path = stem.with_suffix(".tracemalloc")
+        snapshot.dump(str(snapshot_path))
+        report.files = [snapshot_path]
+
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        snapshot = snapshot.filter_traces(ignore)
+        lines = [f"Current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB", "", f"Top {top} allocations:"]
+        lines += [f"  {stat}" for stat in snapshot.statistics("lineno")[:top]]
+        lines += ["", f"Top {top} growth since start:"]
+        lines += [f"  {stat}" for stat in snapshot.compare_to(baseline.filter_traces(ignore), "lineno")[:top]]
+        report.summary = "\n".join(lines)
@@ -0,0 +1,220 @@
+"""Host-wide API quota shared by all agent processes.
+
+Each quota is a token bucket stored in one SQLite database, so every process on the host
+draws from the same budget. Updates run in `BEGIN IMMEDIATE` transactions, which SQLite
+serializes across processes. Waiting callers queue per bucket and are served round-robin
+by process (the process served least recently goes first), so one busy process cannot
+starve the others.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+GEMINI_REQUESTS = "gemini.requests"
+GEMINI_TOKENS = "gemini.tokens"
+CALENDAR_WRITES = "calendar.writes"
+
+
+class QuotaTimeout(TimeoutError):
+    """Raised when quota could not be acquired within the timeout."""
+
+
+@dataclass(frozen=True)
+class QuotaLimit:
+    """Token bucket parameters: burst size and refill rate."""
+    capacity: float
+    per_second: float
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "QuotaLimit":
+        return cls(capacity=limit, per_second=limit / 60)
+
+
+class QuotaManager:
+    """Cross-process token buckets backed by SQLite."""
+
+    def __init__(
+        self,
+        path: Path,
+        limits: dict[str, QuotaLimit],
+        poll_interval: float = 0.25,
+        stale_after: float = 10.0
+    ):
+        self.path = path
+        self.limits = limits
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        # Longest sleep between checks, keeping the waiter's heartbeat well within `stale_after`
+        self.max_sleep = stale_after / 4
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not be shared with a forked child
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn_pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS waiters (
+                    ticket INTEGER PRIMARY KEY AUTOINCREMENT,
+                    bucket TEXT NOT NULL,
+                    client TEXT NOT NULL,
+                    heartbeat REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS clients (
+                    bucket TEXT NOT NULL,
+                    client TEXT NOT NULL,
+                    last_served REAL NOT NULL,
+                    PRIMARY KEY (bucket, client)
+                );
+            """)
+        return self._conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _refill(self, conn: sqlite3.Connection, bucket: str, now: float) -> float:
+        limit = self.limits[bucket]
+        row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (bucket,)).fetchone()
+        if row is None:
+            return limit.capacity
+        tokens, updated = row
+        return min(limit.capacity, tokens + max(now - updated, 0) * limit.per_second)
+
+    def _store(self, conn: sqlite3.Connection, bucket: str, tokens: float, now: float) -> None:
+        conn.execute(
+            "INSERT INTO buckets (name, tokens, updated) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+            (bucket, tokens, now)
+        )
+
+    def acquire(self, bucket: str, amount: float = 1, timeout: Optional[float] = None) -> float:
+        """
+        Take `amount` tokens from a bucket, waiting for them if needed.
+
+        Args:
+            bucket: Bucket name
+            amount: Tokens to take (clamped to the bucket capacity)
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            QuotaTimeout: If the tokens were not available within `timeout`
+        """
+        if bucket not in self.limits:
+            return 0.0
+        amount = min(amount, self.limits[bucket].capacity)
+        client = str(os.getpid())
+        start = time.time()
+        with self._transaction() as conn:
+            ticket = conn.execute(
+                "INSERT INTO waiters (bucket, client, heartbeat) VALUES (?, ?, ?)", (bucket, client, start)
+            ).lastrowid
+        try:
+            while True:
+                with self._transaction() as conn:
+                    now = time.time()
+                    # Forget waiters of crashed processes
+                    conn.execute("DELETE FROM waiters WHERE heartbeat < ?", (now - self.stale_after,))
+                    conn.execute("UPDATE waiters SET heartbeat = ? WHERE ticket = ?", (now, ticket))
+                    head = conn.execute(
+                        "SELECT w.ticket FROM waiters w "
+                        "LEFT JOIN clients c ON c.bucket = w.bucket AND c.client = w.client "
+                        "WHERE w.bucket = ? ORDER BY COALESCE(c.last_served, 0), w.ticket LIMIT 1",
+                        (bucket,)
+                    ).fetchone()
+                    tokens = self._refill(conn, bucket, now)
+                    if head and head[0] == ticket and tokens >= amount:
+                        self._store(conn, bucket, tokens - amount, now)
+                        conn.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+                        conn.execute(
+                            "INSERT INTO clients (bucket, client, last_served) VALUES (?, ?, ?) "
+                            "ON CONFLICT (bucket, client) DO UPDATE SET last_served = excluded.last_served",
+                            (bucket, client, now)
+                        )
+                        ticket = None
+                        waited = now - start
+                        metrics.observe("agent_quota_wait_seconds", waited, bucket=bucket)
+                        if waited > 1:
+                            logger.debug("Waited %.1fs for %s quota", waited, bucket)
+                        return waited
+                if timeout is not None and now - start >= timeout:
+                    raise QuotaTimeout(f"No {bucket} quota within {timeout}s")
+                # Sleep until the bucket has refilled rather than polling the shared database;
+                # waiters behind another one check back every poll_interval at most
+                wait = max(amount - tokens, 0) / self.limits[bucket].per_second
+                if not (head and head[0] == ticket):
+                    wait = max(wait, self.poll_interval)
+                if timeout is not None:
+                    wait = min(wait, start + timeout - now)
+                time.sleep(min(max(wait, 0.005), self.max_sleep))
+        finally:
+            if ticket is not None:
+                with self._transaction() as conn:
+                    conn.execute("DELETE FROM waiters WHERE ticket = ?", (ticket,))
+
+    def consume(self, bucket: str, amount: float) -> None:
+        """Take tokens without waiting, e.g. to account for actual usage after a call; may go negative."""
+        if bucket not in self.limits or not amount:
+            return
+        with self._transaction() as conn:
+            now = time.time()
+            self._store(conn, bucket, self._refill(conn, bucket, now) - amount, now)
+
+    def drain(self, bucket: str) -> None:
+        """Empty a bucket, making every process back off (e.g. after a 429 response)."""
+        if bucket not in self.limits:
+            return
+        with self._transaction() as conn:
+            now = time.time()
+            self._store(conn, bucket, min(self._refill(conn, bucket, now), 0.0), now)
+
+    def available(self, bucket: str) -> float:
+        """Tokens currently in a bucket."""
+        with self._transaction() as conn:
+            return self._refill(conn, bucket, time.time())
+
+
+@lru_cache(maxsize=1)
+def get_quota_manager() -> Optional[QuotaManager]:
+    """The host-wide quota manager configured in settings, or None if quotas are disabled."""
+    from src.core.settings import STORAGE_DIR, get_settings
+
+    settings = get_settings()
+    if not settings.QUOTA_ENABLED:
+        return None
+    return QuotaManager(STORAGE_DIR / 'quota.sqlite3', {
+        GEMINI_REQUESTS: QuotaLimit.per_minute(settings.GEMINI_RPM),
+        GEMINI_TOKENS: QuotaLimit.per_minute(settings.GEMINI_TPM),
+        CALENDAR_WRITES: QuotaLimit.per_minute(settings.CALENDAR_WRITES_PER_MINUTE),
+    })
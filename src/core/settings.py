@@ -1,6 +1,12 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+STORAGE_DIR = BASE_DIR / "storage"
+
 
 class CustomBaseSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -11,6 +17,41 @@ class CustomBaseSettings(BaseSettings):
 class Settings(CustomBaseSettings):
     GOOGLE_API_KEY: str
     LOG_LEVEL: str = Field(default="INFO")  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    LOG_FORMAT: Literal["text", "json"] = Field(default="text")  # json writes JSON Lines to logs/logs.jsonl
+    AGENT_SERVER_HOST: str = Field(default="127.0.0.1")
+    AGENT_SERVER_PORT: int = Field(default=8765)
+    DEDUP_ENABLED: bool = Field(default=True)  # Reuse summaries/actions of near-duplicate content
+    DEDUP_MAX_DISTANCE: int = Field(default=3)  # Max differing SimHash bits (0-3)
+    ACTION_DEDUP_ENABLED: bool = Field(default=True)  # Skip actions similar to already scheduled ones
+    ACTION_DEDUP_THRESHOLD: float = Field(default=0.75)  # Cosine similarity treated as the same action
+    YOUTUBE_FETCH_WORKERS: int = Field(default=4)  # Concurrent transcript fetches for playlists/channels
+    YOUTUBE_COLLECTION_LIMIT: int = Field(default=50)  # Max videos taken from a playlist/channel
+    SUMMARY_CHUNK_CHARS: int = Field(default=200_000)  # Longer content is summarized chunk by chunk
+    PACK_MAX_ITEM_CHARS: int = Field(default=4_000)  # With --pack, shorter items share Gemini requests
+    PACK_TOKEN_BUDGET: int = Field(default=8_000)  # Max estimated input tokens per packed request
+    PACK_MAX_ITEMS: int = Field(default=16)  # Max items per packed request
+    QUOTA_ENABLED: bool = Field(default=True)  # Share API quotas across all agent processes on this host
+    GEMINI_RPM: int = Field(default=15)  # Gemini requests per minute (project-wide)
+    GEMINI_TPM: int = Field(default=1_000_000)  # Gemini tokens per minute (project-wide)
+    CALENDAR_WRITES_PER_MINUTE: int = Field(default=60)
+    CALENDAR_ACCOUNTS: str = Field(default="")  # Comma-separated ACCOUNT[/CALENDAR_ID] to schedule into; default: "default"
+    CALENDAR_WORKERS: int = Field(default=8)  # Concurrent event inserts across accounts
+    FEED_POLL_WORKERS: int = Field(default=8)  # Concurrent feed requests per poll
+    FEED_INITIAL_ENTRIES: int = Field(default=1)  # Newest entries emitted the first time a feed is polled
+    JOB_QUEUE_URL: str = Field(default="")  # sqlite:///path or redis://host:port/db; default: storage/jobs.sqlite3
+    JOB_VISIBILITY_TIMEOUT: int = Field(default=300)  # Seconds before a job of an unresponsive worker is retried
+    JOB_MAX_ATTEMPTS: int = Field(default=5)  # Attempts per stage before a job is kept as dead
+    JOB_COMPRESS_MIN_BYTES: int = Field(default=0)  # zlib-compress SQLite job texts of at least this size; 0: off
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Loads settings on first use so importing this module stays cheap."""
+    return Settings()
 
 
-settings = Settings()
+def __getattr__(name: str):
+    # Backwards-compatible lazy `from src.core.settings import settings`
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,238 @@
+"""Compact, segment-aware transcript representation.
+
+A Transcript keeps one shared text buffer plus parallel arrays of segment character
+offsets, start times and durations. Chunking and trimming work on segment boundaries by
+index arithmetic, and timestamps survive so extracted actions can link back to the video.
+"""
+import logging
+import os
+import re
+import struct
+import tempfile
+import zlib
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+# Serialized layout: magic, version, segment count, video id length, compressed text length
+_HEADER = struct.Struct("<4sBIHI")
+_MAGIC = b"TRNS"
+_VERSION = 1
+
+_WORD_RE = re.compile(r"\w{4,}")
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptSegment(NamedTuple):
+    """One caption segment."""
+    text: str
+    start: float
+    duration: float
+
+
+class Transcript:
+    """Transcript segments over a single text buffer, joined with single spaces."""
+
+    __slots__ = ("video_id", "text", "_offsets", "_starts", "_durations")
+
+    def __init__(self, video_id: str, text: str, offsets: array, starts: array, durations: array):
+        self.video_id = video_id
+        self.text = text
+        self._offsets = offsets
+        self._starts = starts
+        self._durations = durations
+
+    @classmethod
+    def from_segments(cls, video_id: str, segments: Iterable[tuple[str, float, float]]) -> "Transcript":
+        """
+        Build a transcript from `(text, start, duration)` triples.
+
+        Segment text is whitespace-normalized and empty segments are dropped.
+        """
+        parts: list[str] = []
+        offsets, starts, durations = array("I"), array("d"), array("f")
+        position = 0
+        for text, start, duration in segments:
+            text = " ".join(text.split())
+            if not text:
+                continue
+            offsets.append(position)
+            starts.append(start)
+            durations.append(duration)
+            parts.append(text)
+            position += len(text) + 1
+        return cls(video_id, " ".join(parts), offsets, starts, durations)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        return (self.segment(i) for i in range(len(self)))
+
+    @property
+    def char_count(self) -> int:
+        return len(self.text)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the start of the video to the end of the last segment."""
+        if not self._offsets:
+            return 0.0
+        return self._starts[-1] + self._durations[-1]
+
+    def _end(self, index: int) -> int:
+        # Character offset just past segment `index` (excluding the joining space)
+        return self._offsets[index + 1] - 1 if index + 1 < len(self) else len(self.text)
+
+    def segment(self, index: int) -> TranscriptSegment:
+        return TranscriptSegment(
+            self.text[self._offsets[index]:self._end(index)],
+            self._starts[index],
+            self._durations[index]
+        )
+
+    def segment_index_at(self, char_offset: int) -> int:
+        """Index of the segment containing a character offset of `text`."""
+        if not self._offsets:
+            raise IndexError("empty transcript")
+        return max(bisect_right(self._offsets, char_offset) - 1, 0)
+
+    def time_at(self, char_offset: int) -> float:
+        """Start time, in seconds, of the segment containing a character offset."""
+        return self._starts[self.segment_index_at(char_offset)]
+
+    def url_at(self, seconds: float) -> str:
+        """Link to the video at a timestamp."""
+        return f"https://youtu.be/{self.video_id}?t={int(seconds)}"
+
+    def locate(self, phrase: str, window: int = 3) -> Optional[float]:
+        """
+        Best-effort start time of the passage a phrase refers to.
+
+        Scores windows of consecutive segments by the number of distinct words (4+ letters)
+        they share with the phrase.
+
+        Returns:
+            Start time of the first matching segment in the best window, or None if fewer
+            than two words match
+        """
+        words = {word.lower() for word in _WORD_RE.findall(phrase)}
+        if not words or not self._offsets:
+            return None
+        best_score, best_index = 1, None
+        for index in range(len(self)):
+            end = self._end(min(index + window, len(self)) - 1)
+            passage = self.text[self._offsets[index]:end].lower()
+            score = sum(1 for word in words if word in passage)
+            if score > best_score:
+                best_score, best_index = score, index
+        if best_index is None:
+            return None
+        # Windows overlap, so skip leading segments that do not mention the phrase at all
+        for index in range(best_index, min(best_index + window, len(self))):
+            segment = self.text[self._offsets[index]:self._end(index)].lower()
+            if any(word in segment for word in words):
+                return self._starts[index]
+        return self._starts[best_index]
+
+    def chunk_bounds(self, max_chars: int) -> Iterator[tuple[int, int]]:
+        """
+        Split into consecutive segment ranges of at most `max_chars` characters each.
+
+        A single segment longer than `max_chars` forms its own chunk.
+
+        Yields:
+            `(first_segment, last_segment_exclusive)` index pairs
+        """
+        first = 0
+        for index in range(1, len(self) + 1):
+            if index == len(self) or self._end(index) - self._offsets[first] > max_chars:
+                yield first, index
+                first = index
+
+    def chunks(self, max_chars: int) -> Iterator[str]:
+        """Text of each chunk from `chunk_bounds`, sliced once from the shared buffer."""
+        for first, last in self.chunk_bounds(max_chars):
+            yield self.text[self._offsets[first]:self._end(last - 1)]
+
+    def trim(self, max_chars: int) -> "Transcript":
+        """Leading segments fitting in `max_chars` characters (at least one segment)."""
+        if len(self.text) <= max_chars:
+            return self
+        first, last = next(self.chunk_bounds(max_chars))
+        return Transcript(
+            self.video_id,
+            self.text[:self._end(last - 1)],
+            self._offsets[:last],
+            self._starts[:last],
+            self._durations[:last]
+        )
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form: header, raw arrays and zlib-compressed UTF-8 text."""
+        video_id = self.video_id.encode()
+        text = zlib.compress(self.text.encode(), 6)
+        return b"".join((
+            _HEADER.pack(_MAGIC, _VERSION, len(self), len(video_id), len(text)),
+            video_id,
+            self._offsets.tobytes(),
+            self._starts.tobytes(),
+            self._durations.tobytes(),
+            text,
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Transcript":
+        magic, version, count, id_length, text_length = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Unsupported transcript encoding")
+        expected = _HEADER.size + id_length + sum(array(t).itemsize for t in "Idf") * count + text_length
+        if len(data) != expected:
+            raise ValueError(f"Truncated transcript: {len(data)} of {expected} bytes")
+        position = _HEADER.size
+        video_id = data[position:position + id_length].decode()
+        position += id_length
+        arrays = []
+        for typecode in ("I", "d", "f"):
+            values = array(typecode)
+            size = values.itemsize * count
+            values.frombytes(data[position:position + size])
+            arrays.append(values)
+            position += size
+        text = zlib.decompress(data[position:position + text_length]).decode()
+        return cls(video_id, text, *arrays)
+
+
+class TranscriptCache:
+    """Directory of serialized transcripts keyed by video ID."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _path(self, video_id: str) -> Path:
+        return self.directory / f"{video_id}.bin"
+
+    def __contains__(self, video_id: str) -> bool:
+        return self._path(video_id).exists()
+
+    def get(self, video_id: str) -> Optional[Transcript]:
+        """The cached transcript, or None if missing; unreadable entries are deleted and count as missing."""
+        path = self._path(video_id)
+        try:
+            return Transcript.from_bytes(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (ValueError, struct.error, zlib.error) as e:
+            # UnicodeDecodeError is a ValueError
+            logger.warning("Discarding corrupt cached transcript %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, transcript: Transcript) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # A unique temporary file per writer, so concurrent puts never replace a half-written file
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as f:
+            f.write(transcript.to_bytes())
+        os.replace(f.name, self._path(transcript.video_id))
@@ -0,0 +1,117 @@
+"""File system change notification.
+
+On Linux, changes are reported by inotify (through ctypes, no extra dependency), so an
+idle watch costs no CPU and no rescans. Elsewhere, or when inotify is unavailable, a
+polling watcher compares a cheap stat signature at a fixed interval.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF
+
+
+class PollingWatcher:
+    """Detects changes by comparing stat signatures of a path every `interval` seconds."""
+
+    def __init__(self, path: Path, interval: float = 1.0):
+        self.path = path
+        self.interval = interval
+        self._signature = self._stat()
+
+    def _stat(self) -> tuple:
+        try:
+            if self.path.is_dir():
+                return tuple(sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                                    for entry in os.scandir(self.path) if entry.is_file()))
+            stat = self.path.stat()
+            return stat.st_ino, stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return ()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the path changes or `timeout` seconds pass; returns True on change."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(remaining, 0))
+            signature = self._stat()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Detects changes with inotify; a file is watched through its parent directory."""
+
+    def __init__(self, path: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.path = path
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watching the directory also catches files replaced by rename (editors, atomic writes)
+        directory = path if path.is_dir() else path.parent
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the path changes or `timeout` seconds pass; returns True on change."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        # Drain the queued events: callers rescan from their own offset
+        try:
+            while os.read(self._fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(path: Path, interval: float = 1.0):
+    """
+    Watch a file or directory for changes.
+
+    Args:
+        path: File or directory to watch (a file's parent directory must exist)
+        interval: Poll interval of the fallback watcher
+
+    Returns:
+        An InotifyWatcher on Linux, else a PollingWatcher
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError) as e:
+            logger.warning("inotify unavailable (%s), polling %s every %ss", e, path, interval)
+    return PollingWatcher(path, interval)
@@ -1,12 +1,26 @@
-"""Content fetching clients (HTTP, YouTube)."""
+"""Content fetching clients (HTTP, YouTube).
+
+HTTP, HTML parsing and YouTube libraries are imported on first use to keep CLI startup fast.
+"""
 import logging
 import re
-import requests
-from bs4 import BeautifulSoup
-from youtube_transcript_api import YouTubeTranscriptApi
+from typing import Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+from src.core.concurrency import imap_unordered
+from src.core.metrics import metrics
+from src.core.transcript import Transcript, TranscriptCache
 
 logger = logging.getLogger(__name__)
 
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+_CHANNEL_PATH_RE = re.compile(r'^/(@[\w.-]+|channel/[\w-]+|c/[\w.-]+|user/[\w.-]+)')
+_PLAYLIST_ITEM_RE = re.compile(r'"playlistVideoRenderer":\{"videoId":"([\w-]{11})"')
+_CHANNEL_ITEM_RE = re.compile(r'"(?:videoRenderer|reelItemRenderer)":\{"videoId":"([\w-]{11})"')
+_ANY_VIDEO_ID_RE = re.compile(r'"videoId":"([\w-]{11})"')
+
 
 def is_url(input_str: str) -> bool:
     """Simple check if a string is a URL."""
@@ -23,21 +37,87 @@ def is_youtube_url(url: str) -> bool:
     return bool(re.match(youtube_regex, url))
 
 
+def _youtube_collection_page(url: str) -> Optional[str]:
+    """Page listing the videos of a playlist or channel URL, or None for other URLs."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host not in ('youtube.com', 'www.youtube.com', 'm.youtube.com'):
+        return None
+    if parts.path.rstrip('/') == '/playlist':
+        playlist_id = parse_qs(parts.query).get('list')
+        return f'https://www.youtube.com/playlist?list={playlist_id[0]}' if playlist_id else None
+    channel = _CHANNEL_PATH_RE.match(parts.path)
+    if channel:
+        return f'https://www.youtube.com/{channel.group(1)}/videos'
+    return None
+
+
+def is_youtube_collection_url(url: str) -> bool:
+    """Detects YouTube playlist (`/playlist?list=`) and channel (`/@handle`, `/channel/`, `/c/`, `/user/`) URLs."""
+    return _youtube_collection_page(url) is not None
+
+
+def expand_youtube_collection(url: str, limit: Optional[int] = None) -> list[str]:
+    """
+    Expands a YouTube playlist or channel URL into video IDs.
+    
+    Reads the IDs embedded in the first page of the playlist or the channel's videos tab,
+    so very long playlists are truncated to what that page lists (about 100 videos).
+    
+    Args:
+        url: Playlist or channel URL
+        limit: Maximum number of video IDs to return
+        
+    Returns:
+        Video IDs in listing order, without duplicates
+    """
+    import requests
+
+    page_url = _youtube_collection_page(url)
+    if page_url is None:
+        raise ValueError("Not a YouTube playlist or channel URL")
+    
+    logger.debug("Expanding YouTube collection: %s", page_url)
+    try:
+        with metrics.span("http.get", kind="call") as span:
+            # The consent cookie skips the EU consent interstitial, which lists no videos
+            response = requests.get(page_url, headers=BROWSER_HEADERS, cookies={'CONSENT': 'YES+1'}, timeout=15)
+            span.set(bytes=len(response.content), status=response.status_code)
+            response.raise_for_status()
+    except requests.RequestException as e:
+        logger.error("HTTP error fetching YouTube collection %s: %s", page_url, e, exc_info=True)
+        raise
+    
+    item_re = _PLAYLIST_ITEM_RE if '/playlist' in page_url else _CHANNEL_ITEM_RE
+    video_ids = item_re.findall(response.text) or _ANY_VIDEO_ID_RE.findall(response.text)
+    video_ids = list(dict.fromkeys(video_ids))[:limit]
+    logger.debug("Expanded %s into %s videos", url, len(video_ids))
+    return video_ids
+
+
 def fetch_article_text(url: str) -> str:
     """Fetches the main text from an online article URL."""
-    logger.debug(f"Fetching article: {url}")
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    import requests
+    from bs4 import BeautifulSoup
+
+    logger.debug("Fetching article: %s", url)
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+        with metrics.span("http.get", kind="call") as span:
+            response = requests.get(url, headers=BROWSER_HEADERS, timeout=15)
+            span.set(bytes=len(response.content), status=response.status_code)
+            response.raise_for_status()
     except requests.RequestException as e:
-        logger.error(f"HTTP error fetching article {url}: {e}", exc_info=True)
+        logger.error("HTTP error fetching article %s: %s", url, e, exc_info=True)
         raise
     
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
+    with metrics.span("parse") as span:
+        text = _extract_article_text(BeautifulSoup(response.text, 'html.parser'))
+        span.set(chars=len(text))
+    return text
+
+
+def _extract_article_text(soup) -> str:
+    """Extracts paragraph text from the main article container of a parsed page."""
     # Remove script and style elements
     for script_or_style in soup(["script", "style", "nav", "header", "footer", "aside"]):
         script_or_style.decompose()
@@ -62,36 +142,96 @@ def fetch_article_text(url: str) -> str:
     return text.strip()
 
 
-def fetch_video_transcript(url: str) -> str:
-    """Extracts the transcript text from a YouTube video URL."""
-    logger.debug(f"Fetching YouTube transcript: {url}")
-    # Extract video ID from URL
+def extract_video_id(url: str) -> str:
+    """Extracts the 11-character video ID from a YouTube video URL."""
     video_id_match = re.search(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', url)
     if not video_id_match:
-        logger.error(f"Could not extract video ID from URL: {url}")
+        logger.error("Could not extract video ID from URL: %s", url)
         raise ValueError("Could not extract YouTube video ID from URL")
+    return video_id_match.group(1)
+
+
+def fetch_transcript(url: str, cache: Optional[TranscriptCache] = None) -> Transcript:
+    """
+    Fetches the segmented transcript of a YouTube video URL.
+    
+    Args:
+        url: YouTube video URL
+        cache: Transcript cache to read from and populate
+        
+    Returns:
+        Transcript with segment timings
+    """
+    video_id = extract_video_id(url)
+    logger.debug("Extracted video ID: %s", video_id)
+    if cache is not None:
+        transcript = cache.get(video_id)
+        if transcript is not None:
+            logger.debug("Transcript cache hit: %s", video_id)
+            return transcript
     
-    video_id = video_id_match.group(1)
-    logger.debug(f"Extracted video ID: {video_id}")
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    logger.debug("Fetching YouTube transcript: %s", url)
     api = YouTubeTranscriptApi()
     
     # Try to get English transcripts first
-    try:
-        transcript_data = api.fetch(video_id, languages=['en', 'en-US', 'en-GB'])
-        logger.debug("Fetched English transcript")
-    except Exception:
-        # Fallback: list all and take the first one available
-        logger.debug("English transcript not available, trying fallback")
+    with metrics.span("youtube.transcript", kind="call") as span:
         try:
-            transcript_list = api.list(video_id)
-            transcript = next(iter(transcript_list))
-            transcript_data = transcript.fetch()
-            logger.debug(f"Fetched transcript in alternative language")
-        except Exception as e:
-            logger.error(f"No transcripts found for video {video_id}: {e}", exc_info=True)
-            raise ValueError(f"No transcripts found for this video: {e}")
+            transcript_data = api.fetch(video_id, languages=['en', 'en-US', 'en-GB'])
+            logger.debug("Fetched English transcript")
+        except Exception:
+            # Fallback: list all and take the first one available
+            logger.debug("English transcript not available, trying fallback")
+            try:
+                transcript_list = api.list(video_id)
+                transcript = next(iter(transcript_list))
+                transcript_data = transcript.fetch()
+                logger.debug("Fetched transcript in alternative language")
+            except Exception as e:
+                logger.error("No transcripts found for video %s: %s", video_id, e, exc_info=True)
+                raise ValueError(f"No transcripts found for this video: {e}")
+        span.set(segments=len(transcript_data))
     
-    # Join transcript parts into a single string
-    text = ' '.join([item.text for item in transcript_data])
-    logger.debug(f"Transcript extracted: {len(text)} characters")
-    return text.strip()
+    with metrics.span("parse") as span:
+        transcript = Transcript.from_segments(
+            video_id,
+            ((item.text, item.start, item.duration) for item in transcript_data)
+        )
+        span.set(chars=transcript.char_count)
+    logger.debug("Transcript extracted: %s segments, %s characters", len(transcript), transcript.char_count)
+    
+    if cache is not None:
+        cache.put(transcript)
+    return transcript
+
+
+def fetch_video_transcript(url: str) -> str:
+    """Extracts the transcript text from a YouTube video URL."""
+    return fetch_transcript(url).text
+
+
+def fetch_transcripts(
+    video_ids: list[str],
+    cache: Optional[TranscriptCache] = None,
+    max_workers: int = 4
+) -> Iterator[tuple[str, Transcript | Exception]]:
+    """
+    Fetches transcripts for many videos on a bounded thread pool.
+    
+    Args:
+        video_ids: YouTube video IDs
+        cache: Transcript cache to read from and populate
+        max_workers: Number of concurrent fetches
+        
+    Yields:
+        `(video_id, transcript)` as fetches complete, or `(video_id, error)` for failures
+    """
+    def fetch(video_id: str) -> Transcript:
+        return fetch_transcript(f"https://www.youtube.com/watch?v={video_id}", cache=cache)
+
+    for video_id, future in imap_unordered(fetch, video_ids, max_workers=max_workers):
+        try:
+            yield video_id, future.result()
+        except Exception as e:
+            yield video_id, e
@@ -0,0 +1,157 @@
+"""RSS/Atom feed client with conditional GETs.
+
+Feeds are parsed with the standard library's ElementTree by local tag name, which covers
+RSS 2.0, RSS 1.0 (RDF) and Atom without a feed-parsing dependency.
+"""
+import datetime
+import email.utils
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+from xml.etree import ElementTree
+
+from src.core.metrics import metrics
+from src.infra.client.content_fetcher import BROWSER_HEADERS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FeedEntry:
+    """One feed item."""
+    id: str
+    link: str
+    title: str = ""
+    published: Optional[datetime.datetime] = None
+
+
+@dataclass
+class FeedResponse:
+    """Result of polling a feed; `entries` is empty when the feed was not modified."""
+    url: str
+    status: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    entries: list[FeedEntry] = field(default_factory=list)
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def _local(tag: str) -> str:
+    # "{namespace}name" -> "name"
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element, *names: str) -> Optional[str]:
+    for child in element:
+        if _local(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parses RFC 822 (RSS) and ISO 8601 (Atom, Dublin Core) dates into aware UTC datetimes."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+
+def _entry_link(element) -> Optional[str]:
+    for child in element:
+        if _local(child.tag) != 'link':
+            continue
+        # Atom: <link rel="alternate" href="..."/>; RSS: <link>...</link>
+        href = child.get('href')
+        if href and child.get('rel', 'alternate') == 'alternate':
+            return href.strip()
+        if not href and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def parse_feed(data: bytes) -> list[FeedEntry]:
+    """
+    Parses an RSS or Atom document into entries, in document order.
+
+    Entries without a link are dropped; entries without an id use their link.
+
+    Raises:
+        ValueError: If the document is not well-formed XML
+    """
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Invalid feed XML: {e}")
+
+    entries = []
+    for element in root.iter():
+        if _local(element.tag) not in ('item', 'entry'):
+            continue
+        link = _entry_link(element)
+        if not link:
+            continue
+        entries.append(FeedEntry(
+            id=_child_text(element, 'guid', 'id') or link,
+            link=link,
+            title=_child_text(element, 'title') or "",
+            published=_parse_date(_child_text(element, 'published', 'pubDate', 'date', 'updated'))
+        ))
+    return entries
+
+
+def fetch_feed(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FeedResponse:
+    """
+    Fetches a feed with a conditional GET.
+
+    Args:
+        url: Feed URL
+        etag: ETag from the previous poll
+        last_modified: Last-Modified from the previous poll
+
+    Returns:
+        FeedResponse; a 304 response carries the previous validators and no entries
+    """
+    import requests
+
+    headers = dict(BROWSER_HEADERS, Accept='application/atom+xml, application/rss+xml, application/xml;q=0.9, */*;q=0.8')
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        with metrics.span("feed.get", kind="call") as span:
+            response = requests.get(url, headers=headers, timeout=15)
+            span.set(bytes=len(response.content), status=response.status_code)
+            response.raise_for_status()
+    except requests.RequestException as e:
+        logger.error("HTTP error fetching feed %s: %s", url, e)
+        raise
+    metrics.inc("agent_feed_polls_total", status=str(response.status_code))
+
+    if response.status_code == 304:
+        logger.debug("Feed not modified: %s", url)
+        return FeedResponse(url=url, status=304, etag=etag, last_modified=last_modified)
+
+    with metrics.span("parse") as span:
+        entries = parse_feed(response.content)
+        span.set(entries=len(entries))
+    logger.debug("Fetched feed %s: %s entries", url, len(entries))
+    return FeedResponse(
+        url=url,
+        status=response.status_code,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+        entries=entries
+    )
@@ -0,0 +1,133 @@
+"""Chunked reading of large local documents.
+
+Files are memory-mapped and cut into chunks at paragraph, line or word boundaries, so
+only one chunk is decoded at a time and peak memory does not grow with the file size.
+HTML exports are stripped to their text with an incremental parser.
+"""
+import logging
+import mmap
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+HTML_SUFFIXES = {'.html', '.htm', '.xhtml'}
+TEXT_SUFFIXES = {'.txt', '.md', '.markdown', '.rst', '.text', '.csv', '.log'} | HTML_SUFFIXES
+
+# Bytes inspected for NUL bytes to reject binary files
+SNIFF_BYTES = 8192
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Incremental HTML-to-text converter; `feed` may split tags anywhere."""
+
+    SKIPPED_TAGS = {'script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript', 'svg'}
+    BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article', 'pre'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self._parts: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._parts.append(data)
+
+    def take(self, keep_tail: int = 0) -> str:
+        """
+        Text extracted since the previous call, with runs of blank lines collapsed.
+
+        A trailing partial line shorter than `keep_tail` characters is held back for the
+        next call, so consecutive results split between blocks rather than mid-sentence.
+        """
+        text, self._parts = ''.join(self._parts), []
+        tail_start = text.rfind('\n') + 1
+        if keep_tail and len(text) - tail_start < keep_tail:
+            text, self._parts = text[:tail_start], [text[tail_start:]]
+        lines = (' '.join(line.split()) for line in text.split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+
+def _split_point(data: mmap.mmap, start: int, end: int) -> int:
+    """Offset in (start, end] to cut at: the last paragraph, line or word break, else a UTF-8 boundary."""
+    if end >= len(data):
+        return len(data)
+    floor = start + (end - start) // 2
+    for separator in (b'\n\n', b'\n', b' '):
+        position = data.rfind(separator, floor, end)
+        if position != -1:
+            return position + len(separator)
+    # No break in the second half: cut before a UTF-8 continuation byte sequence
+    while end > start + 1 and data[end] & 0xC0 == 0x80:
+        end -= 1
+    return end
+
+
+class FileDocument:
+    """A local text, Markdown or HTML file read in chunks."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.is_html = path.suffix.lower() in HTML_SUFFIXES
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    def validate(self) -> None:
+        """
+        Checks that the file exists and looks like text.
+
+        Raises:
+            ValueError: If the file is missing, empty or binary
+        """
+        if not self.path.is_file():
+            raise ValueError(f"File not found: {self.path}")
+        if self.size == 0:
+            raise ValueError(f"File is empty: {self.path}")
+        with open(self.path, 'rb') as f:
+            if b'\0' in f.read(SNIFF_BYTES):
+                raise ValueError(f"Not a text file: {self.path}")
+        if self.path.suffix.lower() not in TEXT_SUFFIXES:
+            logger.debug("Reading %s as plain text", self.path)
+
+    def chunks(self, max_chars: int) -> Iterator[str]:
+        """
+        Yields the document's text in chunks of at most `max_chars` characters.
+
+        Chunks end at paragraph, line or word breaks where possible. Only the current chunk
+        is held in memory; the file itself is memory-mapped.
+        """
+        extractor = _HTMLTextExtractor() if self.is_html else None
+        # Room for the partial line the HTML extractor carries over between chunks
+        keep_tail = max_chars // 4 if extractor is not None else 0
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+            while position < len(data):
+                # A character is at least one byte, so N bytes decode to at most N characters
+                end = _split_point(data, position, position + max_chars - keep_tail)
+                text = data[position:end].decode('utf-8', errors='replace')
+                position = end
+                if extractor is not None:
+                    extractor.feed(text)
+                    text = extractor.take(keep_tail=keep_tail)
+                if text.strip():
+                    yield text
+            if extractor is not None:
+                extractor.close()
+                text = extractor.take()
+                if text.strip():
+                    yield text
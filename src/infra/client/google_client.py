@@ -1,33 +1,62 @@
-"""Google API clients (GenAI and Calendar)."""
+"""Google API clients (GenAI and Calendar).
+
+The Google SDKs are slow to import, so they are loaded on first use.
+"""
 import logging
 import os
+import re
+import threading
+from functools import lru_cache
 from pathlib import Path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from google import genai
-from src.core.settings import settings
+from typing import TYPE_CHECKING, Optional
+from src.core.settings import get_settings
+
+if TYPE_CHECKING:
+    from google import genai
 
 logger = logging.getLogger(__name__)
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/calendar.events']
 
+DEFAULT_ACCOUNT = 'default'
+_ACCOUNT_RE = re.compile(r'[A-Za-z0-9][A-Za-z0-9._@+-]*')
 
-def get_genai_client() -> genai.Client:
-    """Returns a Gemini API client."""
-    return genai.Client(api_key=settings.GOOGLE_API_KEY)
 
+def validate_account(account: str) -> str:
+    """
+    Checks a calendar account name.
 
-def get_calendar_service():
-    """Gets authenticated Google Calendar service."""
-    # Build paths relative to the project root
-    base_dir = Path(__file__).parent.parent.parent.parent
-    tokens_dir = base_dir / 'storage' / 'tokens'
-    tokens_dir.mkdir(parents=True, exist_ok=True)
-    token_path = tokens_dir / 'token.json'
-    creds_path = base_dir / 'credentials.json'
+    Raises:
+        ValueError: If the account name is not a plain file-name-safe identifier
+    """
+    if not _ACCOUNT_RE.fullmatch(account):
+        raise ValueError(f"Invalid calendar account name: {account!r}")
+    return account
+
+
+@lru_cache(maxsize=1)
+def get_genai_client() -> "genai.Client":
+    """Returns a Gemini API client (cached for the lifetime of the process)."""
+    from google import genai
+    return genai.Client(api_key=get_settings().GOOGLE_API_KEY)
+
+
+def _load_credentials(token_path: Path, creds_path: Path, interactive: bool = False):
+    """
+    Loads, refreshes or (interactively) obtains OAuth credentials stored at `token_path`.
+
+    Args:
+        token_path: Stored token of the account
+        creds_path: OAuth client secrets
+        interactive: Run the browser/console OAuth flow when there is no usable token
+
+    Raises:
+        ValueError: If the account has no usable token and `interactive` is off
+    """
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
 
     creds = None
     if os.path.exists(token_path):
@@ -41,7 +70,7 @@ def get_calendar_service():
                 token_path.unlink()  # Delete invalid token
                 creds = None
             else:
-                logger.error(f"Error loading token: {e}", exc_info=True)
+                logger.error("Error loading token: %s", e, exc_info=True)
                 raise
     
     if not creds or not creds.valid:
@@ -50,8 +79,14 @@ def get_calendar_service():
             creds.refresh(Request())
             logger.info("Token refreshed successfully")
         else:
+            if not interactive:
+                # Never prompt from scheduling threads, workers or headless runs
+                raise ValueError(
+                    f"Calendar account is not authorized (no usable token at {token_path}); "
+                    "run `agent calendar auth` first"
+                )
             if not os.path.exists(creds_path):
-                logger.error(f"credentials.json not found at {creds_path}")
+                logger.error("credentials.json not found at %s", creds_path)
                 raise FileNotFoundError(
                     f"Could not find credentials.json at {creds_path}. "
                     "Please ensure it is present."
@@ -102,6 +137,93 @@ def get_calendar_service():
         else:
             logger.error("Cannot save token without refresh_token")
             raise ValueError("Cannot save token without refresh_token")
-    
-    logger.debug("Calendar service initialized")
-    return build('calendar', 'v3', credentials=creds)
+
+    return creds
+
+
+class CalendarServicePool:
+    """
+    Authenticated Calendar services keyed by account, each built once per process.
+
+    Every account has its own token file (`token.json` for the default account,
+    `<account>.json` otherwise) and its own service. A service wraps a single httplib2
+    connection, which is not thread-safe, so callers hold the account's lock while using
+    it; different accounts can be used concurrently.
+    """
+
+    def __init__(self, tokens_dir: Path, creds_path: Path):
+        self.tokens_dir = tokens_dir
+        self.creds_path = creds_path
+        self._lock = threading.Lock()
+        self._services: dict[str, object] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        # OAuth flows open a browser and local server: one at a time
+        self._auth_lock = threading.Lock()
+
+    def token_path(self, account: Optional[str] = None) -> Path:
+        """
+        Token file of an account.
+
+        Raises:
+            ValueError: If the account name is not a plain file-name-safe identifier
+        """
+        account = validate_account(account or DEFAULT_ACCOUNT)
+        return self.tokens_dir / ('token.json' if account == DEFAULT_ACCOUNT else f'{account}.json')
+
+    def accounts(self) -> list[str]:
+        """Accounts with a stored token."""
+        return sorted(
+            DEFAULT_ACCOUNT if path.name == 'token.json' else path.stem
+            for path in self.tokens_dir.glob('*.json')
+        )
+
+    def is_authorized(self, account: Optional[str] = None) -> bool:
+        """Whether the account has a stored token."""
+        return self.token_path(account).exists()
+
+    def lock(self, account: Optional[str] = None) -> threading.Lock:
+        """Lock to hold while using the account's service."""
+        with self._lock:
+            return self._locks.setdefault(account or DEFAULT_ACCOUNT, threading.Lock())
+
+    def get(self, account: Optional[str] = None, interactive: bool = False):
+        """
+        The account's Calendar service, authenticating on first use.
+
+        Args:
+            account: Account name (default: the default account)
+            interactive: Allow the OAuth flow for an account without a token (`agent calendar auth` only)
+
+        Raises:
+            ValueError: If the account name is invalid, or it is not authorized and `interactive` is off
+        """
+        account = account or DEFAULT_ACCOUNT
+        service = self._services.get(account)
+        if service is not None:
+            return service
+        token_path = self.token_path(account)
+        with self._auth_lock:
+            service = self._services.get(account)
+            if service is None:
+                from googleapiclient.discovery import build
+
+                self.tokens_dir.mkdir(parents=True, exist_ok=True)
+                creds = _load_credentials(token_path, self.creds_path, interactive)
+                service = build('calendar', 'v3', credentials=creds)
+                with self._lock:
+                    self._services[account] = service
+                logger.debug("Calendar service initialized for account %s", account)
+        return service
+
+
+@lru_cache(maxsize=1)
+def get_calendar_pool() -> CalendarServicePool:
+    """The process-wide pool of Calendar services."""
+    # Build paths relative to the project root
+    base_dir = Path(__file__).parent.parent.parent.parent
+    return CalendarServicePool(base_dir / 'storage' / 'tokens', base_dir / 'credentials.json')
+
+
+def get_calendar_service(account: Optional[str] = None):
+    """Gets the authenticated Google Calendar service of an account (cached for the lifetime of the process)."""
+    return get_calendar_pool().get(account)
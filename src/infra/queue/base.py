@@ -0,0 +1,109 @@
+"""Durable job queue interface and backend registry.
+
+A job sits in a named queue until a worker leases it. A lease hides the job from other
+workers for a visibility timeout; a job whose lease expires (its worker died or hung)
+becomes visible again. Failed jobs are retried with backoff until `max_attempts`, after
+which they are kept as dead for inspection.
+"""
+import abc
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+READY = "ready"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+@dataclass
+class Job:
+    """A leased job; `lease_token` identifies this particular lease."""
+    id: str
+    queue: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+    lease_token: str = ""
+    lease_expires: Optional[datetime.datetime] = None
+
+
+@dataclass
+class QueueStats:
+    """Job counts of one queue by status."""
+    queue: str
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+class LeaseLost(RuntimeError):
+    """Raised when completing, failing or extending a job whose lease expired or moved to another worker."""
+
+
+class JobQueue(abc.ABC):
+    """Backend-independent job queue operations."""
+
+    @abc.abstractmethod
+    def enqueue(self, queue: str, payload: dict[str, Any], delay: float = 0, max_attempts: int = 5) -> str:
+        """Add a job, visible after `delay` seconds; returns its id."""
+
+    @abc.abstractmethod
+    def lease(self, queues: list[str], owner: str, visibility_timeout: float) -> Optional[Job]:
+        """Lease the oldest visible job of any of the queues, or return None if there is none."""
+
+    @abc.abstractmethod
+    def extend(self, job: Job, visibility_timeout: float) -> None:
+        """Push back the lease expiry of a job still being processed."""
+
+    @abc.abstractmethod
+    def complete(self, job: Job, result: Optional[dict[str, Any]] = None) -> None:
+        """Mark a leased job done."""
+
+    @abc.abstractmethod
+    def fail(self, job: Job, error: str, retry_delay: Optional[float] = None) -> bool:
+        """
+        Release a leased job after a failure.
+
+        Args:
+            job: The leased job
+            error: Error description kept with the job
+            retry_delay: Seconds before the retry; None marks the job dead right away
+
+        Returns:
+            True if the job will be retried, False if it is dead
+        """
+
+    @abc.abstractmethod
+    def stats(self) -> list[QueueStats]:
+        """Job counts per queue and status."""
+
+    @abc.abstractmethod
+    def job(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Queue, status, attempts, result and last error of a job, or None if unknown."""
+
+    def close(self) -> None:
+        pass
+
+
+_BACKENDS: dict[str, Callable[[str], JobQueue]] = {}
+
+
+def register_backend(scheme: str, factory: Callable[[str], JobQueue]) -> None:
+    """Make `open_job_queue` build `factory(url)` for URLs with this scheme."""
+    _BACKENDS[scheme] = factory
+
+
+def open_job_queue(url: str) -> JobQueue:
+    """
+    Open a job queue by URL, e.g. `sqlite:///storage/jobs.sqlite3` or `redis://localhost:6379/0`.
+
+    Raises:
+        ValueError: If no backend handles the URL scheme
+    """
+    # Built-in backends register on import; their dependencies are only loaded when used
+    from src.infra.queue import redis_queue, sqlite_queue  # noqa: F401
+
+    scheme = urlsplit(url).scheme
+    if scheme not in _BACKENDS:
+        raise ValueError(f"Unsupported job queue URL scheme: {scheme!r} (known: {', '.join(sorted(_BACKENDS))})")
+    return _BACKENDS[scheme](url)
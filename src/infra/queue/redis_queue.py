@@ -0,0 +1,219 @@
+"""Redis job queue backend, for workers spread over several nodes.
+
+Layout under a key prefix: one hash per job, a sorted set of ready job ids per queue
+scored by the time they become visible, and a sorted set of leased job ids per queue
+scored by lease expiry. A job moves between the sets in one MULTI transaction guarded
+with WATCH (claiming it and recording its lease, or recovering an expired lease), so a
+crashed worker never leaves a job in neither set; lease ownership changes are guarded
+the same way.
+The `redis` package is imported on first use.
+"""
+import datetime
+import json
+import time
+import uuid
+from typing import Any, Optional
+
+from src.infra.queue.base import DEAD, DONE, LEASED, READY, Job, JobQueue, LeaseLost, QueueStats, register_backend
+
+# Expired leases recovered per queue per lease call
+RECOVER_BATCH = 100
+
+
+class RedisJobQueue(JobQueue):
+    """Job queue in Redis."""
+
+    def __init__(self, client, prefix: str = "agent:jobs", retention: float = 7 * 24 * 3600):
+        self.redis = client
+        self.prefix = prefix
+        self.retention = retention
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisJobQueue":
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("The redis job queue backend needs the 'redis' package (pip install redis)") from None
+        return cls(redis.Redis.from_url(url, decode_responses=True))
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def _ready_key(self, queue: str) -> str:
+        return f"{self.prefix}:ready:{queue}"
+
+    def _leased_key(self, queue: str) -> str:
+        return f"{self.prefix}:leased:{queue}"
+
+    def enqueue(self, queue: str, payload: dict[str, Any], delay: float = 0, max_attempts: int = 5) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self.redis.pipeline() as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                "queue": queue,
+                "payload": json.dumps(payload),
+                "status": READY,
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "lease_token": "",
+                "created_at": now,
+            })
+            pipe.zadd(self._ready_key(queue), {job_id: now + delay})
+            pipe.sadd(f"{self.prefix}:queues", queue)
+            pipe.execute()
+        return job_id
+
+    def _recover_expired(self, queue: str, now: float) -> None:
+        from redis.exceptions import WatchError
+
+        leased_key = self._leased_key(queue)
+        for job_id in self.redis.zrangebyscore(leased_key, "-inf", now, start=0, num=RECOVER_BATCH):
+            with self.redis.pipeline() as pipe:
+                try:
+                    pipe.watch(leased_key, self._job_key(job_id))
+                    expires = pipe.zscore(leased_key, job_id)
+                    if expires is None or expires > now:
+                        continue  # completed, extended or recovered meanwhile
+                    attempts, max_attempts = pipe.hmget(self._job_key(job_id), "attempts", "max_attempts")
+                    pipe.multi()
+                    pipe.zrem(leased_key, job_id)
+                    if int(attempts or 0) >= int(max_attempts or 0):
+                        pipe.hset(self._job_key(job_id), mapping={
+                            "status": DEAD, "lease_token": "", "last_error": "lease expired"
+                        })
+                        pipe.expire(self._job_key(job_id), int(self.retention))
+                    else:
+                        pipe.hset(self._job_key(job_id), mapping={"status": READY, "lease_token": ""})
+                        pipe.zadd(self._ready_key(queue), {job_id: now})
+                    pipe.execute()
+                except WatchError:
+                    continue  # another worker got to it first; retried on the next lease call
+
+    def lease(self, queues: list[str], owner: str, visibility_timeout: float) -> Optional[Job]:
+        now = time.time()
+        for queue in queues:
+            self._recover_expired(queue, now)
+        while True:
+            candidates = []
+            for queue in queues:
+                head = self.redis.zrangebyscore(self._ready_key(queue), "-inf", now, start=0, num=1, withscores=True)
+                if head:
+                    candidates.append((head[0][1], queue, head[0][0]))
+            if not candidates:
+                return None
+            _, queue, job_id = min(candidates)
+            job = self._claim(queue, job_id, owner, visibility_timeout)
+            if job is not None:
+                return job
+            # Another worker won the race (or the ready set changed meanwhile): try again
+
+    def _claim(self, queue: str, job_id: str, owner: str, visibility_timeout: float) -> Optional[Job]:
+        """Moves a ready job to the leased set and records the lease in one transaction."""
+        from redis.exceptions import WatchError
+
+        ready_key = self._ready_key(queue)
+        token = uuid.uuid4().hex
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(ready_key)
+                if pipe.zscore(ready_key, job_id) is None:
+                    return None
+                expires = time.time() + visibility_timeout
+                pipe.multi()
+                pipe.zrem(ready_key, job_id)
+                pipe.hincrby(self._job_key(job_id), "attempts", 1)
+                pipe.hset(self._job_key(job_id), mapping={"status": LEASED, "lease_token": token, "lease_owner": owner})
+                pipe.zadd(self._leased_key(queue), {job_id: expires})
+                pipe.hmget(self._job_key(job_id), "payload", "max_attempts")
+                _, attempts, _, _, (payload, max_attempts) = pipe.execute()
+            except WatchError:
+                return None
+        return Job(
+            id=job_id,
+            queue=queue,
+            payload=json.loads(payload),
+            attempts=attempts,
+            max_attempts=int(max_attempts),
+            lease_token=token,
+            lease_expires=datetime.datetime.fromtimestamp(expires, datetime.timezone.utc)
+        )
+
+    def _update_leased(self, job: Job, apply) -> None:
+        from redis.exceptions import WatchError
+
+        key = self._job_key(job.id)
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    status, token = pipe.hmget(key, "status", "lease_token")
+                    if status != LEASED or token != job.lease_token:
+                        raise LeaseLost(f"Lease on job {job.id} is no longer held")
+                    pipe.multi()
+                    apply(pipe)
+                    pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    def extend(self, job: Job, visibility_timeout: float) -> None:
+        expires = time.time() + visibility_timeout
+        self._update_leased(job, lambda pipe: pipe.zadd(self._leased_key(job.queue), {job.id: expires}))
+        job.lease_expires = datetime.datetime.fromtimestamp(expires, datetime.timezone.utc)
+
+    def complete(self, job: Job, result: Optional[dict[str, Any]] = None) -> None:
+        def apply(pipe):
+            pipe.zrem(self._leased_key(job.queue), job.id)
+            pipe.hset(self._job_key(job.id), mapping={
+                "status": DONE,
+                "lease_token": "",
+                "result": json.dumps(result) if result is not None else "",
+            })
+            pipe.expire(self._job_key(job.id), int(self.retention))
+        self._update_leased(job, apply)
+
+    def fail(self, job: Job, error: str, retry_delay: Optional[float] = None) -> bool:
+        retry = retry_delay is not None and job.attempts < job.max_attempts
+
+        def apply(pipe):
+            pipe.zrem(self._leased_key(job.queue), job.id)
+            pipe.hset(self._job_key(job.id), mapping={
+                "status": READY if retry else DEAD,
+                "lease_token": "",
+                "last_error": error,
+            })
+            if retry:
+                pipe.zadd(self._ready_key(job.queue), {job.id: time.time() + retry_delay})
+            else:
+                pipe.expire(self._job_key(job.id), int(self.retention))
+        self._update_leased(job, apply)
+        return retry
+
+    def stats(self) -> list[QueueStats]:
+        stats = []
+        for queue in sorted(self.redis.smembers(f"{self.prefix}:queues")):
+            with self.redis.pipeline() as pipe:
+                pipe.zcard(self._ready_key(queue))
+                pipe.zcard(self._leased_key(queue))
+                ready, leased = pipe.execute()
+            # Done and dead jobs are only kept as expiring hashes, not counted per queue
+            stats.append(QueueStats(queue, {READY: ready, LEASED: leased}))
+        return stats
+
+    def job(self, job_id: str) -> Optional[dict[str, Any]]:
+        data = self.redis.hgetall(self._job_key(job_id))
+        if not data:
+            return None
+        return {
+            "queue": data["queue"],
+            "status": data["status"],
+            "attempts": int(data.get("attempts", 0)),
+            "result": json.loads(data["result"]) if data.get("result") else None,
+            "last_error": data.get("last_error"),
+        }
+
+    def close(self) -> None:
+        self.redis.close()
+
+
+register_backend("redis", RedisJobQueue.from_url)
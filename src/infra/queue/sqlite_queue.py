@@ -0,0 +1,195 @@
+"""SQLite job queue backend: durable and shared by all processes on one host.
+
+Payloads and results are stored as binary records (`src.core.codec`), optionally with
+long texts compressed; rows written as JSON text by earlier versions are still read.
+"""
+import datetime
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit
+
+from src.core import codec
+from src.infra.queue.base import DEAD, DONE, LEASED, READY, Job, JobQueue, LeaseLost, QueueStats, register_backend
+
+
+def _decode(value: str | bytes) -> Any:
+    # TEXT columns hold JSON from before binary records
+    return json.loads(value) if isinstance(value, str) else codec.loads(value)
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a SQLite database; leasing runs in `BEGIN IMMEDIATE` transactions."""
+
+    def __init__(self, path: Path, compress_min: Optional[int] = None):
+        self.path = path
+        self.compress_min = compress_min
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @classmethod
+    def from_url(cls, url: str) -> "SQLiteJobQueue":
+        from src.core.settings import get_settings
+
+        # sqlite:///relative/path or sqlite:////absolute/path
+        return cls(Path(urlsplit(url).path[1:]), compress_min=get_settings().JOB_COMPRESS_MIN_BYTES or None)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    queue TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    available_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_token TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (queue, status, available_at);
+                CREATE INDEX IF NOT EXISTS jobs_leased ON jobs (status, lease_expires);
+            """)
+        return self._conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, queue: str, payload: dict[str, Any], delay: float = 0, max_attempts: int = 5) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, queue, payload, status, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, queue, codec.dumps(payload, self.compress_min), READY, max_attempts, now + delay, now, now)
+            )
+        return job_id
+
+    def lease(self, queues: list[str], owner: str, visibility_timeout: float) -> Optional[Job]:
+        now = time.time()
+        marks = ", ".join("?" * len(queues))
+        with self._transaction() as conn:
+            # Expired leases whose attempts are used up won't be retried
+            conn.execute(
+                f"UPDATE jobs SET status = ?, last_error = 'lease expired', updated_at = ? "
+                f"WHERE status = ? AND lease_expires <= ? AND attempts >= max_attempts AND queue IN ({marks})",
+                (DEAD, now, LEASED, now, *queues)
+            )
+            row = conn.execute(
+                f"SELECT id, queue, payload, attempts, max_attempts FROM jobs "
+                f"WHERE queue IN ({marks}) AND ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires <= ?)) "
+                f"ORDER BY available_at, created_at LIMIT 1",
+                (*queues, READY, now, LEASED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, queue, payload, attempts, max_attempts = row
+            token = uuid.uuid4().hex
+            expires = now + visibility_timeout
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_token = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (LEASED, owner, token, expires, now, job_id)
+            )
+        return Job(
+            id=job_id,
+            queue=queue,
+            payload=_decode(payload),
+            attempts=attempts + 1,
+            max_attempts=max_attempts,
+            lease_token=token,
+            lease_expires=datetime.datetime.fromtimestamp(expires, datetime.timezone.utc)
+        )
+
+    def _update_leased(self, conn: sqlite3.Connection, job: Job, assignments: str, params: tuple) -> None:
+        cursor = conn.execute(
+            f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND status = ? AND lease_token = ?",
+            (*params, time.time(), job.id, LEASED, job.lease_token)
+        )
+        if cursor.rowcount == 0:
+            raise LeaseLost(f"Lease on job {job.id} is no longer held")
+
+    def extend(self, job: Job, visibility_timeout: float) -> None:
+        expires = time.time() + visibility_timeout
+        with self._transaction() as conn:
+            self._update_leased(conn, job, "lease_expires = ?", (expires,))
+        job.lease_expires = datetime.datetime.fromtimestamp(expires, datetime.timezone.utc)
+
+    def complete(self, job: Job, result: Optional[dict[str, Any]] = None) -> None:
+        with self._transaction() as conn:
+            self._update_leased(
+                conn, job, "status = ?, result = ?, lease_token = NULL",
+                (DONE, codec.dumps(result, self.compress_min) if result is not None else None)
+            )
+
+    def fail(self, job: Job, error: str, retry_delay: Optional[float] = None) -> bool:
+        retry = retry_delay is not None and job.attempts < job.max_attempts
+        with self._transaction() as conn:
+            self._update_leased(
+                conn, job, "status = ?, available_at = ?, last_error = ?, lease_token = NULL",
+                (READY if retry else DEAD, time.time() + (retry_delay or 0), error)
+            )
+        return retry
+
+    def stats(self) -> list[QueueStats]:
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute(
+                # Report expired leases as ready: the next lease call will hand them out
+                "SELECT queue, CASE WHEN status = ? AND lease_expires <= ? THEN ? ELSE status END AS state, COUNT(*) "
+                "FROM jobs GROUP BY queue, state ORDER BY queue",
+                (LEASED, now, READY)
+            ).fetchall()
+        stats: dict[str, QueueStats] = {}
+        for queue, status, count in rows:
+            stats.setdefault(queue, QueueStats(queue)).counts[status] = count
+        return list(stats.values())
+
+    def job(self, job_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT queue, status, attempts, result, last_error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        queue, status, attempts, result, last_error = row
+        return {
+            "queue": queue,
+            "status": status,
+            "attempts": attempts,
+            "result": _decode(result) if result else None,
+            "last_error": last_error,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+register_backend("sqlite", SQLiteJobQueue.from_url)
@@ -0,0 +1,124 @@
+"""Microbenchmark of DTO records: JSON versus the binary codec used by the job queue."""
+import datetime
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from pydantic import BaseModel
+
+from src.core import codec
+from src.modules.agent.dto import ContentDTO, ScheduledEventDTO, SummaryDTO
+
+_ASCII_WORDS = (
+    "the of and to in is that for it as with was on be by this are from or have an they which "
+    "model agent summary calendar transcript video article action schedule queue worker record"
+).split()
+_UNICODE_WORDS = "и в не на что это модель агент сводка календарь расшифровка видео задача очередь".split()
+
+
+@dataclass
+class BenchResult:
+    """Per-record cost of one DTO and method."""
+    dto: str
+    method: str
+    encode: float  # Seconds per record
+    decode: float
+    size: int  # Bytes per record
+
+
+def _sample_text(chars: int, unicode: bool = False) -> str:
+    rng = random.Random(0)
+    vocabulary = _UNICODE_WORDS if unicode else _ASCII_WORDS
+    words: list[str] = []
+    length = 0
+    while length < chars:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+def sample_dtos(text_chars: int, unicode: bool = False) -> list[BaseModel]:
+    """A content item with `text_chars` of text, its summary and a scheduled event."""
+    start = datetime.datetime(2024, 1, 1, 10)
+    return [
+        ContentDTO(text=_sample_text(text_chars, unicode), source_type="article", source_url="https://example.com/a"),
+        SummaryDTO(points=_sample_text(1500, unicode), source_type="article", character_count=text_chars),
+        ScheduledEventDTO(
+            action="Read the article",
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=1),
+            event_link="https://calendar.google.com/event?eid=1",
+            calendar="alice"
+        ),
+    ]
+
+
+def _methods(cls: type[BaseModel], compress_min: int) -> dict[str, tuple[Callable, Callable]]:
+    """(encode, decode) per method; each mirrors how a store writes and reads a record."""
+    return {
+        "json": (
+            lambda dto: json.dumps(dto.model_dump(mode="json")).encode(),
+            lambda data: cls.model_validate(json.loads(data)),
+        ),
+        "pydantic json": (
+            lambda dto: dto.model_dump_json().encode(),
+            cls.model_validate_json,
+        ),
+        "binary": (
+            lambda dto: codec.dumps(dto.model_dump()),
+            lambda data: cls.model_validate(codec.loads(data)),
+        ),
+        "binary + zlib": (
+            lambda dto: codec.dumps(dto.model_dump(), compress_min),
+            lambda data: cls.model_validate(codec.loads(data)),
+        ),
+        # Skips validation, yet slower than pydantic-core validating native values
+        "binary + model_construct": (
+            lambda dto: codec.dumps(dto.model_dump()),
+            lambda data: cls.model_construct(**codec.loads(data)),
+        ),
+    }
+
+
+def _time(fn: Callable[[], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def run_benchmark(
+    text_chars: int = 50_000,
+    iterations: int = 200,
+    unicode: bool = False,
+    compress_min: int = 1024
+) -> list[BenchResult]:
+    """
+    Time encoding and decoding sample DTOs with each method.
+
+    Args:
+        text_chars: Length of the content text
+        iterations: Repetitions per measurement
+        unicode: Use non-ASCII (Cyrillic) sample text
+        compress_min: Compression threshold in bytes for the zlib method
+
+    Returns:
+        One result per DTO and method
+    """
+    results = []
+    for dto in sample_dtos(text_chars, unicode):
+        for method, (encode, decode) in _methods(type(dto), compress_min).items():
+            data = encode(dto)
+            if decode(data) != dto:
+                raise AssertionError(f"{method} does not round-trip {type(dto).__name__}")
+            results.append(BenchResult(
+                dto=type(dto).__name__,
+                method=method,
+                encode=_time(lambda: encode(dto), iterations),
+                decode=_time(lambda: decode(data), iterations),
+                size=len(data),
+            ))
+    return results
@@ -1,34 +1,178 @@
-"""CLI presentation layer for agent commands as Typer app."""
+"""CLI presentation layer for agent commands as Typer app.
+
+Services, settings and the heavier Rich renderables are imported inside the commands
+so that `--help` and trivial commands don't pay for them.
+"""
 import logging
 import datetime
 import typer
-from typing import Optional, List, Tuple
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from rich.markdown import Markdown
-from rich import box
-
-from src.modules.agent.service.agent import AgentService
-from src.modules.agent.dto import ContentDTO, SummaryDTO, ScheduledEventDTO
-
-# Global console instance for rich output
-console = Console()
+from contextlib import ExitStack
+from enum import Enum
+from functools import lru_cache
+from typing import Callable, Optional, TYPE_CHECKING
+
+from src.core.log import configure_logging
+from src.core.metrics import metrics
+from src.core.profiling import ProfileMode
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from src.core.profiling import ProfileReport
+    from src.modules.agent.service.calendar import CalendarTarget
+
 logger = logging.getLogger(__name__)
 
 # Create typer app for agent commands
 app = typer.Typer(help="Agent commands for information-to-action workflow")
 
 
+class OutputMode(str, Enum):
+    """Output of `run`: interactive Rich rendering or headless JSON Lines on stdout."""
+    text = "text"
+    jsonl = "jsonl"
+
+
+@lru_cache(maxsize=1)
+def get_console() -> "Console":
+    """Shared console instance for rich output."""
+    from rich.console import Console
+    return Console()
+
+
+def _agent_service(server: Optional[str] = None):
+    """Configure logging and create the agent service: local, or a client of the `agent serve` at `server`."""
+    configure_logging()
+    if server:
+        from src.modules.agent.service.remote import RemoteAgentService
+        return RemoteAgentService(server)
+    from src.modules.agent.service.agent import AgentService
+    return AgentService()
+
+
+def _calendar_targets(
+    calendars: Optional[list[str]], check_tokens: bool = True
+) -> Optional[list["CalendarTarget"]]:
+    """
+    Parse `--calendar` options up front, so a typo fails before any work is done.
+    
+    Args:
+        calendars: `ACCOUNT[/CALENDAR_ID]` specs
+        check_tokens: Also require a stored token per account (off when another host schedules)
+    
+    Raises:
+        typer.BadParameter: If a target is invalid or its account is not authorized (usage error, exit code 2)
+    """
+    if not calendars:
+        return None
+    from src.infra.client.google_client import get_calendar_pool
+    from src.modules.agent.service.calendar import CalendarTarget
+
+    try:
+        targets = [CalendarTarget.parse(spec) for spec in calendars]
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="'--calendar'") from None
+    if check_tokens:
+        pool = get_calendar_pool()
+        for account in dict.fromkeys(target.account for target in targets):
+            if not pool.is_authorized(account):
+                raise typer.BadParameter(
+                    f"Calendar account {account!r} is not authorized; run `agent calendar auth {account}` first",
+                    param_hint="'--calendar'"
+                )
+    return targets
+
+
 @app.command(name="run")
 def run_agent_command(
-    url: Optional[str] = typer.Option(None, "--url", "-u", help="URL to an article or YouTube video"),
+    url: Optional[str] = typer.Option(None, "--url", "-u", help="URL to an article, YouTube video, playlist or channel"),
     text: Optional[str] = typer.Option(None, "--text", "-t", help="Direct text input"),
-    auto_schedule: bool = typer.Option(False, "--auto-schedule", help="Auto-schedule all actions without asking")
+    file: Optional[str] = typer.Option(None, "--file", "-f", help="Local text, Markdown or HTML file (streamed in chunks)"),
+    auto_schedule: bool = typer.Option(False, "--auto-schedule", help="Auto-schedule all actions without asking"),
+    calendars: Optional[list[str]] = typer.Option(
+        None, "--calendar", "-c", help="Schedule into ACCOUNT[/CALENDAR_ID] (repeatable; default: CALENDAR_ACCOUNTS)"
+    ),
+    server: Optional[str] = typer.Option(None, "--server", help="Submit work to a running `agent serve` at this URL"),
+    timings: bool = typer.Option(False, "--timings", help="Print a per-stage timing breakdown at exit"),
+    metrics_out: Optional[str] = typer.Option(
+        None, "--metrics-out", help="Export metrics to a Prometheus textfile (or JSON with a .json suffix)"
+    ),
+    profile_mode: Optional[ProfileMode] = typer.Option(
+        None, "--profile", help="Profile the run (cpu: cProfile + sampled stacks, mem: tracemalloc) into logs/"
+    ),
+    output: OutputMode = typer.Option(
+        OutputMode.text, "--output", "-o",
+        help="jsonl: no rendering or prompts; one JSON record per item and stage on stdout (inputs from stdin if none given)"
+    )
 ):
     """Run the full agent workflow: summarize, extract actions, and schedule."""
-    agent_service = AgentService()
+    # A server schedules with its own tokens
+    targets = _calendar_targets(calendars, check_tokens=not server)
+    agent_service = _agent_service(server)
+    
+    report = None
+    failed = 0
+    try:
+        with ExitStack() as stack:
+            if profile_mode:
+                from src.core.profiling import profile
+                report = stack.enter_context(profile(profile_mode))
+            if output is OutputMode.jsonl:
+                failed = _run_headless(
+                    agent_service, url=url, text=text, file=file, auto_schedule=auto_schedule, targets=targets
+                )
+            else:
+                _run_workflow(
+                    agent_service, url=url, text=text, file=file, auto_schedule=auto_schedule, targets=targets
+                )
+    finally:
+        if timings:
+            _print_timings(output)
+        if metrics_out:
+            path = metrics.write(metrics_out)
+            logger.info("Metrics written to %s", path)
+        if report:
+            _print_profile(report, output)
+    if output is OutputMode.jsonl and failed:
+        raise typer.Exit(1)
+
+
+def _run_headless(
+    agent_service,
+    url: Optional[str],
+    text: Optional[str],
+    file: Optional[str],
+    auto_schedule: bool,
+    targets: Optional[list["CalendarTarget"]] = None
+) -> int:
+    """JSON Lines run of the given input, or of one input per stdin line; returns the number of failed items."""
+    import sys
+    from src.modules.agent.headless import HeadlessRun, JsonlWriter, read_inputs
+
+    if url or text or file:
+        inputs = [{"url": url, "text": text, "path": file}]
+    elif sys.stdin.isatty():
+        # Usage error (exit code 2) rather than waiting on the terminal
+        raise typer.BadParameter(
+            "none given and stdin is a terminal; pipe one input per line", param_hint="'--url', '--text' or '--file'"
+        )
+    else:
+        inputs = read_inputs(sys.stdin)
+    return HeadlessRun(agent_service, JsonlWriter(sys.stdout), auto_schedule, targets).run(inputs)
+
+
+def _run_workflow(
+    agent_service,
+    url: Optional[str],
+    text: Optional[str],
+    file: Optional[str],
+    auto_schedule: bool,
+    targets: Optional[list["CalendarTarget"]] = None
+):
+    """Interactive fetch → summarize → extract → schedule flow for one input (or playlist/channel)."""
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+
+    console = get_console()
     
     # Welcome
     welcome_text = """
@@ -43,7 +187,9 @@ def run_agent_command(
     console.print()
     
     # Get input
-    if url:
+    if file:
+        user_input = file
+    elif url:
         user_input = url
     elif text:
         user_input = text
@@ -51,7 +197,7 @@ def run_agent_command(
         console.print("[dim]Enter one of the following:[/dim]")
         console.print("[dim]  1. Direct text you want summarized[/dim]")
         console.print("[dim]  2. URL to an online article[/dim]")
-        console.print("[dim]  3. URL to a YouTube video[/dim]")
+        console.print("[dim]  3. URL to a YouTube video, playlist or channel[/dim]")
         user_input = Prompt.ask(
             "[bold]Your input[/bold]",
             default=""
@@ -62,65 +208,227 @@ def run_agent_command(
         return
     
     # Determine if input is URL or text
-    from src.infra.client.content_fetcher import is_url
-    if url or (user_input and is_url(user_input)):
+    from src.infra.client.content_fetcher import is_url, is_youtube_collection_url
+    input_path = file
+    if file:
+        input_url = input_text = None
+    elif url or (user_input and is_url(user_input)):
         input_url = url if url else user_input
         input_text = None
     else:
         input_url = None
         input_text = text if text else user_input
     
-    # Fetch content
+    if input_url and is_youtube_collection_url(input_url):
+        _run_collection(agent_service, input_url, auto_schedule, targets)
+    else:
+        # Fetch content
+        try:
+            with console.status("[cyan]Fetching content...[/cyan]", spinner="dots"):
+                content = agent_service.process_content(url=input_url, text=input_text, path=input_path)
+            console.print(
+                f"[green]✓ Extracted {content.character_count} characters from {content.source_type}[/green]"
+            )
+        except ValueError as e:
+            logger.error("Content fetch failed: %s", e, exc_info=True)
+            console.print(f"[red]✗ Error:[/red] {e}")
+            return
+        
+        _process_item(agent_service, content, auto_schedule, targets)
+    
+    console.print()
+    console.print(Panel.fit("[bold green]Processing complete. Thank you![/bold green]", border_style="green"))
+
+
+def _run_collection(
+    agent_service, url: str, auto_schedule: bool, targets: Optional[list["CalendarTarget"]] = None
+):
+    """Process the videos of a playlist or channel as their transcripts arrive."""
+    from rich.panel import Panel
+
+    console = get_console()
+    count = 0
     try:
-        with console.status("[cyan]Fetching content...[/cyan]", spinner="dots"):
-            content = agent_service.process_content(url=input_url, text=input_text)
-        console.print(
-            f"[green]✓ Extracted {len(content.text)} characters from {content.source_type}[/green]"
-        )
+        with console.status("[cyan]Fetching playlist transcripts...[/cyan]", spinner="dots") as status:
+            videos = agent_service.process_collection(url)
+            for content in videos:
+                count += 1
+                # Prompts and spinners of the per-video flow need the terminal
+                status.stop()
+                console.print()
+                console.print(Panel.fit(
+                    f"[bold cyan]Video {count}:[/bold cyan] {content.source_url}", border_style="cyan"
+                ))
+                console.print(
+                    f"[green]✓ Extracted {content.character_count} characters from {content.source_type}[/green]"
+                )
+                _process_item(agent_service, content, auto_schedule, targets)
+                status.start()
     except ValueError as e:
-        logger.error(f"Content fetch failed: {e}", exc_info=True)
+        logger.error("Collection fetch failed: %s", e, exc_info=True)
         console.print(f"[red]✗ Error:[/red] {e}")
         return
     
+    if count:
+        console.print(f"[green]✓ Processed {count} new videos[/green]")
+    else:
+        console.print("[yellow]No new videos: all were already processed or have no transcript.[/yellow]")
+
+
+def _process_item(
+    agent_service,
+    content,
+    auto_schedule: bool,
+    targets: Optional[list["CalendarTarget"]] = None,
+    prepared=None
+) -> bool:
+    """
+    Summarize → extract → schedule flow for one fetched content item.
+    
+    `prepared` is a `(summary, actions)` result (or exception) of `summarize_packed`;
+    given one, the summarize and extract calls are skipped.
+    
+    Returns:
+        True if the item was completed, False if a stage failed (errors are printed)
+    """
+    console = get_console()
+    
+    if isinstance(prepared, Exception):
+        logger.error("Summarization failed: %s", prepared)
+        console.print(f"[red]✗ Error:[/red] Failed to summarize: {prepared}")
+        return False
+    
     # Summarize
     try:
-        with console.status("[cyan]Summarizing text with AI...[/cyan]", spinner="dots"):
-            summary = agent_service.summarize(content)
-        console.print()
-        console.print(Panel.fit(
-            "[bold cyan]Summary Points[/bold cyan]",
-            border_style="cyan"
-        ))
-        console.print(Markdown(summary.points))
-        console.print()
+        if prepared is None:
+            with console.status("[cyan]Summarizing text with AI...[/cyan]", spinner="dots"):
+                summary = agent_service.summarize(content)
+        else:
+            summary, actions = prepared
+        _print_summary(summary)
     except Exception as e:
-        logger.error(f"Summarization failed: {e}", exc_info=True)
+        logger.error("Summarization failed: %s", e, exc_info=True)
         console.print(f"[red]✗ Error:[/red] Failed to summarize: {e}")
-        return
+        return False
     
     # Extract actions
     try:
-        with console.status("[cyan]Extracting actionable tasks with AI...[/cyan]", spinner="dots"):
-            actions = agent_service.extract_actions(summary)
-        console.print(Panel.fit(
-            "[bold cyan]Extracted Actionable Tasks[/bold cyan]",
-            border_style="cyan"
-        ))
-        
-        # Create table for actions
-        table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
-        table.add_column("#", style="dim", width=3)
-        table.add_column("Action", style="white")
-        
-        for i, action in enumerate(actions, 1):
-            table.add_row(str(i), action)
-        
-        console.print(table)
-        console.print()
+        if prepared is None:
+            with console.status("[cyan]Extracting actionable tasks with AI...[/cyan]", spinner="dots"):
+                actions = agent_service.extract_actions(summary)
+        _print_actions(actions)
     except Exception as e:
-        logger.error(f"Action extraction failed: {e}", exc_info=True)
+        logger.error("Action extraction failed: %s", e, exc_info=True)
         console.print(f"[red]✗ Error:[/red] Failed to extract actions: {e}")
-        return
+        return False
+    
+    if not _schedule_actions(agent_service, content, actions, auto_schedule, targets):
+        return False
+    agent_service.mark_processed(content.source_url)
+    return True
+
+
+def _process_packed(
+    agent_service,
+    items: list[tuple[str, dict]],
+    auto_schedule: bool,
+    targets: Optional[list["CalendarTarget"]] = None,
+    done: Optional[Callable[[int], None]] = None
+) -> list[bool]:
+    """
+    Fetch several items, summarize them in packed requests, then run each item's flow.
+    
+    Args:
+        agent_service: Local or remote agent service
+        items: `(panel title, process_content kwargs)` per item
+        auto_schedule: Schedule all actions without asking
+        targets: Calendars to schedule into
+        done: Called with each item's index once the item is handled, in order
+    
+    Returns:
+        Per item, False if it failed in a way worth retrying; items rejected as bad input
+        by the fetch count as handled
+    """
+    from rich.panel import Panel
+
+    console = get_console()
+    fetched = []
+    with console.status(f"[cyan]Fetching {len(items)} items...[/cyan]", spinner="dots"):
+        for _, kwargs in items:
+            try:
+                fetched.append(agent_service.process_content(**kwargs))
+            except ValueError as e:
+                logger.error("Content fetch failed for %s: %s", kwargs, e, exc_info=True)
+                fetched.append(e)
+    contents = [content for content in fetched if not isinstance(content, Exception)]
+    with console.status(f"[cyan]Summarizing {len(contents)} items with AI...[/cyan]", spinner="dots"):
+        results = iter(agent_service.summarize_packed(contents) if contents else [])
+    
+    handled = []
+    for index, ((title, _), content) in enumerate(zip(items, fetched)):
+        console.print()
+        console.print(Panel.fit(title, border_style="cyan"))
+        if isinstance(content, Exception):
+            console.print(f"[red]✗ Error:[/red] {content}")
+            handled.append(True)
+        else:
+            console.print(f"[green]✓ Extracted {content.character_count} characters from {content.source_type}[/green]")
+            handled.append(_process_item(agent_service, content, auto_schedule, targets, prepared=next(results)))
+        if done:
+            done(index)
+    return handled
+
+
+def _print_summary(summary):
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+
+    console = get_console()
+    console.print()
+    console.print(Panel.fit(
+        "[bold cyan]Summary Points[/bold cyan]",
+        border_style="cyan"
+    ))
+    console.print(Markdown(summary.points))
+    console.print()
+
+
+def _print_actions(actions: list[str]):
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
+
+    console = get_console()
+    console.print(Panel.fit(
+        "[bold cyan]Extracted Actionable Tasks[/bold cyan]",
+        border_style="cyan"
+    ))
+    
+    # Create table for actions
+    table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
+    table.add_column("#", style="dim", width=3)
+    table.add_column("Action", style="white")
+    
+    for i, action in enumerate(actions, 1):
+        table.add_row(str(i), action)
+    
+    console.print(table)
+    console.print()
+
+
+def _schedule_actions(
+    agent_service, content, actions: list[str], auto_schedule: bool, targets: Optional[list["CalendarTarget"]]
+) -> bool:
+    """
+    Ask which actions to schedule and when (or take all at the default time) and add them to the calendars.
+    
+    Returns:
+        False if any event could not be created
+    """
+    from rich.panel import Panel
+    from rich.prompt import Prompt, Confirm
+
+    console = get_console()
     
     # Schedule actions
     if auto_schedule:
@@ -161,22 +469,477 @@ def run_agent_command(
                 console.print(f"[green]✓ Scheduled for {start_time.strftime('%Y-%m-%d %H:%M')}[/green]")
     
     if confirmed:
+        requests = [
+            (action, start_time, agent_service.source_link(content, action)) for action, start_time in confirmed
+        ]
         console.print()
-        for action, start_time in confirmed:
-            try:
-                with console.status(f"[cyan]Adding '{action}' to calendar...[/cyan]", spinner="dots"):
-                    event = agent_service.schedule_action(action, start_time)
-                if event.event_link:
+        ok = True
+        with console.status("[cyan]Adding actions to calendar...[/cyan]", spinner="dots") as status:
+            for action, target, result in agent_service.schedule_actions(requests, targets):
+                status.stop()
+                where = f" [dim]({target})[/dim]" if target else ""
+                if isinstance(result, Exception):
+                    ok = False
+                    logger.error("Failed to schedule action '%s': %s", action, result)
+                    console.print(f"[red]✗ Error:[/red] Failed to schedule '{action}'{where}: {result}")
+                elif result.event_link:
                     console.print(
-                        f"[green]✓ Event created:[/green] [link={event.event_link}]{event.event_link}[/link]"
+                        f"[green]✓ Event created for '{action}'{where}:[/green] "
+                        f"[link={result.event_link}]{result.event_link}[/link]"
                     )
                 else:
-                    console.print(f"[green]✓ Event created for {event.start_time.strftime('%Y-%m-%d %H:%M')}[/green]")
-            except Exception as e:
-                logger.error(f"Failed to schedule action '{action}': {e}", exc_info=True)
-                console.print(f"[red]✗ Error:[/red] Failed to schedule action: {e}")
+                    console.print(
+                        f"[green]✓ Event created for '{action}'{where} at "
+                        f"{result.start_time.strftime('%Y-%m-%d %H:%M')}[/green]"
+                    )
+                status.start()
+        return ok
+    console.print("[yellow]No actions scheduled.[/yellow]")
+    return True
+
+
+def _print_timings(output: OutputMode = OutputMode.text):
+    """Render the per-stage and per-call timing breakdown of this process."""
+    if output is OutputMode.jsonl:
+        import sys
+        from src.modules.agent.headless import JsonlWriter, timings_record
+        JsonlWriter(sys.stdout).write(timings_record())
+        return
+
+    from rich import box
+    from rich.table import Table
+
+    table = Table(title="Timings", show_header=True, header_style="bold magenta", box=box.ROUNDED)
+    table.add_column("Span", style="white")
+    table.add_column("Kind", style="dim")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    table.add_column("Errors", justify="right")
+    
+    for timing in metrics.timings():
+        table.add_row(
+            timing.name,
+            timing.kind,
+            str(timing.calls),
+            f"{timing.total * 1000:.1f}",
+            f"{timing.mean * 1000:.1f}",
+            f"{timing.max * 1000:.1f}",
+            str(timing.errors) if timing.errors else ""
+        )
+    
+    get_console().print(table)
+
+
+def _print_profile(report: "ProfileReport", output: OutputMode = OutputMode.text):
+    """Print the profiler's top-N summary and where its files were written."""
+    if output is OutputMode.jsonl:
+        import sys
+        from src.modules.agent.headless import JsonlWriter
+        JsonlWriter(sys.stdout).write({"stage": "profile", "mode": report.mode.value, "files": [str(p) for p in report.files]})
+        return
+
+    from rich.panel import Panel
+
+    console = get_console()
+    console.print(Panel.fit(f"[bold cyan]Profile ({report.mode.value})[/bold cyan]", border_style="cyan"))
+    console.print(report.summary, markup=False, highlight=False)
+    for path in report.files:
+        console.print(f"[green]✓ Profile written:[/green] {path}")
+
+
+feed_app = typer.Typer(help="Manage subscribed RSS/Atom feeds")
+app.add_typer(feed_app, name="feeds")
+
+
+def _feed_service():
+    from src.core.settings import STORAGE_DIR, get_settings
+    from src.modules.agent.service.feeds import FeedService, FeedStore
+
+    settings = get_settings()
+    return FeedService(
+        FeedStore(STORAGE_DIR / 'feeds.sqlite3'),
+        max_workers=settings.FEED_POLL_WORKERS,
+        initial_entries=settings.FEED_INITIAL_ENTRIES
+    )
+
+
+@feed_app.command(name="add")
+def feed_add_command(urls: list[str] = typer.Argument(..., help="Feed URLs to subscribe to")):
+    """Subscribe to RSS/Atom feeds."""
+    store = _feed_service().store
+    console = get_console()
+    for url in urls:
+        if store.add(url):
+            console.print(f"[green]✓ Subscribed:[/green] {url}")
+        else:
+            console.print(f"[yellow]Already subscribed:[/yellow] {url}")
+
+
+@feed_app.command(name="remove")
+def feed_remove_command(urls: list[str] = typer.Argument(..., help="Feed URLs to unsubscribe from")):
+    """Unsubscribe from RSS/Atom feeds."""
+    store = _feed_service().store
+    console = get_console()
+    for url in urls:
+        if store.remove(url):
+            console.print(f"[green]✓ Unsubscribed:[/green] {url}")
+        else:
+            console.print(f"[yellow]Not subscribed:[/yellow] {url}")
+
+
+@feed_app.command(name="list")
+def feed_list_command():
+    """List subscribed feeds and their high-water marks."""
+    from rich import box
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
+    table.add_column("Feed", style="white")
+    table.add_column("Newest entry", style="dim")
+    for state in _feed_service().store.states():
+        table.add_row(state.url, state.high_water.strftime('%Y-%m-%d %H:%M') if state.high_water else "")
+    get_console().print(table)
+
+
+calendar_app = typer.Typer(help="Manage the Google Calendar accounts actions are scheduled into")
+app.add_typer(calendar_app, name="calendar")
+
+
+@calendar_app.command(name="auth")
+def calendar_auth_command(
+    accounts: list[str] = typer.Argument(..., help="Account names (one token file per account in storage/tokens/)")
+):
+    """Authorize Calendar accounts and store their tokens."""
+    from src.infra.client.google_client import get_calendar_pool
+
+    configure_logging()
+    console = get_console()
+    pool = get_calendar_pool()
+    for account in accounts:
+        try:
+            pool.get(account, interactive=True)
+        except (ValueError, FileNotFoundError) as e:
+            console.print(f"[red]✗ Error:[/red] {e}")
+            raise typer.Exit(1)
+        console.print(f"[green]✓ Authorized:[/green] {account} [dim]({pool.token_path(account)})[/dim]")
+
+
+@calendar_app.command(name="list")
+def calendar_list_command():
+    """List Calendar accounts with a stored token."""
+    from src.infra.client.google_client import get_calendar_pool
+
+    console = get_console()
+    accounts = get_calendar_pool().accounts()
+    if not accounts:
+        console.print("[yellow]No authorized accounts.[/yellow]")
+    for account in accounts:
+        console.print(account)
+
+
+@app.command(name="poll")
+def poll_command(
+    feeds: Optional[list[str]] = typer.Option(
+        None, "--feed", "-f", help="Poll only this feed (repeatable; subscribes it if needed)"
+    ),
+    auto_schedule: bool = typer.Option(False, "--auto-schedule", help="Auto-schedule all actions without asking"),
+    pack: bool = typer.Option(False, "--pack", help="Summarize short entries together in packed requests"),
+    server: Optional[str] = typer.Option(None, "--server", help="Submit work to a running `agent serve` at this URL")
+):
+    """Poll subscribed feeds and run new entries through the agent workflow."""
+    agent_service = _agent_service(server)
+    
+    from rich.panel import Panel
+
+    console = get_console()
+    feed_service = _feed_service()
+    count = 0
+    if pack:
+        with console.status("[cyan]Polling feeds...[/cyan]", spinner="dots"):
+            updates = list(feed_service.poll(feeds or None))
+        entries = [entry for update in updates for entry in update.entries]
+        count = len(entries)
+        failed = set()
+        if entries:
+            handled = _process_packed(agent_service, [
+                (f"[bold cyan]{entry.title or entry.link}[/bold cyan]\n[dim]{entry.link}[/dim]", {"url": entry.link})
+                for entry in entries
+            ], auto_schedule)
+            failed = {entry.id for entry, ok in zip(entries, handled) if not ok}
+        for update in updates:
+            feed_service.commit(update, failed)
     else:
-        console.print("[yellow]No actions scheduled.[/yellow]")
+        with console.status("[cyan]Polling feeds...[/cyan]", spinner="dots") as status:
+            for update in feed_service.poll(feeds or None):
+                status.stop()
+                failed = set()
+                for entry in update.entries:
+                    count += 1
+                    console.print()
+                    console.print(Panel.fit(
+                        f"[bold cyan]{entry.title or entry.link}[/bold cyan]\n[dim]{entry.link}[/dim]",
+                        border_style="cyan"
+                    ))
+                    try:
+                        with console.status("[cyan]Fetching content...[/cyan]", spinner="dots"):
+                            content = agent_service.process_content(url=entry.link)
+                        console.print(
+                            f"[green]✓ Extracted {content.character_count} characters from {content.source_type}[/green]"
+                        )
+                    except ValueError as e:
+                        logger.error("Content fetch failed for %s: %s", entry.link, e, exc_info=True)
+                        console.print(f"[red]✗ Error:[/red] {e}")
+                        continue
+                    if not _process_item(agent_service, content, auto_schedule):
+                        # Retried by the next poll
+                        failed.add(entry.id)
+                feed_service.commit(update, failed)
+                status.start()
     
-    console.print()
-    console.print(Panel.fit("[bold green]Processing complete. Thank you![/bold green]", border_style="green"))
+    if count:
+        console.print(f"[green]✓ Processed {count} new entries[/green]")
+    else:
+        console.print("[yellow]No new entries.[/yellow]")
+
+
+@app.command(name="watch")
+def watch_command(
+    path: str = typer.Argument(..., help="Inbox file (one URL or text snippet per line) or directory (one item per file)"),
+    auto_schedule: bool = typer.Option(False, "--auto-schedule", help="Auto-schedule all actions without asking"),
+    pack: bool = typer.Option(False, "--pack", help="Summarize short pending items together in packed requests"),
+    server: Optional[str] = typer.Option(None, "--server", help="Submit work to a running `agent serve` at this URL"),
+    once: bool = typer.Option(False, "--once", help="Process pending items and exit instead of watching")
+):
+    """Watch an inbox and run each new item through the agent workflow as it appears."""
+    from pathlib import Path
+    from rich.panel import Panel
+    from src.core.settings import STORAGE_DIR
+    from src.core.watch import open_watcher
+    from src.modules.agent.service.inbox import Inbox, default_state_path
+
+    console = get_console()
+    inbox_path = Path(path).expanduser()
+    if not inbox_path.exists() and not inbox_path.parent.is_dir():
+        console.print(f"[red]✗ Error:[/red] {inbox_path.parent} does not exist")
+        raise typer.Exit(1)
+    
+    agent_service = _agent_service(server)
+    
+    inbox = Inbox(inbox_path, default_state_path(STORAGE_DIR, inbox_path))
+    # Start watching before the first scan so nothing added meanwhile is missed
+    watcher = None if once else open_watcher(inbox_path)
+    logger.info("Watching inbox %s", inbox_path)
+    if watcher:
+        console.print(f"[green]✓ Watching[/green] [bold]{inbox_path}[/bold] [dim](Ctrl+C to stop)[/dim]")
+    try:
+        while True:
+            if pack:
+                items = list(inbox.pending())
+                if items:
+                    # Items are committed in inbox order, each once it has been handled
+                    _process_packed(agent_service, [
+                        (f"[bold cyan]Inbox:[/bold cyan] {item.url or item.text[:80]}", {"url": item.url, "text": item.text})
+                        for item in items
+                    ], auto_schedule, done=lambda index: inbox.commit(items[index]))
+            else:
+                for item in inbox.pending():
+                    console.print()
+                    console.print(Panel.fit(
+                        f"[bold cyan]Inbox:[/bold cyan] {item.url or item.text[:80]}", border_style="cyan"
+                    ))
+                    try:
+                        with console.status("[cyan]Fetching content...[/cyan]", spinner="dots"):
+                            content = agent_service.process_content(url=item.url, text=item.text)
+                        console.print(
+                            f"[green]✓ Extracted {content.character_count} characters from {content.source_type}[/green]"
+                        )
+                    except ValueError as e:
+                        logger.error("Content fetch failed for inbox item %s: %s", item.key, e, exc_info=True)
+                        console.print(f"[red]✗ Error:[/red] {e}")
+                    else:
+                        _process_item(agent_service, content, auto_schedule)
+                    # Failed items are not retried: a bad line must not block the inbox
+                    inbox.commit(item)
+            if watcher is None:
+                break
+            watcher.wait()
+    except KeyboardInterrupt:
+        console.print("[yellow]Stopped watching.[/yellow]")
+    finally:
+        if watcher:
+            watcher.close()
+
+
+@app.command(name="enqueue")
+def enqueue_command(
+    url: Optional[str] = typer.Option(None, "--url", "-u", help="URL to an article, YouTube video, playlist or channel"),
+    text: Optional[str] = typer.Option(None, "--text", "-t", help="Direct text input"),
+    file: Optional[str] = typer.Option(None, "--file", "-f", help="Local file (must be readable by the fetch workers)"),
+    auto_schedule: bool = typer.Option(False, "--auto-schedule", help="Schedule all actions at the default time"),
+    calendars: Optional[list[str]] = typer.Option(
+        None, "--calendar", "-c", help="Schedule into ACCOUNT[/CALENDAR_ID] (repeatable; default: CALENDAR_ACCOUNTS)"
+    ),
+    queue_url: Optional[str] = typer.Option(None, "--queue-url", help="Job queue URL (default: JOB_QUEUE_URL)")
+):
+    """Submit an input to the job queue for `agent worker` processes."""
+    # Workers may run on other hosts, with their own tokens
+    _calendar_targets(calendars, check_tokens=False)
+    from src.core.settings import get_settings
+    from src.infra.queue.base import open_job_queue
+    from src.modules.agent.worker import default_queue_url, submit
+
+    configure_logging()
+    console = get_console()
+    queue = open_job_queue(queue_url or default_queue_url())
+    try:
+        job_id = submit(
+            queue, url=url, text=text, path=file, auto_schedule=auto_schedule, calendars=calendars,
+            max_attempts=get_settings().JOB_MAX_ATTEMPTS
+        )
+    except ValueError as e:
+        console.print(f"[red]✗ Error:[/red] {e}")
+        raise typer.Exit(1)
+    finally:
+        queue.close()
+    console.print(f"[green]✓ Enqueued job[/green] {job_id}")
+
+
+@app.command(name="worker")
+def worker_command(
+    stages: Optional[list[str]] = typer.Option(
+        None, "--stage", "-s", help="Stage to serve: fetch, summarize, extract or schedule (repeatable; default: all)"
+    ),
+    concurrency: int = typer.Option(1, "--concurrency", "-c", min=1, help="Jobs processed in parallel"),
+    queue_url: Optional[str] = typer.Option(None, "--queue-url", help="Job queue URL (default: JOB_QUEUE_URL)")
+):
+    """Process queued jobs of some or all pipeline stages until interrupted."""
+    import threading
+    from src.core.settings import get_settings
+    from src.infra.queue.base import open_job_queue
+    from src.modules.agent.service.agent import AgentService
+    from src.modules.agent.worker import STAGES, SCHEDULE, Worker, default_queue_url
+
+    configure_logging()
+    console = get_console()
+    settings = get_settings()
+    queue = open_job_queue(queue_url or default_queue_url())
+    try:
+        agent_service = AgentService()
+        served = tuple(stages or STAGES)
+        worker = Worker(queue, agent_service, served, visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT)
+    except ValueError as e:
+        console.print(f"[red]✗ Error:[/red] {e}")
+        queue.close()
+        raise typer.Exit(1)
+    with console.status("[cyan]Warming up API clients...[/cyan]", spinner="dots"):
+        agent_service.warm_up(calendar=SCHEDULE in served)
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=worker.run, args=(stop,), name=f"worker-{i}", daemon=True)
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    console.print(
+        f"[green]✓ Worker {worker.owner} serving[/green] [bold]{', '.join(served)}[/bold] "
+        f"[dim]x{concurrency} (Ctrl+C to stop)[/dim]"
+    )
+    try:
+        while any(thread.is_alive() for thread in threads):
+            threads[0].join(timeout=1)
+    except KeyboardInterrupt:
+        console.print("[yellow]Stopping after the current jobs...[/yellow]")
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        queue.close()
+
+
+@app.command(name="jobs")
+def jobs_command(
+    queue_url: Optional[str] = typer.Option(None, "--queue-url", help="Job queue URL (default: JOB_QUEUE_URL)")
+):
+    """Show job counts per stage and status."""
+    from rich import box
+    from rich.table import Table
+    from src.infra.queue.base import DEAD, DONE, LEASED, READY, open_job_queue
+    from src.modules.agent.worker import default_queue_url
+
+    queue = open_job_queue(queue_url or default_queue_url())
+    try:
+        stats = queue.stats()
+    finally:
+        queue.close()
+    table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
+    table.add_column("Stage", style="white")
+    for status in (READY, LEASED, DONE, DEAD):
+        table.add_column(status.capitalize(), justify="right")
+    for queue_stats in stats:
+        table.add_row(queue_stats.queue, *(
+            str(queue_stats.counts[status]) if status in queue_stats.counts else ""
+            for status in (READY, LEASED, DONE, DEAD)
+        ))
+    get_console().print(table)
+
+
+@app.command(name="bench")
+def bench_command(
+    chars: int = typer.Option(50_000, "--chars", help="Length of the sample content text"),
+    iterations: int = typer.Option(200, "--iterations", "-n", help="Repetitions per measurement"),
+    unicode: bool = typer.Option(False, "--unicode", help="Use non-ASCII (Cyrillic) sample text"),
+    compress_min: int = typer.Option(1024, "--compress-min", help="Compression threshold in bytes for binary + zlib")
+):
+    """Benchmark DTO records: JSON versus the binary job queue encoding."""
+    from rich import box
+    from rich.table import Table
+    from src.modules.agent.bench import run_benchmark
+
+    table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
+    table.add_column("DTO", style="cyan")
+    table.add_column("Method", style="white")
+    table.add_column("Encode µs", justify="right")
+    table.add_column("Decode µs", justify="right")
+    table.add_column("Bytes", justify="right")
+    for result in run_benchmark(chars, iterations, unicode, compress_min):
+        table.add_row(
+            result.dto,
+            result.method,
+            f"{result.encode * 1e6:.1f}",
+            f"{result.decode * 1e6:.1f}",
+            f"{result.size:,}"
+        )
+    get_console().print(table)
+
+
+@app.command(name="serve")
+def serve_command(
+    host: Optional[str] = typer.Option(None, "--host", help="Interface to bind (default: AGENT_SERVER_HOST)"),
+    port: Optional[int] = typer.Option(None, "--port", "-p", help="Port to bind (default: AGENT_SERVER_PORT)"),
+    skip_calendar: bool = typer.Option(False, "--skip-calendar", help="Don't authenticate Calendar on startup")
+):
+    """Keep a warm agent running and serve `run --server` clients over a local HTTP API."""
+    from src.core.settings import get_settings
+    from src.modules.agent.server import AgentServer
+    from src.modules.agent.service.agent import AgentService
+
+    configure_logging()
+    console = get_console()
+    settings = get_settings()
+    agent_service = AgentService()
+    with console.status("[cyan]Warming up API clients...[/cyan]", spinner="dots"):
+        agent_service.warm_up(calendar=not skip_calendar)
+
+    server = AgentServer(host or settings.AGENT_SERVER_HOST, port or settings.AGENT_SERVER_PORT, agent_service)
+    logger.info("Agent server listening on %s", server.url)
+    console.print(f"[green]✓ Agent server listening on[/green] [bold]{server.url}[/bold] [dim](Ctrl+C to stop)[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[yellow]Shutting down.[/yellow]")
+    finally:
+        server.server_close()
+        logger.info("Agent server stopped")
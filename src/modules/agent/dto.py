@@ -1,7 +1,8 @@
 """Data Transfer Objects for agent module."""
 import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+from src.core.transcript import Transcript
 
 
 class ActionDTO(BaseModel):
@@ -19,9 +20,21 @@ class SummaryDTO(BaseModel):
 
 class ContentDTO(BaseModel):
     """Content data transfer object."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
     text: str
     source_type: str
     source_url: Optional[str] = None
+    # Local file sources are read in chunks on demand; `text` stays empty
+    source_path: Optional[str] = None
+    source_size: Optional[int] = None
+    # Segment timings of video transcripts; `text` is the transcript's own buffer. Not serialized.
+    transcript: Optional[Transcript] = Field(default=None, exclude=True, repr=False)
+    
+    @property
+    def character_count(self) -> int:
+        """Length of the text; for local files, the file size in bytes."""
+        return self.source_size if self.source_path else len(self.text)
 
 
 class ScheduledEventDTO(BaseModel):
@@ -30,3 +43,4 @@ class ScheduledEventDTO(BaseModel):
     start_time: datetime.datetime
     end_time: datetime.datetime
     event_link: Optional[str] = None
+    calendar: Optional[str] = None  # Account (and calendar id, if not primary)
@@ -0,0 +1,193 @@
+"""Headless JSON Lines output for batch runs.
+
+`run --output jsonl` renders nothing and asks nothing: each item's stages (content,
+summary, actions, schedule) are written to stdout as one JSON record each, flushed as
+soon as the stage completes, so downstream tools can consume results as a stream.
+"""
+import datetime
+import json
+import logging
+import time
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+from src.core.metrics import metrics
+
+if TYPE_CHECKING:
+    from src.modules.agent.service.calendar import CalendarTarget
+
+logger = logging.getLogger(__name__)
+
+
+class JsonlWriter:
+    """Writes one JSON object per line and flushes it right away."""
+
+    def __init__(self, out: IO[str]):
+        self.out = out
+
+    def write(self, record: dict[str, Any]) -> None:
+        self.out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.out.flush()
+
+
+def read_inputs(lines: Iterable[str]) -> Iterator[dict[str, Optional[str]]]:
+    """`process_content` arguments per non-empty line: a URL, or else direct text."""
+    from src.infra.client.content_fetcher import is_url
+
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield {"url": line} if is_url(line) else {"text": line}
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+class HeadlessRun:
+    """Runs inputs through the agent workflow, reporting every stage as a JSON record."""
+
+    def __init__(
+        self,
+        agent_service,
+        writer: JsonlWriter,
+        auto_schedule: bool = False,
+        targets: Optional[list["CalendarTarget"]] = None
+    ):
+        self.agent_service = agent_service
+        self.writer = writer
+        self.auto_schedule = auto_schedule
+        self.targets = targets
+        self.items = 0
+        self.errors = 0
+
+    def run(self, inputs: Iterable[dict[str, Optional[str]]]) -> int:
+        """
+        Process inputs one after another.
+
+        Args:
+            inputs: `process_content` keyword arguments (url, text or path) per input
+
+        Returns:
+            Number of items that failed at some stage
+        """
+        from src.infra.client.content_fetcher import is_youtube_collection_url
+
+        start = time.perf_counter()
+        for kwargs in inputs:
+            url = kwargs.get("url")
+            if url and is_youtube_collection_url(url):
+                self._collection(url)
+                continue
+            self.items += 1
+            content = self._stage(
+                self.items, "content", lambda: self.agent_service.process_content(**kwargs), self._content_record
+            )
+            if content is not None:
+                self._process(self.items, content)
+        self.writer.write({"stage": "done", "items": self.items, "errors": self.errors, "elapsed_ms": _elapsed_ms(start)})
+        return self.errors
+
+    def _collection(self, url: str) -> None:
+        start = time.perf_counter()
+        try:
+            for content in self.agent_service.process_collection(url):
+                self.items += 1
+                self.writer.write({"item": self.items, **self._content_record(content), "elapsed_ms": _elapsed_ms(start)})
+                self._process(self.items, content)
+                start = time.perf_counter()
+        except Exception as e:
+            self.items += 1
+            self.errors += 1
+            self._error(self.items, "content", e, start, source_url=url)
+
+    def _process(self, item: int, content) -> None:
+        summary = self._stage(
+            item, "summary", lambda: self.agent_service.summarize(content), lambda summary: {"points": summary.points}
+        )
+        if summary is None:
+            return
+        actions = self._stage(
+            item, "actions", lambda: self.agent_service.extract_actions(summary), lambda actions: {"actions": actions}
+        )
+        if actions is None:
+            return
+        if actions and self.auto_schedule and not self._schedule(item, content, actions):
+            return
+        self.agent_service.mark_processed(content.source_url)
+
+    def _schedule(self, item: int, content, actions: list[str]) -> bool:
+        """Schedules the actions, writing one record per event; returns False if any failed."""
+        start_time = datetime.datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        requests = [(action, start_time, self.agent_service.source_link(content, action)) for action in actions]
+        start = time.perf_counter()
+        failed = False
+        for action, target, result in self.agent_service.schedule_actions(requests, self.targets):
+            if isinstance(result, Exception):
+                failed = True
+                self._error(item, "schedule", result, start, action=action, calendar=str(target))
+            else:
+                self.writer.write({
+                    "item": item,
+                    "stage": "schedule",
+                    "action": action,
+                    "calendar": result.calendar,
+                    "start_time": result.start_time.isoformat(),
+                    "event_link": result.event_link,
+                    "elapsed_ms": _elapsed_ms(start),
+                })
+        if failed:
+            self.errors += 1
+        return not failed
+
+    def _stage(self, item: int, stage: str, call, record):
+        """Runs one stage and writes its record (or an error record); returns the result or None."""
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            self.errors += 1
+            self._error(item, stage, e, start)
+            return None
+        self.writer.write({"item": item, "stage": stage, **record(result), "elapsed_ms": _elapsed_ms(start)})
+        return result
+
+    def _error(self, item: int, stage: str, error: Exception, start: float, **fields) -> None:
+        logger.error("Item %s failed at %s: %s", item, stage, error, exc_info=error)
+        metrics.inc("agent_headless_errors_total", stage=stage)
+        self.writer.write({
+            "item": item,
+            "stage": stage,
+            **fields,
+            "error": str(error),
+            "error_type": type(error).__name__,
+            "elapsed_ms": _elapsed_ms(start),
+        })
+
+    @staticmethod
+    def _content_record(content) -> dict[str, Any]:
+        return {
+            "stage": "content",
+            "source_type": content.source_type,
+            "source_url": content.source_url,
+            "source_path": content.source_path,
+            "chars": content.character_count,
+        }
+
+
+def timings_record() -> dict[str, Any]:
+    """Per-span timing breakdown of this process, like `--timings` prints."""
+    return {
+        "stage": "timings",
+        "spans": [
+            {
+                "name": timing.name,
+                "kind": timing.kind,
+                "calls": timing.calls,
+                "total_ms": round(timing.total * 1000, 1),
+                "mean_ms": round(timing.mean * 1000, 1),
+                "max_ms": round(timing.max * 1000, 1),
+                "errors": timing.errors,
+            }
+            for timing in metrics.timings()
+        ],
+    }
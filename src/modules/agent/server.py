@@ -0,0 +1,153 @@
+"""Local HTTP API keeping a warm AgentService between requests."""
+import datetime
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from src.core.metrics import metrics
+from src.modules.agent.dto import ContentDTO, SummaryDTO
+from src.modules.agent.service.agent import AgentService
+from src.modules.agent.service.calendar import CalendarTarget
+
+logger = logging.getLogger(__name__)
+
+
+def _content_dto(data: dict) -> ContentDTO:
+    """
+    Validate content sent by a client.
+
+    Raises:
+        ValueError: If the content refers to a file on the server
+    """
+    content = ContentDTO.model_validate(data)
+    if content.source_path:
+        # Clients are unauthenticated: never read server-side files on their behalf
+        raise ValueError("Local files are not accepted by the agent server; send their text")
+    return content
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the server's AgentService."""
+
+    server: "AgentServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(200, metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        routes: dict[str, Callable[[dict], Any]] = {
+            "/content": self._content,
+            "/summary": self._summary,
+            "/actions": self._actions,
+            "/packed": self._packed,
+            "/schedule": self._schedule,
+            "/processed": self._processed,
+            "/processed/mark": self._mark_processed,
+        }
+        route = routes.get(self.path)
+        if route is None:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            self._send_json(200, route(payload))
+        except ValueError as e:
+            # ValueError is the services' "bad input" signal; keep it distinguishable for the client
+            logger.warning("Rejected %s request: %s", self.path, e)
+            self._send_json(400, {"error": str(e), "type": "ValueError"})
+        except Exception as e:
+            logger.error("Request %s failed: %s", self.path, e, exc_info=True)
+            self._send_json(500, {"error": str(e), "type": type(e).__name__})
+
+    def _content(self, payload: dict) -> dict:
+        if payload.get("path"):
+            raise ValueError("Local files are not accepted by the agent server; send their text")
+        content = self.server.agent_service.process_content(url=payload.get("url"), text=payload.get("text"))
+        return content.model_dump(mode="json")
+
+    def _summary(self, payload: dict) -> dict:
+        content = _content_dto(payload["content"])
+        return self.server.agent_service.summarize(content).model_dump(mode="json")
+
+    def _actions(self, payload: dict) -> dict:
+        summary = SummaryDTO.model_validate(payload["summary"])
+        return {"actions": self.server.agent_service.extract_actions(summary)}
+
+    def _packed(self, payload: dict) -> dict:
+        contents = [_content_dto(content) for content in payload["contents"]]
+        results = []
+        for result in self.server.agent_service.summarize_packed(contents):
+            if isinstance(result, Exception):
+                results.append({"error": str(result), "type": type(result).__name__})
+            else:
+                summary, actions = result
+                results.append({"summary": summary.model_dump(mode="json"), "actions": actions})
+        return {"results": results}
+
+    def _schedule(self, payload: dict) -> dict:
+        start_time = datetime.datetime.fromisoformat(payload["start_time"])
+        duration_hours = payload.get("duration_hours", 1)
+        if payload.get("default_calendars"):
+            # Fan out to all of the server's CALENDAR_ACCOUNTS; per-calendar errors are reported inline
+            events = []
+            results = self.server.agent_service.schedule_actions(
+                [(payload["action"], start_time, payload.get("source_link"))], duration_hours=duration_hours
+            )
+            for _, target, result in results:
+                if isinstance(result, Exception):
+                    events.append({"calendar": str(target), "error": str(result)})
+                else:
+                    events.append(result.model_dump(mode="json"))
+            return {"events": events}
+        event = self.server.agent_service.schedule_action(
+            payload["action"],
+            start_time,
+            duration_hours,
+            payload.get("source_link"),
+            CalendarTarget.parse(payload["calendar"]) if payload.get("calendar") else None
+        )
+        return event.model_dump(mode="json")
+
+    def _processed(self, payload: dict) -> dict:
+        return {"processed": [url for url in payload["urls"] if self.server.agent_service.is_processed(url)]}
+
+    def _mark_processed(self, payload: dict) -> dict:
+        self.server.agent_service.mark_processed(payload.get("url"))
+        return {}
+
+    def _send_json(self, status: int, body: dict) -> None:
+        self._send(status, json.dumps(body).encode("utf-8"), "application/json")
+
+    def _send(self, status: int, data: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+class AgentServer(ThreadingHTTPServer):
+    """Threaded localhost server sharing one AgentService across requests."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int, agent_service: AgentService):
+        self.agent_service = agent_service
+        super().__init__((host, port), AgentRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
@@ -0,0 +1,177 @@
+"""Semantic de-duplication of scheduled actions.
+
+Action texts are embedded with a feature-hashing vectorizer (word unigrams, bigrams and
+character trigrams, L2-normalized), so no model or vocabulary has to be stored. Vectors
+of scheduled actions live in an append-only float32 file; new actions are compared
+against them in batches with a single matrix product per block.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIM = 256
+
+# Stored vectors are scored in blocks to bound the temporary score matrix
+BLOCK_ROWS = 65_536
+
+STOPWORDS = frozenset({"a", "an", "the", "to", "of", "and", "or", "for", "on", "in", "at", "with", "your", "my", "this"})
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashingVectorizer:
+    """Maps short texts to fixed-size, L2-normalized vectors via signed feature hashing."""
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+
+    def features(self, text: str) -> list[str]:
+        words = [word for word in _WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def transform(self, texts: list[str]) -> np.ndarray:
+        """Vectorize texts into a (len(texts), dim) float32 matrix of unit rows."""
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            features = self.features(text)
+            rows += [row] * len(features)
+            # crc32 is stable across processes, unlike hash()
+            hashes += [zlib.crc32(feature.encode()) for feature in features]
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), hashes % self.dim), signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+class ActionIndex:
+    """Persistent vector index of scheduled action texts.
+
+    `actions.f32` holds the raw row-major vectors and `actions.jsonl` the matching texts;
+    both are append-only so adding an action never rewrites the index.
+    """
+
+    def __init__(self, directory: Path, threshold: float = 0.75, dim: int = DEFAULT_DIM):
+        self.directory = directory
+        self.threshold = threshold
+        self.vectorizer = HashingVectorizer(dim)
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._size = 0
+        self._texts: list[str] = []
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / "actions.f32"
+
+    @property
+    def _texts_path(self) -> Path:
+        return self.directory / "actions.jsonl"
+
+    def _load(self) -> None:
+        if self._vectors is not None:
+            return
+        dim = self.vectorizer.dim
+        texts, text_ends = [], []  # text_ends: byte offset after each complete line
+        if self._texts_path.exists():
+            with open(self._texts_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    offset += len(line)
+                    if not line.endswith(b"\n"):
+                        break  # Torn last line
+                    texts.append(json.loads(line))
+                    text_ends.append(offset)
+        vectors = np.zeros((0, dim), dtype=np.float32)
+        if self._vectors_path.exists():
+            vectors = np.fromfile(self._vectors_path, dtype=np.float32)
+            vectors = vectors[:len(vectors) // dim * dim].reshape(-1, dim)
+        # A crash between or during the two appends leaves one file longer; keep the common
+        # prefix and cut both files back to it, so later appends stay aligned
+        self._size = min(len(texts), len(vectors))
+        self._truncate(self._vectors_path, self._size * dim * np.dtype(np.float32).itemsize)
+        self._truncate(self._texts_path, text_ends[self._size - 1] if self._size else 0)
+        self._texts = texts[:self._size]
+        self._vectors = np.empty((max(self._size, 1024), dim), dtype=np.float32)
+        self._vectors[:self._size] = vectors[:self._size]
+        logger.debug("Loaded %s action vectors from %s", self._size, self.directory)
+
+    @staticmethod
+    def _truncate(path: Path, size: int) -> None:
+        if path.exists() and path.stat().st_size > size:
+            logger.warning("Truncating torn append in %s to %s bytes", path, size)
+            os.truncate(path, size)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return self._size
+
+    def find_duplicates(self, texts: list[str]) -> list[Optional[tuple[str, float]]]:
+        """
+        Match each text against previously indexed actions.
+
+        Args:
+            texts: Candidate action texts
+
+        Returns:
+            For each text, the most similar indexed action and its cosine similarity if it
+            reaches the threshold, else None
+        """
+        if not texts:
+            return []
+        queries = self.vectorizer.transform(texts)
+        with self._lock:
+            self._load()
+            best_scores = np.full(len(texts), -1.0, dtype=np.float32)
+            best_rows = np.zeros(len(texts), dtype=np.int64)
+            for start in range(0, self._size, BLOCK_ROWS):
+                block = self._vectors[start:min(start + BLOCK_ROWS, self._size)]
+                scores = block @ queries.T
+                rows = scores.argmax(axis=0)
+                block_best = scores[rows, np.arange(len(texts))]
+                better = block_best > best_scores
+                best_scores[better] = block_best[better]
+                best_rows[better] = rows[better] + start
+            return [
+                (self._texts[row], float(score)) if score >= self.threshold else None
+                for row, score in zip(best_rows, best_scores)
+            ]
+
+    def add(self, texts: list[str]) -> None:
+        """Append action texts to the index."""
+        if not texts:
+            return
+        vectors = self.vectorizer.transform(texts)
+        with self._lock:
+            self._load()
+            if self._size + len(texts) > len(self._vectors):
+                grown = np.empty((max(2 * len(self._vectors), self._size + len(texts)), self.vectorizer.dim), dtype=np.float32)
+                grown[:self._size] = self._vectors[:self._size]
+                self._vectors = grown
+            self._vectors[self._size:self._size + len(texts)] = vectors
+            self._size += len(texts)
+            self._texts.extend(texts)
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self._vectors_path, "ab") as f:
+                vectors.tofile(f)
+            with open(self._texts_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(text) + "\n" for text in texts)
@@ -1,10 +1,16 @@
 """Main agent service orchestrating the workflow."""
+import datetime
 import logging
-from typing import Optional
+from typing import Iterator, Optional, Union
+from src.core.metrics import metrics
+from src.core.settings import STORAGE_DIR, get_settings
+from src.infra.client.google_client import get_genai_client, get_calendar_service
 from src.modules.agent.service.content import ContentService
-from src.modules.agent.service.ai import AIService
-from src.modules.agent.service.calendar import CalendarService
-from src.modules.agent.dto import ContentDTO, SummaryDTO, ActionDTO
+from src.modules.agent.service.ai import AIService, pack
+from src.modules.agent.service.calendar import CalendarService, CalendarTarget
+from src.modules.agent.service.action_index import ActionIndex
+from src.modules.agent.service.fingerprint import FingerprintIndex, SimHasher, normalize_url, simhash
+from src.modules.agent.dto import ContentDTO, SummaryDTO, ActionDTO, ScheduledEventDTO
 
 logger = logging.getLogger(__name__)
 
@@ -12,61 +18,178 @@ logger = logging.getLogger(__name__)
 class AgentService:
     """Main service orchestrating the information-to-action workflow."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        fingerprint_index: Optional[FingerprintIndex] = None,
+        action_index: Optional[ActionIndex] = None
+    ):
+        settings = get_settings()
         self.content_service = ContentService()
         self.ai_service = AIService()
-        self.calendar_service = CalendarService()
+        self.calendar_service = CalendarService(max_workers=settings.CALENDAR_WORKERS)
+        # Calendars actions are scheduled into unless a caller names others
+        self.calendar_targets = CalendarTarget.parse_list(settings.CALENDAR_ACCOUNTS) or [CalendarTarget()]
+        
+        self.chunk_chars = settings.SUMMARY_CHUNK_CHARS
+        self.pack_token_budget = settings.PACK_TOKEN_BUDGET
+        self.pack_max_items = settings.PACK_MAX_ITEMS
+        self.pack_max_item_chars = settings.PACK_MAX_ITEM_CHARS
+        if fingerprint_index is None and settings.DEDUP_ENABLED:
+            fingerprint_index = FingerprintIndex(
+                STORAGE_DIR / 'fingerprints.sqlite3',
+                max_distance=settings.DEDUP_MAX_DISTANCE
+            )
+        self.fingerprint_index = fingerprint_index
+        
+        if action_index is None and settings.ACTION_DEDUP_ENABLED:
+            action_index = ActionIndex(STORAGE_DIR / 'actions', threshold=settings.ACTION_DEDUP_THRESHOLD)
+        self.action_index = action_index
+    
+    def warm_up(self, calendar: bool = True) -> None:
+        """
+        Initialize API clients ahead of the first request.
+        
+        Args:
+            calendar: Also authenticate the Calendar services of the default calendar accounts
+        """
+        logger.info("Warming up API clients")
+        get_genai_client()
+        if calendar:
+            try:
+                for account in dict.fromkeys(target.account for target in self.calendar_targets):
+                    get_calendar_service(account)
+            except Exception as e:
+                # Scheduling will retry authentication on first use
+                logger.warning("Calendar warm-up failed: %s", e)
+        logger.info("API clients ready")
     
     def process_content(
         self,
         url: Optional[str] = None,
-        text: Optional[str] = None
+        text: Optional[str] = None,
+        path: Optional[str] = None
     ) -> ContentDTO:
         """
-        Process and fetch content from URL or text.
+        Process and fetch content from URL, text or a local file.
         
         Args:
             url: URL to fetch content from
             text: Direct text input
+            path: Local file, read in chunks when summarized
             
         Returns:
             ContentDTO with processed content
         """
         if url:
-            logger.info(f"Processing content from URL: {url}")
+            logger.info("Processing content from URL: %s", url)
+        elif path:
+            logger.info("Processing local file: %s", path)
         else:
             logger.info("Processing direct text input")
         
         try:
-            content = self.content_service.fetch_content(url=url, text=text)
-            logger.info(f"Content processed: {len(content.text)} characters from {content.source_type}")
+            with metrics.span("fetch") as span:
+                content = self.content_service.fetch_content(url=url, text=text, path=path)
+                span.set(chars=content.character_count, source_type=content.source_type)
+            logger.info("Content processed: %s characters from %s", content.character_count, content.source_type)
             return content
         except Exception as e:
-            logger.error(f"Failed to process content: {e}", exc_info=True)
+            logger.error("Failed to process content: %s", e, exc_info=True)
             raise
     
+    def process_collection(self, url: str) -> Iterator[ContentDTO]:
+        """
+        Fetch the videos of a YouTube playlist or channel.
+        
+        Args:
+            url: Playlist or channel URL
+            
+        Yields:
+            ContentDTO per video not recorded by `mark_processed`, as its transcript arrives
+        """
+        logger.info("Processing YouTube collection: %s", url)
+        count = 0
+        for content in self.content_service.fetch_collection(url, skip=self.is_processed):
+            count += 1
+            metrics.inc("agent_collection_videos_total")
+            logger.info("Fetched %s characters from %s", content.character_count, content.source_url)
+            yield content
+        logger.info("Collection processed: %s new videos", count)
+    
+    def is_processed(self, source_url: str) -> bool:
+        """Whether content from this URL was recorded by `mark_processed` (always False without DEDUP_ENABLED)."""
+        return bool(self.fingerprint_index) and self.fingerprint_index.is_processed(
+            normalize_url(ContentService.canonical_url(source_url))
+        )
+    
+    def mark_processed(self, source_url: Optional[str]) -> None:
+        """
+        Record that content from this URL completed the workflow, so collections skip it.
+        
+        Callers mark an item only once it is done (summarized, actions extracted and
+        scheduled as requested); a failed or interrupted item is fetched again next time.
+        """
+        if self.fingerprint_index and source_url:
+            self.fingerprint_index.mark_processed(normalize_url(ContentService.canonical_url(source_url)))
+    
     def summarize(self, content: ContentDTO) -> SummaryDTO:
         """
         Summarize content into key points.
         
+        Content longer than SUMMARY_CHUNK_CHARS, and local files, are streamed to the AI
+        service chunk by chunk instead of as one string.
+        
         Args:
             content: ContentDTO to summarize
             
         Returns:
             SummaryDTO with summary points
         """
-        logger.info(f"Summarizing content ({len(content.text)} characters)")
+        character_count = content.character_count
+        chunked = bool(content.source_path) or character_count > self.chunk_chars
+        logger.info("Summarizing content (%s characters%s)", character_count, ", chunked" if chunked else "")
         try:
-            summary_text = self.ai_service.summarize_text(content.text)
+            url_key = fingerprint = None
+            if self.fingerprint_index:
+                with metrics.span("fingerprint", chars=character_count) as span:
+                    url_key = normalize_url(content.source_url) if content.source_url else None
+                    if chunked:
+                        hasher = SimHasher()
+                        for chunk in self.content_service.chunks(content, self.chunk_chars):
+                            hasher.update(chunk)
+                        fingerprint = hasher.digest()
+                    else:
+                        fingerprint = simhash(content.text)
+                    match = self.fingerprint_index.find(url_key, fingerprint)
+                    span.set(cache_hit=match is not None)
+                if match:
+                    logger.info("Reusing summary of near-duplicate item %s (distance %s)", match.id, match.distance)
+                    return SummaryDTO(
+                        points=match.summary_points,
+                        source_type=content.source_type,
+                        character_count=character_count
+                    )
+            
+            with metrics.span("summarize", chars=character_count):
+                if chunked:
+                    summary_text = self.ai_service.summarize_chunks(
+                        self.content_service.chunks(content, self.chunk_chars), self.chunk_chars
+                    )
+                else:
+                    summary_text = self.ai_service.summarize_text(content.text)
             summary = SummaryDTO(
                 points=summary_text,
                 source_type=content.source_type,
-                character_count=len(content.text)
+                character_count=character_count
             )
+            if self.fingerprint_index:
+                self.fingerprint_index.add(
+                    url_key, fingerprint, summary.points, summary.source_type, summary.character_count
+                )
             logger.info("Content summarized successfully")
             return summary
         except Exception as e:
-            logger.error(f"Failed to summarize content: {e}", exc_info=True)
+            logger.error("Failed to summarize content: %s", e, exc_info=True)
             raise
     
     def extract_actions(self, summary: SummaryDTO) -> list[str]:
@@ -77,18 +200,119 @@ class AgentService:
             summary: SummaryDTO to extract actions from
             
         Returns:
-            List of actionable tasks
+            List of actionable tasks, without those similar to already scheduled actions
         """
         logger.info("Extracting actions from summary")
         try:
-            actions = self.ai_service.extract_actions(summary.points)
-            logger.info(f"Extracted {len(actions)} actions")
-            return actions
+            with metrics.span("extract", chars=len(summary.points)) as span:
+                actions = self.fingerprint_index.find_actions(summary.points) if self.fingerprint_index else None
+                span.set(cache_hit=actions is not None if self.fingerprint_index else None)
+                if actions is None:
+                    actions = self.ai_service.extract_actions(summary.points)
+                    if self.fingerprint_index:
+                        self.fingerprint_index.set_actions(summary.points, actions)
+                span.set(actions=len(actions))
+            logger.info("Extracted %s actions", len(actions))
+            return self._drop_scheduled(actions)
         except Exception as e:
-            logger.error(f"Failed to extract actions: {e}", exc_info=True)
+            logger.error("Failed to extract actions: %s", e, exc_info=True)
             raise
     
-    def schedule_action(self, action: str, start_time, duration_hours: int = 1):
+    def _drop_scheduled(self, actions: list[str]) -> list[str]:
+        """Actions without those similar to already scheduled ones."""
+        if self.action_index is None or not actions:
+            return actions
+        with metrics.span("action_dedup") as span:
+            matches = self.action_index.find_duplicates(actions)
+            span.set(duplicates=sum(match is not None for match in matches))
+        for action, match in zip(actions, matches):
+            if match:
+                logger.info("Skipping action '%s': already scheduled as '%s' (%.2f)", action, *match)
+        return [action for action, match in zip(actions, matches) if match is None]
+    
+    def summarize_packed(
+        self,
+        contents: list[ContentDTO]
+    ) -> list[Union[tuple[SummaryDTO, list[str]], Exception]]:
+        """
+        Summarize many items and extract their actions, packing short ones into shared requests.
+        
+        Items of up to PACK_MAX_ITEM_CHARS characters are grouped into Gemini requests of
+        up to PACK_TOKEN_BUDGET input tokens and PACK_MAX_ITEMS items. Longer items, local
+        files and items already processed before take the regular `summarize` and
+        `extract_actions` path.
+        
+        Args:
+            contents: Fetched items
+            
+        Returns:
+            `(summary, actions)`, or the exception that item failed with, per item in input order
+        """
+        results: list[Union[tuple[SummaryDTO, list[str]], Exception, None]] = [None] * len(contents)
+        packable = []  # (index, url_key, fingerprint)
+        for index, content in enumerate(contents):
+            short = not content.source_path and content.character_count <= self.pack_max_item_chars
+            url_key = fingerprint = None
+            if short and self.fingerprint_index:
+                url_key = normalize_url(content.source_url) if content.source_url else None
+                fingerprint = simhash(content.text)
+                # Known items are answered from the index without any request
+                short = self.fingerprint_index.find(url_key, fingerprint) is None
+            if short:
+                packable.append((index, url_key, fingerprint))
+                continue
+            try:
+                summary = self.summarize(content)
+                results[index] = (summary, self.extract_actions(summary))
+            except Exception as e:
+                results[index] = e
+        
+        logger.info("Packing %s of %s items", len(packable), len(contents))
+        texts = [contents[index].text for index, _, _ in packable]
+        for batch in pack(texts, self.pack_token_budget, self.pack_max_items):
+            items = [packable[position] for position in batch]
+            try:
+                with metrics.span("summarize_packed", items=len(items), chars=sum(len(texts[p]) for p in batch)):
+                    packed = self.ai_service.summarize_packed([texts[position] for position in batch])
+            except Exception as e:
+                logger.error("Failed to summarize %s packed items: %s", len(items), e, exc_info=True)
+                for index, _, _ in items:
+                    results[index] = e
+                continue
+            for (index, url_key, fingerprint), result in zip(items, packed):
+                if isinstance(result, Exception):
+                    results[index] = result
+                    continue
+                points, actions = result
+                content = contents[index]
+                summary = SummaryDTO(
+                    points=points,
+                    source_type=content.source_type,
+                    character_count=content.character_count
+                )
+                if self.fingerprint_index:
+                    self.fingerprint_index.add(
+                        url_key, fingerprint, summary.points, summary.source_type, summary.character_count
+                    )
+                    self.fingerprint_index.set_actions(summary.points, actions)
+                results[index] = (summary, self._drop_scheduled(actions))
+        return results
+    
+    def source_link(self, content: ContentDTO, action: str) -> Optional[str]:
+        """
+        Link an action back to its source: the matching transcript timestamp for videos,
+        otherwise the source URL.
+        """
+        return ContentService.source_link(content, action)
+    
+    def schedule_action(
+        self,
+        action: str,
+        start_time,
+        duration_hours: int = 1,
+        source_link: Optional[str] = None,
+        target: Optional[CalendarTarget] = None
+    ):
         """
         Schedule an action in Google Calendar.
         
@@ -96,15 +320,50 @@ class AgentService:
             action: Action description
             start_time: Start time for the event
             duration_hours: Duration in hours
+            source_link: Link back to the source, added to the event description
+            target: Calendar to add the event to (default: the default account's primary calendar)
             
         Returns:
             ScheduledEventDTO with event details
         """
-        logger.info(f"Scheduling action: '{action}' for {start_time}")
+        logger.info("Scheduling action: '%s' for %s", action, start_time)
         try:
-            event = self.calendar_service.add_event(action, start_time, duration_hours)
-            logger.info(f"Action scheduled successfully: {event.event_link}")
+            with metrics.span("schedule"):
+                event = self.calendar_service.add_event(action, start_time, duration_hours, source_link, target)
+            if self.action_index is not None:
+                self.action_index.add([action])
+            logger.info("Action scheduled successfully: %s", event.event_link)
             return event
         except Exception as e:
-            logger.error(f"Failed to schedule action '{action}': {e}", exc_info=True)
+            logger.error("Failed to schedule action '%s': %s", action, e, exc_info=True)
             raise
+    
+    def schedule_actions(
+        self,
+        actions: list[tuple[str, datetime.datetime, Optional[str]]],
+        targets: Optional[list[CalendarTarget]] = None,
+        duration_hours: int = 1
+    ) -> Iterator[tuple[str, CalendarTarget, Union[ScheduledEventDTO, Exception]]]:
+        """
+        Schedule several actions into several calendars concurrently.
+        
+        Args:
+            actions: `(action, start_time, source_link)` per action
+            targets: Calendars to add every action to (default: CALENDAR_ACCOUNTS)
+            duration_hours: Duration in hours
+            
+        Yields:
+            `(action, target, event or exception)` in completion order
+        """
+        targets = targets or self.calendar_targets
+        logger.info("Scheduling %s actions into %s calendars", len(actions), len(targets))
+        scheduled = set()
+        for action, target, result in self.calendar_service.add_events(actions, targets, duration_hours):
+            if isinstance(result, Exception):
+                logger.error("Failed to schedule action '%s' in %s: %s", action, target, result)
+            else:
+                scheduled.add(action)
+                logger.info("Action scheduled in %s: %s", target, result.event_link)
+            yield action, target, result
+        if self.action_index is not None and scheduled:
+            self.action_index.add([action for action, _, _ in actions if action in scheduled])
@@ -1,9 +1,132 @@
 """Service for AI operations (summarization, action extraction)."""
+import json
 import logging
+from itertools import chain
+from typing import Any, Iterable, Iterator, Union
+from src.core.metrics import metrics
+from src.core.quota import GEMINI_REQUESTS, GEMINI_TOKENS, get_quota_manager
 from src.infra.client.google_client import get_genai_client
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_PROMPT = 'Summarize the following text into exactly 5 concise bullet points:\n\n'
+NOTES_PROMPT = (
+    'The following is one part of a longer document. Write concise notes of its key points, '
+    'facts and recommendations as a short bullet list:\n\n'
+)
+
+ACTIONS_PROMPT = (
+    'Given these summary points, extract 3 to 5 concrete, actionable tasks for a calendar. '
+    'Return ONLY a simple list, one per line:\n\n'
+)
+PACKED_PROMPT = (
+    'Process each of the following items independently. For every item, summarize it into exactly '
+    '5 concise bullet points and extract 3 to 5 concrete, actionable tasks for a calendar. '
+    'Respond with a JSON array holding one object per item, in any order: '
+    '{"id": <item id>, "summary": "<the bullet points as markdown>", "actions": ["<task>", ...]}\n\n'
+)
+
+MODEL = 'gemini-2.0-flash-001'
+
+# Rough token estimate used to reserve TPM quota before a call; corrected with the actual usage after it
+CHARS_PER_TOKEN = 4
+EXPECTED_OUTPUT_TOKENS = 500
+
+
+def _generate(prompt: str, json_output: bool = False, expected_output_tokens: int = EXPECTED_OUTPUT_TOKENS) -> str:
+    """Calls Gemini once, within the host-wide request and token quotas."""
+    quota = get_quota_manager()
+    estimate = len(prompt) // CHARS_PER_TOKEN + expected_output_tokens
+    if quota is not None:
+        quota.acquire(GEMINI_REQUESTS)
+        quota.acquire(GEMINI_TOKENS, estimate)
+    
+    client = get_genai_client()
+    try:
+        with metrics.span("gemini.generate_content", kind="call", prompt_chars=len(prompt)) as span:
+            response = client.models.generate_content(
+                model=MODEL,
+                contents=prompt,
+                config={'response_mime_type': 'application/json'} if json_output else None
+            )
+            span.set(response_chars=len(response.text or ''))
+    except Exception as e:
+        if quota is not None and getattr(e, 'code', None) == 429:
+            # Rate limited despite the local budget (e.g. other hosts): make every process back off
+            logger.warning("Gemini rate limit hit, draining the shared request quota")
+            quota.drain(GEMINI_REQUESTS)
+        raise
+    
+    usage = getattr(response, 'usage_metadata', None)
+    total_tokens = getattr(usage, 'total_token_count', None)
+    if quota is not None and isinstance(total_tokens, int):
+        quota.consume(GEMINI_TOKENS, total_tokens - estimate)
+    return response.text or ''
+
+
+def _parse_actions(text: str) -> list[str]:
+    # Basic parsing: split by lines and filter empty/index markers
+    actions = [line.strip().lstrip('- 12345. ') for line in text.split('\n') if line.strip()]
+    return actions[:5]
+
+
+def _parse_packed(text: str, count: int) -> dict[int, tuple[str, list[str]]]:
+    """
+    Per-item results of a packed response, by item index.
+
+    Items with a missing, duplicated or malformed result are left out.
+    """
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.strip('`').removeprefix('json').strip()
+    try:
+        data: Any = json.loads(text)
+    except ValueError:
+        logger.warning("Packed response is not valid JSON")
+        return {}
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list):
+        logger.warning("Packed response is not a JSON array")
+        return {}
+    
+    results: dict[int, tuple[str, list[str]]] = {}
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        index, summary, actions = entry.get('id'), entry.get('summary'), entry.get('actions')
+        if isinstance(index, str) and index.isdigit():
+            index = int(index)
+        if not isinstance(index, int) or not 0 <= index < count or index in results:
+            continue
+        if not isinstance(summary, str) or not summary.strip():
+            continue
+        if not isinstance(actions, list) or not all(isinstance(action, str) for action in actions):
+            continue
+        results[index] = (summary.strip(), [action.strip() for action in actions if action.strip()][:5])
+    return results
+
+
+def pack(texts: list[str], token_budget: int, max_items: int) -> Iterator[list[int]]:
+    """
+    Groups consecutive texts into batches of at most `max_items` whose estimated input
+    tokens stay within `token_budget`; a text larger than the budget forms its own batch.
+
+    Yields:
+        Item indexes per batch
+    """
+    batch: list[int] = []
+    tokens = 0
+    for index, text in enumerate(texts):
+        size = len(text) // CHARS_PER_TOKEN + 1
+        if batch and (tokens + size > token_budget or len(batch) >= max_items):
+            yield batch
+            batch, tokens = [], 0
+        batch.append(index)
+        tokens += size
+    if batch:
+        yield batch
+
 
 class AIService:
     """Service for AI-powered text processing."""
@@ -19,19 +142,60 @@ class AIService:
         Returns:
             Summary as markdown formatted string
         """
-        logger.debug(f"Summarizing text ({len(text)} characters)")
+        logger.debug("Summarizing text (%s characters)", len(text))
         try:
-            client = get_genai_client()
-            response = client.models.generate_content(
-                model='gemini-2.0-flash-001',
-                contents='Summarize the following text into exactly 5 concise bullet points:\n\n' + text
-            )
+            summary = _generate(SUMMARY_PROMPT + text)
             logger.debug("Text summarized successfully")
-            return response.text
+            return summary
         except Exception as e:
-            logger.error(f"Failed to summarize text: {e}", exc_info=True)
+            logger.error("Failed to summarize text: %s", e, exc_info=True)
             raise
     
+    @staticmethod
+    def _notes(text: str) -> str:
+        """Condenses one part of a long document into short notes."""
+        return _generate(NOTES_PROMPT + text)
+    
+    @classmethod
+    def summarize_chunks(cls, chunks: Iterable[str], max_chars: int) -> str:
+        """
+        Summarizes a long text given as consecutive chunks into 5 key bullet points.
+        
+        Each chunk is condensed into notes as it arrives, so only one chunk and the notes
+        are held at a time; when the notes outgrow `max_chars` they are condensed again.
+        A single chunk is summarized directly.
+        
+        Args:
+            chunks: Text chunks, in document order
+            max_chars: Maximum characters of notes kept before condensing them
+            
+        Returns:
+            Summary as markdown formatted string
+        """
+        chunks = iter(chunks)
+        first = next(chunks, '')
+        second = next(chunks, None)
+        if second is None:
+            return cls.summarize_text(first)
+        
+        notes: list[str] = []
+        notes_chars = 0
+        count = 0
+        try:
+            for chunk in chain((first, second), chunks):
+                count += 1
+                note = cls._notes(chunk)
+                notes.append(note)
+                notes_chars += len(note)
+                if notes_chars > max_chars:
+                    condensed = cls._notes('\n\n'.join(notes))
+                    notes, notes_chars = [condensed], len(condensed)
+        except Exception as e:
+            logger.error("Failed to summarize chunk %s: %s", count, e, exc_info=True)
+            raise
+        logger.debug("Summarizing notes of %s chunks", count)
+        return cls.summarize_text('\n\n'.join(notes))
+    
     @staticmethod
     def extract_actions(summary: str) -> list[str]:
         """
@@ -45,15 +209,57 @@ class AIService:
         """
         logger.debug("Extracting actions from summary")
         try:
-            client = get_genai_client()
-            response = client.models.generate_content(
-                model='gemini-2.0-flash-001',
-                contents='Given these summary points, extract 3 to 5 concrete, actionable tasks for a calendar. Return ONLY a simple list, one per line:\n\n' + summary
-            )
-            # Basic parsing: split by lines and filter empty/index markers
-            actions = [line.strip().lstrip('- 12345. ') for line in response.text.split('\n') if line.strip()]
-            logger.debug(f"Extracted {len(actions[:5])} actions")
-            return actions[:5]
+            actions = _parse_actions(_generate(ACTIONS_PROMPT + summary))
+            logger.debug("Extracted %d actions", len(actions))
+            return actions
         except Exception as e:
-            logger.error(f"Failed to extract actions: {e}", exc_info=True)
+            logger.error("Failed to extract actions: %s", e, exc_info=True)
             raise
+    
+    @classmethod
+    def summarize_packed(cls, texts: list[str]) -> list[Union[tuple[str, list[str]], Exception]]:
+        """
+        Summarizes several short texts and extracts their actions with one Gemini request.
+        
+        The texts are sent as numbered items and the JSON response is split back per item.
+        Items whose result is missing or malformed are processed with individual
+        `summarize_text` and `extract_actions` calls instead.
+        
+        Args:
+            texts: Texts to process
+            
+        Returns:
+            `(summary, actions)`, or the exception its fallback failed with, per text in input order
+            
+        Raises:
+            Exception: If the packed request itself fails
+        """
+        logger.debug("Processing %s items in one packed request", len(texts))
+        prompt = PACKED_PROMPT + ''.join(
+            f'<item id="{index}">\n{text}\n</item>\n\n' for index, text in enumerate(texts)
+        )
+        try:
+            response = _generate(prompt, json_output=True, expected_output_tokens=EXPECTED_OUTPUT_TOKENS * len(texts))
+        except Exception as e:
+            logger.error("Packed request for %s items failed: %s", len(texts), e, exc_info=True)
+            raise
+        parsed = _parse_packed(response, len(texts))
+        
+        results: list[Union[tuple[str, list[str]], Exception]] = []
+        for index, text in enumerate(texts):
+            result: Union[tuple[str, list[str]], Exception, None] = parsed.get(index)
+            if result is not None:
+                metrics.inc("agent_packed_items_total", result="packed")
+                results.append(result)
+                continue
+            logger.warning("No usable packed result for item %s, processing it individually", index)
+            try:
+                summary = cls.summarize_text(text)
+                result = (summary, cls.extract_actions(summary))
+                metrics.inc("agent_packed_items_total", result="fallback")
+            except Exception as e:
+                # Keep the other items' results; this one is reported in its own slot
+                result = e
+                metrics.inc("agent_packed_items_total", result="failed")
+            results.append(result)
+        return results
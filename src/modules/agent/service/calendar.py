@@ -1,18 +1,71 @@
 """Service for Google Calendar operations."""
 import logging
 import datetime
-from googleapiclient.errors import HttpError
-from src.infra.client.google_client import get_calendar_service
+from dataclasses import dataclass
+from itertools import product
+from typing import Iterator, Optional, Union
+from src.core.concurrency import imap_unordered
+from src.core.metrics import metrics
+from src.core.quota import CALENDAR_WRITES, get_quota_manager
+from src.infra.client.google_client import DEFAULT_ACCOUNT, get_calendar_pool, validate_account
 from src.modules.agent.dto import ScheduledEventDTO
 
 logger = logging.getLogger(__name__)
 
+# 403 reasons Calendar uses for rate limiting, besides 429
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+def _is_rate_limited(error) -> bool:
+    status = error.resp.status
+    details = error.error_details if isinstance(error.error_details, list) else []
+    return status == 429 or (
+        status == 403 and any(isinstance(d, dict) and d.get("reason") in _RATE_LIMIT_REASONS for d in details)
+    )
+
+
+@dataclass(frozen=True)
+class CalendarTarget:
+    """A calendar of an authorized account."""
+    account: str = DEFAULT_ACCOUNT
+    calendar_id: str = 'primary'
+
+    @classmethod
+    def parse(cls, spec: str) -> "CalendarTarget":
+        """
+        Parses `ACCOUNT` or `ACCOUNT/CALENDAR_ID`.
+
+        Raises:
+            ValueError: If the account is missing or not a valid account name
+        """
+        account, _, calendar_id = spec.strip().partition('/')
+        if not account:
+            raise ValueError(f"Invalid calendar target: {spec!r}")
+        return cls(validate_account(account), calendar_id or 'primary')
+
+    @classmethod
+    def parse_list(cls, specs: str) -> list["CalendarTarget"]:
+        """Parses a comma-separated list of targets."""
+        return [cls.parse(spec) for spec in specs.split(',') if spec.strip()]
+
+    def __str__(self) -> str:
+        return self.account if self.calendar_id == 'primary' else f"{self.account}/{self.calendar_id}"
+
 
 class CalendarService:
     """Service for managing calendar events."""
     
-    @staticmethod
-    def add_event(action: str, start_time: datetime.datetime, duration_hours: int = 1) -> ScheduledEventDTO:
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+    
+    def add_event(
+        self,
+        action: str,
+        start_time: datetime.datetime,
+        duration_hours: int = 1,
+        source_link: Optional[str] = None,
+        target: Optional[CalendarTarget] = None
+    ) -> ScheduledEventDTO:
         """
         Adds an action as an event to Google Calendar.
         
@@ -20,6 +73,8 @@ class CalendarService:
             action: Action description
             start_time: Start time for the event
             duration_hours: Duration in hours (default: 1)
+            source_link: Link back to the source (e.g. video timestamp) for the description
+            target: Account and calendar (default: the default account's primary calendar)
             
         Returns:
             ScheduledEventDTO with event details
@@ -27,14 +82,20 @@ class CalendarService:
         Raises:
             HttpError: If calendar API call fails
         """
-        logger.debug(f"Creating calendar event: '{action}' at {start_time}")
+        from googleapiclient.errors import HttpError
+
+        target = target or CalendarTarget()
+        logger.debug("Creating calendar event: '%s' at %s in %s", action, start_time, target)
+        quota = get_quota_manager()
         try:
-            service = get_calendar_service()
+            pool = get_calendar_pool()
+            service = pool.get(target.account)
             end_time = start_time + datetime.timedelta(hours=duration_hours)
             
             event = {
                 'summary': action,
-                'description': 'Generated by Calendar-Integrated Agent',
+                'description': 'Generated by Calendar-Integrated Agent'
+                + (f'\nSource: {source_link}' if source_link else ''),
                 'start': {
                     'dateTime': start_time.isoformat(),
                     'timeZone': 'UTC',
@@ -45,19 +106,59 @@ class CalendarService:
                 },
             }
 
-            event = service.events().insert(calendarId='primary', body=event).execute()
+            if quota is not None:
+                quota.acquire(CALENDAR_WRITES)
+            with pool.lock(target.account), metrics.span("calendar.events.insert", kind="call"):
+                event = service.events().insert(calendarId=target.calendar_id, body=event).execute()
             event_link = event.get('htmlLink')
-            logger.info(f"Calendar event created: {event_link}")
+            logger.info("Calendar event created: %s", event_link)
             
             return ScheduledEventDTO(
                 action=action,
                 start_time=start_time,
                 end_time=end_time,
-                event_link=event_link
+                event_link=event_link,
+                calendar=str(target)
             )
         except HttpError as e:
-            logger.error(f"HTTP error creating calendar event: {e}", exc_info=True)
+            if quota is not None and _is_rate_limited(e):
+                # Rate limited despite the local budget (e.g. other hosts): make every process back off
+                logger.warning("Calendar rate limit hit, draining the shared write quota")
+                quota.drain(CALENDAR_WRITES)
+            logger.error("HTTP error creating calendar event: %s", e, exc_info=True)
             raise
         except Exception as e:
-            logger.error(f"Failed to create calendar event: {e}", exc_info=True)
+            logger.error("Failed to create calendar event: %s", e, exc_info=True)
             raise
+    
+    def add_events(
+        self,
+        events: list[tuple[str, datetime.datetime, Optional[str]]],
+        targets: list[CalendarTarget],
+        duration_hours: int = 1
+    ) -> Iterator[tuple[str, CalendarTarget, Union[ScheduledEventDTO, Exception]]]:
+        """
+        Adds several events to several calendars concurrently.
+        
+        Each account's service is built once and shared by all its events; inserts into
+        different accounts run in parallel, those into the same account in turn.
+        
+        Args:
+            events: `(action, start_time, source_link)` per event
+            targets: Calendars to add every event to
+            duration_hours: Duration in hours (default: 1)
+            
+        Yields:
+            `(action, target, event or exception)` in completion order
+        """
+        def insert(request):
+            (action, start_time, source_link), target = request
+            return self.add_event(action, start_time, duration_hours, source_link, target)
+        
+        for ((action, _, _), target), future in imap_unordered(
+            insert, product(events, targets), max_workers=self.max_workers
+        ):
+            try:
+                yield action, target, future.result()
+            except Exception as e:
+                yield action, target, e
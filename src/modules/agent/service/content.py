@@ -1,28 +1,49 @@
 """Service for content fetching and processing."""
 import logging
-from typing import Optional
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from src.core.settings import STORAGE_DIR, get_settings
+from src.core.transcript import TranscriptCache
 from src.infra.client.content_fetcher import (
     is_url,
     is_youtube_url,
+    is_youtube_collection_url,
+    expand_youtube_collection,
+    extract_video_id,
     fetch_article_text,
-    fetch_video_transcript
+    fetch_transcript,
+    fetch_transcripts
 )
+from src.infra.client.file_reader import FileDocument
 from src.modules.agent.dto import ContentDTO
 
 logger = logging.getLogger(__name__)
 
+transcript_cache = TranscriptCache(STORAGE_DIR / 'transcripts')
+
+
+def _watch_url(video_id: str) -> str:
+    return f"https://www.youtube.com/watch?v={video_id}"
+
 
 class ContentService:
     """Service for fetching and processing content from various sources."""
     
     @staticmethod
-    def fetch_content(url: Optional[str] = None, text: Optional[str] = None) -> ContentDTO:
+    def fetch_content(
+        url: Optional[str] = None,
+        text: Optional[str] = None,
+        path: Optional[str] = None
+    ) -> ContentDTO:
         """
-        Fetch content from URL or use provided text.
+        Fetch content from URL, use provided text, or reference a local file.
+        
+        Local files are only validated here; their text is read in chunks when summarized.
         
         Args:
             url: URL to fetch content from
             text: Direct text input
+            path: Local text, Markdown or HTML file
             
         Returns:
             ContentDTO with fetched content
@@ -31,34 +52,48 @@ class ContentService:
             ValueError: If content cannot be fetched or is empty
         """
         if url:
+            transcript = None
+            if is_youtube_collection_url(url):
+                raise ValueError("Playlist and channel URLs list several videos; use fetch_collection")
             if is_youtube_url(url):
                 try:
-                    logger.debug(f"Fetching YouTube transcript from: {url}")
-                    content_text = fetch_video_transcript(url)
+                    logger.debug("Fetching YouTube transcript from: %s", url)
+                    transcript = fetch_transcript(url, cache=transcript_cache)
+                    content_text = transcript.text
                     source_type = "video transcript"
                 except Exception as e:
-                    logger.error(f"Failed to fetch video transcript from {url}: {e}", exc_info=True)
+                    logger.error("Failed to fetch video transcript from %s: %s", url, e, exc_info=True)
                     raise ValueError(f"Failed to fetch video transcript: {e}")
             elif is_url(url):
                 try:
-                    logger.debug(f"Fetching article from: {url}")
+                    logger.debug("Fetching article from: %s", url)
                     content_text = fetch_article_text(url)
                     source_type = "article"
                 except Exception as e:
-                    logger.error(f"Failed to fetch article from {url}: {e}", exc_info=True)
+                    logger.error("Failed to fetch article from %s: %s", url, e, exc_info=True)
                     raise ValueError(f"Failed to fetch article: {e}")
             else:
-                logger.warning(f"Invalid URL format: {url}")
+                logger.warning("Invalid URL format: %s", url)
                 raise ValueError("Invalid URL format")
             
             if not content_text:
-                logger.warning(f"Empty content extracted from {source_type}: {url}")
+                logger.warning("Empty content extracted from %s: %s", source_type, url)
                 raise ValueError(f"Could not extract text from {source_type}")
             
             return ContentDTO(
                 text=content_text,
                 source_type=source_type,
-                source_url=url
+                source_url=url,
+                transcript=transcript
+            )
+        elif path:
+            document = FileDocument(Path(path).expanduser().resolve())
+            document.validate()
+            return ContentDTO(
+                text="",
+                source_type="html file" if document.is_html else "file",
+                source_path=str(document.path),
+                source_size=document.size
             )
         elif text:
             return ContentDTO(
@@ -67,4 +102,110 @@ class ContentService:
                 source_url=None
             )
         else:
-            raise ValueError("Either url or text must be provided")
+            raise ValueError("Either url, text or path must be provided")
+    
+    @staticmethod
+    def fetch_collection(
+        url: str,
+        limit: Optional[int] = None,
+        skip: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[ContentDTO]:
+        """
+        Fetch the transcripts of a YouTube playlist or channel.
+        
+        Transcripts are fetched concurrently (`YOUTUBE_FETCH_WORKERS`) and yielded as they
+        arrive; videos whose transcript cannot be fetched are logged and skipped.
+        
+        Args:
+            url: Playlist or channel URL
+            limit: Maximum number of videos (default: YOUTUBE_COLLECTION_LIMIT)
+            skip: Called with each video URL; videos it returns True for are not fetched
+            
+        Yields:
+            ContentDTO per newly fetched video, in completion order
+            
+        Raises:
+            ValueError: If the URL is not a playlist or channel, or lists no videos
+        """
+        if not is_youtube_collection_url(url):
+            raise ValueError("Not a YouTube playlist or channel URL")
+        settings = get_settings()
+        try:
+            video_ids = expand_youtube_collection(url, limit=limit or settings.YOUTUBE_COLLECTION_LIMIT)
+        except Exception as e:
+            logger.error("Failed to expand YouTube collection %s: %s", url, e, exc_info=True)
+            raise ValueError(f"Failed to list videos: {e}")
+        if not video_ids:
+            raise ValueError("No videos found for this playlist or channel")
+        if skip is not None:
+            pending = [video_id for video_id in video_ids if not skip(_watch_url(video_id))]
+            logger.info("Skipping %s already processed videos", len(video_ids) - len(pending))
+            video_ids = pending
+        
+        for video_id, result in fetch_transcripts(
+            video_ids, cache=transcript_cache, max_workers=settings.YOUTUBE_FETCH_WORKERS
+        ):
+            if isinstance(result, Exception):
+                logger.warning("Skipping video %s: %s", video_id, result)
+                continue
+            if not result.text:
+                logger.warning("Skipping video %s: empty transcript", video_id)
+                continue
+            yield ContentDTO(
+                text=result.text,
+                source_type="video transcript",
+                source_url=_watch_url(video_id),
+                transcript=result
+            )
+    
+    @staticmethod
+    def canonical_url(url: str) -> str:
+        """Watch URL for any YouTube video URL form (youtu.be, shorts, embeds); other URLs unchanged."""
+        if is_youtube_url(url) and not is_youtube_collection_url(url):
+            try:
+                return _watch_url(extract_video_id(url))
+            except ValueError:
+                pass
+        return url
+    
+    @staticmethod
+    def chunks(content: ContentDTO, max_chars: int) -> Iterator[str]:
+        """
+        Text of the content in pieces of at most `max_chars` characters.
+        
+        Local files are streamed from disk and transcripts split on segment boundaries;
+        other text is split at whitespace.
+        """
+        if content.source_path:
+            yield from FileDocument(Path(content.source_path)).chunks(max_chars)
+        elif content.transcript is not None:
+            yield from content.transcript.chunks(max_chars)
+        else:
+            text, start = content.text, 0
+            while start < len(text):
+                end = start + max_chars
+                if end < len(text):
+                    space = text.rfind(" ", start + max_chars // 2, end)
+                    end = space + 1 if space != -1 else end
+                yield text[start:end]
+                start = end
+    
+    @staticmethod
+    def source_link(content: ContentDTO, action: str) -> Optional[str]:
+        """
+        Link back to where an action came from.
+        
+        Args:
+            content: Content the action was extracted from
+            action: Action text
+            
+        Returns:
+            Video URL at the best-matching transcript timestamp, the source URL or file URI, or None
+        """
+        if content.transcript is not None:
+            seconds = content.transcript.locate(action)
+            if seconds is not None:
+                return content.transcript.url_at(seconds)
+        if content.source_path:
+            return Path(content.source_path).as_uri()
+        return content.source_url
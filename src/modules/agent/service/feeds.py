@@ -0,0 +1,229 @@
+"""Incremental polling of subscribed RSS/Atom feeds.
+
+Each feed keeps its HTTP validators (ETag, Last-Modified) and a high-water mark: the
+newest entry date seen plus the entry ids of the last fetched document. A poll cycle
+sends conditional GETs, so unchanged feeds cost one 304 each, and only entries past the
+high-water mark are emitted.
+"""
+import datetime
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Collection, Iterator, Optional
+
+from src.core.concurrency import imap_unordered
+from src.infra.client.feed_fetcher import FeedEntry, FeedResponse, fetch_feed
+
+logger = logging.getLogger(__name__)
+
+# Bound on remembered entry ids per feed (feeds usually list 10-50 entries)
+MAX_SEEN_IDS = 500
+
+
+@dataclass
+class FeedState:
+    """Polling state of one subscribed feed."""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    high_water: Optional[datetime.datetime] = None
+    seen_ids: set[str] = field(default_factory=set)
+
+    @property
+    def is_new(self) -> bool:
+        return self.high_water is None and not self.seen_ids
+
+
+@dataclass
+class FeedUpdate:
+    """New entries of one feed, to be committed once processed."""
+    state: FeedState
+    response: FeedResponse
+    entries: list[FeedEntry]
+
+
+def new_entries(state: FeedState, entries: list[FeedEntry], initial_entries: int = 1) -> list[FeedEntry]:
+    """
+    Entries past a feed's high-water mark, oldest first.
+
+    Args:
+        state: Feed state from the previous poll
+        entries: Entries of the fetched document
+        initial_entries: Entries emitted on the first poll of a feed (newest ones)
+
+    Returns:
+        Entries newer than the high-water mark (or at it, with an unseen id), plus undated
+        entries with an unseen id
+    """
+    if state.is_new:
+        dated = sorted((entry for entry in entries if entry.published), key=lambda entry: entry.published)
+        newest = dated[-initial_entries:] if dated else entries[:initial_entries]
+        return newest if initial_entries > 0 else []
+    fresh = [
+        entry for entry in entries
+        if entry.id not in state.seen_ids
+        and (entry.published is None or state.high_water is None or entry.published >= state.high_water)
+    ]
+    epoch = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+    return sorted(fresh, key=lambda entry: entry.published or epoch)
+
+
+class FeedStore:
+    """SQLite-backed feed subscriptions and their polling state."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS feeds (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    high_water TEXT,
+                    seen_ids TEXT,
+                    checked_at TEXT,
+                    added_at TEXT DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+        return self._conn
+
+    def add(self, url: str) -> bool:
+        """Subscribe to a feed; returns False if already subscribed."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute("INSERT OR IGNORE INTO feeds (url) VALUES (?)", (url,))
+            return cursor.rowcount > 0
+
+    def remove(self, url: str) -> bool:
+        """Unsubscribe from a feed; returns False if it was not subscribed."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute("DELETE FROM feeds WHERE url = ?", (url,))
+            return cursor.rowcount > 0
+
+    def states(self, urls: Optional[list[str]] = None) -> list[FeedState]:
+        """Polling state of all subscribed feeds, or of the given (possibly unsubscribed) URLs."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT url, etag, last_modified, high_water, seen_ids FROM feeds ORDER BY added_at, url"
+            ).fetchall()
+        states = {
+            url: FeedState(
+                url=url,
+                etag=etag,
+                last_modified=last_modified,
+                high_water=datetime.datetime.fromisoformat(high_water) if high_water else None,
+                seen_ids=set(json.loads(seen_ids)) if seen_ids else set()
+            )
+            for url, etag, last_modified, high_water, seen_ids in rows
+        }
+        if urls is None:
+            return list(states.values())
+        return [states.get(url) or FeedState(url=url) for url in urls]
+
+    def commit(self, update: FeedUpdate, failed: Collection[str] = ()) -> None:
+        """
+        Advance a feed's validators and high-water mark past a processed poll.
+
+        Args:
+            update: Polled update
+            failed: Ids of emitted entries that failed and must be emitted again by the next poll
+        """
+        state, response = update.state, update.response
+        if response.not_modified:
+            return
+        done = [entry for entry in response.entries if entry.id not in failed]
+        dates = [entry.published for entry in done if entry.published]
+        if state.high_water is not None:
+            dates.append(state.high_water)
+        high_water = max(dates) if dates else None
+        retry_dates = [entry.published for entry in update.entries if entry.id in failed and entry.published]
+        if high_water is not None and retry_dates:
+            # Failed entries must stay at or past the mark
+            high_water = min(high_water, *retry_dates)
+        seen_ids = [entry.id for entry in done][:MAX_SEEN_IDS]
+        # With failures, keep the old validators: a 304 would hide the failed entries
+        etag, last_modified = (state.etag, state.last_modified) if failed else (response.etag, response.last_modified)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO feeds (url, etag, last_modified, high_water, seen_ids, checked_at) "
+                    "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP) "
+                    "ON CONFLICT (url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified, "
+                    "high_water = excluded.high_water, seen_ids = excluded.seen_ids, checked_at = excluded.checked_at",
+                    (
+                        state.url,
+                        etag,
+                        last_modified,
+                        high_water.isoformat() if high_water else None,
+                        json.dumps(seen_ids),
+                    )
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class FeedService:
+    """Polls subscribed feeds and emits their new entries."""
+
+    def __init__(self, store: FeedStore, max_workers: int = 8, initial_entries: int = 1):
+        self.store = store
+        self.max_workers = max_workers
+        self.initial_entries = initial_entries
+
+    def poll(self, urls: Optional[list[str]] = None) -> Iterator[FeedUpdate]:
+        """
+        Poll feeds concurrently and yield those with new entries as they respond.
+
+        Feeds without new entries are committed right away. An update with entries must be
+        passed to `commit` once its entries are processed; until then the feed's validators
+        and high-water mark stay put, so an interrupted run re-emits the same entries. Entries
+        committed as failed are emitted again by the next poll.
+
+        Args:
+            urls: Feeds to poll (default: all subscribed feeds)
+
+        Yields:
+            FeedUpdate per feed with new entries
+        """
+        def fetch(state: FeedState) -> FeedResponse:
+            return fetch_feed(state.url, etag=state.etag, last_modified=state.last_modified)
+
+        states = self.store.states(urls)
+        not_modified = failed = 0
+        for state, future in imap_unordered(fetch, states, max_workers=self.max_workers):
+            try:
+                response = future.result()
+            except Exception as e:
+                failed += 1
+                logger.warning("Skipping feed %s: %s", state.url, e)
+                continue
+            if response.not_modified:
+                not_modified += 1
+                continue
+            update = FeedUpdate(state, response, new_entries(state, response.entries, self.initial_entries))
+            if update.entries:
+                logger.info("Feed %s: %s new entries", state.url, len(update.entries))
+                yield update
+            else:
+                self.store.commit(update)
+        logger.info("Polled %s feeds: %s not modified, %s failed", len(states), not_modified, failed)
+
+    def commit(self, update: FeedUpdate, failed: Collection[str] = ()) -> None:
+        self.store.commit(update, failed)
@@ -0,0 +1,313 @@
+"""Near-duplicate detection for fetched content.
+
+Content is identified by its normalized URL and a 64-bit SimHash of its word shingles.
+Two texts whose SimHashes differ in at most `max_distance` bits are treated as the same
+story, so a syndicated copy, AMP page or tracking-parameter variant reuses the summary
+and actions of the item processed first.
+"""
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 3
+
+# Bands for the pigeonhole index: 4 x 16 bits finds every match within 3 differing bits
+BAND_BITS = 16
+BANDS = 64 // BAND_BITS
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref", "ref_src", "amp"}
+TRACKING_PREFIXES = ("utm_",)
+
+_WORD_RE = re.compile(r"\w+")
+
+# Byte values with each bit set, used to turn per-byte counts into per-bit counts
+_BIT_VALUES = [[value for value in range(256) if value >> bit & 1] for bit in range(8)]
+
+
+@dataclass
+class FingerprintMatch:
+    """A previously processed item matching new content."""
+    id: int
+    distance: int
+    summary_points: str
+    source_type: str
+    character_count: int
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for duplicate detection.
+
+    Lowercases scheme and host, drops `www.`/`amp.`/`m.` host prefixes, fragments, tracking
+    parameters, AMP path markers and trailing slashes, and sorts the remaining query.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "amp.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/amp/?$|\.amp$", "", parts.path).rstrip("/") or "/"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, urlencode(query), ""))
+
+
+class SimHasher:
+    """Incremental SimHash over text fed in pieces.
+
+    Shingles spanning two pieces are kept, so feeding a text split at whitespace gives the
+    same fingerprint as `simhash` on the whole text.
+    """
+
+    def __init__(self, shingle_size: int = SHINGLE_SIZE):
+        self.shingle_size = shingle_size
+        self._counts = [Counter() for _ in range(8)]
+        self._total = 0
+        self._carry: list[str] = []
+
+    def update(self, text: str) -> "SimHasher":
+        words = self._carry + _WORD_RE.findall(text.lower())
+        count = len(words) - self.shingle_size + 1
+        if count > 0:
+            digests = b"".join(
+                hashlib.blake2b(" ".join(words[i:i + self.shingle_size]).encode(), digest_size=8).digest()
+                for i in range(count)
+            )
+            # Count byte values per byte position (in C) instead of touching all 64 bits of every hash
+            for position in range(8):
+                self._counts[position].update(digests[position::8])
+            self._total += count
+        self._carry = words[-(self.shingle_size - 1):] if self.shingle_size > 1 else []
+        return self
+
+    def digest(self) -> Optional[int]:
+        """The fingerprint, or None if fewer words than one shingle were fed."""
+        if not self._total:
+            return None
+        fingerprint = 0
+        for position, counts in enumerate(self._counts):
+            for bit, values in enumerate(_BIT_VALUES):
+                ones = sum(counts[value] for value in values)
+                if ones * 2 > self._total:
+                    fingerprint |= 1 << (position * 8 + bit)
+        return fingerprint
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> Optional[int]:
+    """
+    64-bit SimHash of the word shingles of a text.
+
+    Returns:
+        The fingerprint, or None if the text has fewer words than one shingle
+    """
+    return SimHasher(shingle_size).update(text).digest()
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _summary_hash(points: str) -> str:
+    return hashlib.sha256(points.encode()).hexdigest()
+
+
+class FingerprintIndex:
+    """Persistent SimHash index of processed content with their summaries and actions.
+
+    Fingerprints are held in memory, bucketed by 16-bit bands, so a lookup only compares
+    against items sharing at least one band; SQLite persists them across runs. Rows added
+    by other processes sharing the database are picked up before each lookup.
+
+    A URL match only counts while the content is unchanged: if both the stored and the new
+    fingerprint are known, they must be within `max_distance`, so edited pages and
+    re-recorded videos at the same URL are summarized again.
+    """
+
+    def __init__(self, path: Path, max_distance: int = 3):
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be below {BANDS} for the banded index")
+        self.path = path
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bands: list[dict[int, list[tuple[int, int]]]] = [{} for _ in range(BANDS)]
+        # Highest item id already in the banded index
+        self._indexed_id = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS items (
+                    id INTEGER PRIMARY KEY,
+                    url_key TEXT,
+                    simhash INTEGER,
+                    summary_points TEXT NOT NULL,
+                    summary_hash TEXT NOT NULL,
+                    source_type TEXT NOT NULL,
+                    character_count INTEGER NOT NULL,
+                    actions TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE INDEX IF NOT EXISTS items_url_key ON items (url_key);
+                CREATE INDEX IF NOT EXISTS items_summary_hash ON items (summary_hash);
+                CREATE TABLE IF NOT EXISTS processed (
+                    url_key TEXT PRIMARY KEY,
+                    processed_at TEXT DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            self._catch_up()
+            logger.debug("Loaded fingerprint index from %s", self.path)
+        return self._conn
+
+    def _catch_up(self) -> None:
+        """Index rows inserted since the last call, by this or another process."""
+        rows = self._conn.execute(
+            "SELECT id, simhash FROM items WHERE id > ? ORDER BY id", (self._indexed_id,)
+        ).fetchall()
+        for item_id, fingerprint in rows:
+            if fingerprint is not None:
+                self._index(item_id, _to_unsigned(fingerprint))
+            self._indexed_id = item_id
+
+    def _index(self, item_id: int, fingerprint: int) -> None:
+        for band in range(BANDS):
+            key = fingerprint >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1)
+            self._bands[band].setdefault(key, []).append((item_id, fingerprint))
+
+    def find(self, url_key: Optional[str], fingerprint: Optional[int]) -> Optional[FingerprintMatch]:
+        """
+        Find a processed item with the same normalized URL or a near-identical fingerprint.
+
+        Args:
+            url_key: Normalized source URL, if any
+            fingerprint: SimHash of the content text, if any
+
+        Returns:
+            The closest match, or None
+        """
+        with self._lock:
+            conn = self._connect()
+            best: Optional[tuple[int, int]] = None
+            if url_key:
+                row = conn.execute(
+                    "SELECT id, simhash FROM items WHERE url_key = ? ORDER BY id DESC LIMIT 1", (url_key,)
+                ).fetchone()
+                if row:
+                    distance = 0
+                    if fingerprint is not None and row[1] is not None:
+                        distance = hamming_distance(fingerprint, _to_unsigned(row[1]))
+                    if distance <= self.max_distance:
+                        best = (distance, row[0])
+                    else:
+                        logger.debug("Content at %s changed (distance %s)", url_key, distance)
+            if best is None and fingerprint is not None:
+                self._catch_up()
+                for band in range(BANDS):
+                    key = fingerprint >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1)
+                    for item_id, candidate in self._bands[band].get(key, ()):
+                        distance = hamming_distance(fingerprint, candidate)
+                        if distance <= self.max_distance and (best is None or distance < best[0]):
+                            best = (distance, item_id)
+            if best is None:
+                return None
+            row = conn.execute(
+                "SELECT summary_points, source_type, character_count FROM items WHERE id = ?", (best[1],)
+            ).fetchone()
+        return FingerprintMatch(
+            id=best[1],
+            distance=best[0],
+            summary_points=row[0],
+            source_type=row[1],
+            character_count=row[2]
+        )
+
+    def add(
+        self,
+        url_key: Optional[str],
+        fingerprint: Optional[int],
+        summary_points: str,
+        source_type: str,
+        character_count: int
+    ) -> int:
+        """Record a processed item and its summary; returns the item id."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO items (url_key, simhash, summary_points, summary_hash, source_type, character_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        url_key,
+                        _to_signed(fingerprint) if fingerprint is not None else None,
+                        summary_points,
+                        _summary_hash(summary_points),
+                        source_type,
+                        character_count,
+                    )
+                )
+            self._catch_up()
+            return cursor.lastrowid
+
+    def find_actions(self, summary_points: str) -> Optional[list[str]]:
+        """Actions previously extracted from this exact summary, if any."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT actions FROM items WHERE summary_hash = ? AND actions IS NOT NULL ORDER BY id LIMIT 1",
+                (_summary_hash(summary_points),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_actions(self, summary_points: str, actions: list[str]) -> None:
+        """Attach extracted actions to the items carrying this summary."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE items SET actions = ? WHERE summary_hash = ? AND actions IS NULL",
+                    (json.dumps(actions), _summary_hash(summary_points))
+                )
+
+    def is_processed(self, url_key: str) -> bool:
+        """Whether an item with this normalized URL went through the whole workflow."""
+        with self._lock:
+            row = self._connect().execute("SELECT 1 FROM processed WHERE url_key = ?", (url_key,)).fetchone()
+        return row is not None
+
+    def mark_processed(self, url_key: str) -> None:
+        """Record that the item with this normalized URL completed the workflow."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO processed (url_key) VALUES (?)", (url_key,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
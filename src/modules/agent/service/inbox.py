@@ -0,0 +1,143 @@
+"""Inbox of URLs and text snippets consumed incrementally.
+
+An inbox is either a file, with one URL or text snippet per line, or a directory, with
+one item per file. Progress is persisted after every item: a byte offset (plus a
+checksum of the bytes just before it, to notice rewrites and truncation) for a file, the
+names of processed files for a directory. Restarts resume where the last run stopped.
+"""
+import hashlib
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from src.infra.client.content_fetcher import is_url
+
+logger = logging.getLogger(__name__)
+
+# Bytes before the offset whose checksum identifies the already consumed content
+TAIL_BYTES = 256
+
+IGNORED_SUFFIXES = (".tmp", ".part", ".swp", "~")
+
+
+@dataclass
+class InboxItem:
+    """One inbox entry: a URL or a text snippet."""
+    key: str
+    url: Optional[str] = None
+    text: Optional[str] = None
+    end: int = 0
+
+    @classmethod
+    def parse(cls, key: str, raw: str, end: int = 0) -> "InboxItem":
+        raw = raw.strip()
+        if is_url(raw) and len(raw.split()) == 1:
+            return cls(key=key, url=raw, end=end)
+        return cls(key=key, text=raw, end=end)
+
+
+def default_state_path(storage_dir: Path, inbox: Path) -> Path:
+    """State file of an inbox, keyed by its absolute path."""
+    digest = hashlib.sha1(str(inbox.resolve()).encode()).hexdigest()[:16]
+    return storage_dir / "inbox" / f"{digest}.json"
+
+
+class Inbox:
+    """Pending items of an inbox file or directory, with a persistent position."""
+
+    def __init__(self, path: Path, state_path: Path):
+        self.path = path
+        self.state_path = state_path
+        self._state = self._load_state()
+
+    @property
+    def is_directory(self) -> bool:
+        return self.path.is_dir()
+
+    def _load_state(self) -> dict:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning("Ignoring unreadable inbox state %s", self.state_path)
+            return {}
+        return state
+
+    def _save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._state), encoding="utf-8")
+        tmp_path.replace(self.state_path)
+
+    def _tail_checksum(self, f, offset: int) -> int:
+        start = max(offset - TAIL_BYTES, 0)
+        f.seek(start)
+        return zlib.crc32(f.read(offset - start))
+
+    def pending(self) -> Iterator[InboxItem]:
+        """
+        Items added since the last committed one, oldest first.
+
+        A file's last line is only returned once it ends with a newline.
+        """
+        if self.is_directory:
+            yield from self._pending_files()
+        else:
+            yield from self._pending_lines()
+
+    def _pending_lines(self) -> Iterator[InboxItem]:
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            offset = self._state.get("offset", 0)
+            size = f.seek(0, 2)
+            if offset and (size < offset or self._tail_checksum(f, offset) != self._state.get("tail")):
+                logger.warning("Inbox %s was truncated or rewritten; reading it from the start", self.path)
+                offset = 0
+                self._state = {}
+            f.seek(offset)
+            data = f.read(size - offset)
+
+        complete = data[:data.rfind(b"\n") + 1]
+        position = offset
+        for line in complete.splitlines(keepends=True):
+            position += len(line)
+            raw = line.decode("utf-8", errors="replace")
+            if raw.strip():
+                yield InboxItem.parse(str(position), raw, end=position)
+
+    def _pending_files(self) -> Iterator[InboxItem]:
+        done = set(self._state.get("done", []))
+        files = [
+            path for path in self.path.iterdir()
+            if path.is_file() and not path.name.startswith(".") and not path.name.endswith(IGNORED_SUFFIXES)
+        ]
+        # Forget processed files that were removed so the state stays bounded
+        names = {path.name for path in files}
+        if done - names:
+            self._state["done"] = sorted(done & names)
+            self._save_state()
+
+        for path in sorted(files, key=lambda path: (path.stat().st_mtime_ns, path.name)):
+            if path.name in done:
+                continue
+            raw = path.read_text(encoding="utf-8", errors="replace")
+            if not raw.strip():
+                logger.debug("Skipping empty inbox file %s", path)
+                continue
+            yield InboxItem.parse(path.name, raw)
+
+    def commit(self, item: InboxItem) -> None:
+        """Record an item as processed."""
+        if self.is_directory:
+            self._state.setdefault("done", []).append(item.key)
+        else:
+            with open(self.path, "rb") as f:
+                self._state = {"offset": item.end, "tail": self._tail_checksum(f, item.end)}
+        self._save_state()
@@ -0,0 +1,205 @@
+"""Thin client submitting agent work to a running `agent serve` process."""
+import datetime
+import json
+import logging
+import urllib.error
+import urllib.request
+from pathlib import Path
+from itertools import product
+from typing import Iterator, Optional, Union
+
+from src.core.concurrency import imap_unordered
+from src.core.metrics import metrics
+from src.infra.client.file_reader import FileDocument
+from src.modules.agent.dto import ContentDTO, SummaryDTO, ScheduledEventDTO
+from src.modules.agent.service.calendar import CalendarTarget
+from src.modules.agent.service.content import ContentService
+
+logger = logging.getLogger(__name__)
+
+
+class AgentServerError(RuntimeError):
+    """Raised when the agent server fails to handle a request."""
+
+
+class RemoteAgentService:
+    """Drop-in replacement for AgentService that delegates to the agent server."""
+
+    def __init__(self, base_url: str, timeout: float = 300, max_workers: int = 4):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+    def _post(self, path: str, payload: dict) -> dict:
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            with metrics.span(f"agent_server{path}", kind="call", request_bytes=len(request.data)) as span:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    body = response.read()
+                span.set(response_bytes=len(body))
+            return json.loads(body)
+        except urllib.error.HTTPError as e:
+            body = json.loads(e.read() or b'{}')
+            message = body.get('error', str(e))
+            if body.get('type') == 'ValueError':
+                raise ValueError(message) from None
+            raise AgentServerError(message) from None
+        except urllib.error.URLError as e:
+            logger.error("Agent server unreachable at %s: %s", self.base_url, e.reason)
+            raise AgentServerError(f"Agent server unreachable at {self.base_url}: {e.reason}") from None
+
+    def process_content(
+        self,
+        url: Optional[str] = None,
+        text: Optional[str] = None,
+        path: Optional[str] = None
+    ) -> ContentDTO:
+        """
+        Process and fetch content on the server.
+
+        A local file is read here and its text sent; the server never opens client paths.
+        """
+        if path:
+            return self._read_file(path)
+        with metrics.span("fetch"):
+            return ContentDTO.model_validate(self._post('/content', {'url': url, 'text': text}))
+
+    @staticmethod
+    def _read_file(path: str) -> ContentDTO:
+        document = FileDocument(Path(path).expanduser().resolve())
+        document.validate()
+        with metrics.span("fetch", bytes=document.size):
+            # A file of N bytes decodes to at most N characters, so this is a single chunk
+            text = ''.join(document.chunks(document.size))
+        if not text.strip():
+            raise ValueError(f"Could not extract text from file: {document.path}")
+        return ContentDTO(text=text, source_type="html file" if document.is_html else "file")
+
+    def process_collection(self, url: str) -> Iterator[ContentDTO]:
+        """
+        Expand a playlist or channel locally and fetch its videos on the server concurrently.
+
+        Videos the server has recorded as processed are skipped.
+        """
+        from src.core.settings import get_settings
+        from src.infra.client.content_fetcher import expand_youtube_collection
+
+        video_urls = [
+            f"https://www.youtube.com/watch?v={video_id}"
+            for video_id in expand_youtube_collection(url, limit=get_settings().YOUTUBE_COLLECTION_LIMIT)
+        ]
+        if not video_urls:
+            raise ValueError("No videos found for this playlist or channel")
+        processed = set(self._post('/processed', {'urls': video_urls})['processed'])
+        if processed:
+            logger.info("Skipping %s already processed videos", len(processed))
+            video_urls = [video_url for video_url in video_urls if video_url not in processed]
+        for video_url, future in imap_unordered(self.process_content, video_urls, max_workers=self.max_workers):
+            try:
+                yield future.result()
+            except ValueError as e:
+                logger.warning("Skipping video %s: %s", video_url, e)
+
+    def mark_processed(self, source_url: Optional[str]) -> None:
+        """Record on the server that content from this URL completed the workflow."""
+        if not source_url:
+            return
+        try:
+            self._post('/processed/mark', {'url': source_url})
+        except AgentServerError as e:
+            # The item is done; at worst a collection run fetches it again
+            logger.warning("Failed to record %s as processed: %s", source_url, e)
+
+    def summarize(self, content: ContentDTO) -> SummaryDTO:
+        """Summarize content on the server."""
+        with metrics.span("summarize", chars=content.character_count):
+            return SummaryDTO.model_validate(
+                self._post('/summary', {'content': content.model_dump(mode='json')})
+            )
+
+    def extract_actions(self, summary: SummaryDTO) -> list[str]:
+        """Extract actionable tasks on the server."""
+        with metrics.span("extract", chars=len(summary.points)):
+            return self._post('/actions', {'summary': summary.model_dump(mode='json')})['actions']
+
+    def summarize_packed(
+        self,
+        contents: list[ContentDTO]
+    ) -> list[Union[tuple[SummaryDTO, list[str]], Exception]]:
+        """Summarize many items and extract their actions on the server, packing short ones."""
+        with metrics.span("summarize_packed", items=len(contents)):
+            response = self._post('/packed', {'contents': [content.model_dump(mode='json') for content in contents]})
+        results: list[Union[tuple[SummaryDTO, list[str]], Exception]] = []
+        for result in response['results']:
+            if 'error' in result:
+                error_type = ValueError if result.get('type') == 'ValueError' else AgentServerError
+                results.append(error_type(result['error']))
+            else:
+                results.append((SummaryDTO.model_validate(result['summary']), result['actions']))
+        return results
+
+    def source_link(self, content: ContentDTO, action: str) -> Optional[str]:
+        """Link an action back to its source (transcripts stay on the server, so the source URL)."""
+        return ContentService.source_link(content, action)
+
+    def schedule_action(
+        self,
+        action: str,
+        start_time: datetime.datetime,
+        duration_hours: int = 1,
+        source_link: Optional[str] = None,
+        target: Optional[CalendarTarget] = None
+    ) -> ScheduledEventDTO:
+        """Schedule an action through the server's Calendar service."""
+        with metrics.span("schedule"):
+            return ScheduledEventDTO.model_validate(self._post('/schedule', {
+                'action': action,
+                'start_time': start_time.isoformat(),
+                'duration_hours': duration_hours,
+                'source_link': source_link,
+                'calendar': str(target) if target else None
+            }))
+
+    def schedule_actions(
+        self,
+        actions: list[tuple[str, datetime.datetime, Optional[str]]],
+        targets: Optional[list[CalendarTarget]] = None,
+        duration_hours: int = 1
+    ) -> Iterator[tuple[str, Optional[CalendarTarget], Union[ScheduledEventDTO, Exception]]]:
+        """
+        Schedule several actions concurrently through the server.
+
+        Without targets, events go to the server's default calendars (its CALENDAR_ACCOUNTS).
+        """
+        def schedule(request):
+            (action, start_time, source_link), target = request
+            if target is None:
+                return self._post('/schedule', {
+                    'action': action,
+                    'start_time': start_time.isoformat(),
+                    'duration_hours': duration_hours,
+                    'source_link': source_link,
+                    'default_calendars': True
+                })['events']
+            return [self.schedule_action(action, start_time, duration_hours, source_link, target).model_dump(mode='json')]
+
+        requests = product(actions, targets or [None])
+        for ((action, _, _), target), future in imap_unordered(schedule, requests, max_workers=self.max_workers):
+            try:
+                events = future.result()
+            except Exception as e:
+                yield action, target, e
+                continue
+            for event in events:
+                # Servers may leave out the calendar; fall back to the requested one
+                calendar = event.get('calendar')
+                event_target = CalendarTarget.parse(calendar) if calendar else target or CalendarTarget()
+                if 'error' in event:
+                    yield action, event_target, AgentServerError(event['error'])
+                else:
+                    yield action, event_target, ScheduledEventDTO.model_validate(event)
@@ -0,0 +1,271 @@
+"""Queue workers running the agent pipeline stages as independent jobs.
+
+Each stage has its own queue: `fetch` jobs produce `summarize` jobs, which produce
+`extract` jobs, which (for auto-scheduled items) produce one `schedule` job per action and calendar.
+Workers lease jobs from the stages they serve, so fetch and LLM stages can be scaled
+separately, on one host (SQLite queue) or several (Redis queue).
+
+Delivery is at-least-once: a job whose worker dies is retried after its visibility
+timeout, and a stage's follow-up jobs are enqueued before the job is completed. An item
+is recorded as processed once its extract job and all of its schedule jobs are done.
+"""
+import datetime
+import logging
+import os
+import socket
+import threading
+import uuid
+from itertools import product
+from pathlib import Path
+from typing import Any, Optional
+
+from src.core.metrics import metrics
+from src.infra.queue.base import DONE, Job, JobQueue, LeaseLost
+
+logger = logging.getLogger(__name__)
+
+FETCH = "fetch"
+SUMMARIZE = "summarize"
+EXTRACT = "extract"
+SCHEDULE = "schedule"
+STAGES = (FETCH, SUMMARIZE, EXTRACT, SCHEDULE)
+
+# Retry backoff: RETRY_BASE_DELAY * 2 ** (attempt - 1), capped
+RETRY_BASE_DELAY = 5.0
+RETRY_MAX_DELAY = 600.0
+
+
+def default_queue_url() -> str:
+    """JOB_QUEUE_URL, or the SQLite queue in the storage directory."""
+    from src.core.settings import STORAGE_DIR, get_settings
+
+    return get_settings().JOB_QUEUE_URL or f"sqlite:///{STORAGE_DIR / 'jobs.sqlite3'}"
+
+
+def submit(
+    queue: JobQueue,
+    url: Optional[str] = None,
+    text: Optional[str] = None,
+    path: Optional[str] = None,
+    auto_schedule: bool = False,
+    calendars: Optional[list[str]] = None,
+    max_attempts: int = 5
+) -> str:
+    """
+    Enqueue an input for the fetch stage.
+
+    Args:
+        queue: Job queue
+        url: URL to fetch (YouTube playlists and channels are expanded by the fetch worker)
+        text: Direct text input
+        path: Local file; must be readable at the same path by the fetch workers
+        auto_schedule: Schedule all extracted actions at the default time
+        calendars: ACCOUNT[/CALENDAR_ID] to schedule into (default: the workers' CALENDAR_ACCOUNTS)
+        max_attempts: Attempts per stage before a job is kept as dead
+
+    Returns:
+        Id of the fetch job
+
+    Raises:
+        ValueError: If no input is given
+    """
+    if not (url or text or path):
+        raise ValueError("Either url, text or path must be provided")
+    payload = {
+        "url": url,
+        "text": text,
+        "path": str(Path(path).expanduser().resolve()) if path else None,
+        "auto_schedule": auto_schedule,
+        "calendars": calendars,
+        "max_attempts": max_attempts,
+    }
+    return queue.enqueue(FETCH, payload, max_attempts=max_attempts)
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before retrying a job that failed on its `attempts`-th attempt."""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+
+class Worker:
+    """Leases jobs of some stages and runs them through an AgentService."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        agent_service,
+        stages: tuple[str, ...] = STAGES,
+        owner: Optional[str] = None,
+        visibility_timeout: float = 300,
+        poll_interval: float = 1.0
+    ):
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+        self.queue = queue
+        self.agent_service = agent_service
+        self.stages = list(stages)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self._handlers = {
+            FETCH: self._fetch,
+            SUMMARIZE: self._summarize,
+            EXTRACT: self._extract,
+            SCHEDULE: self._schedule,
+        }
+
+    def run(self, stop: threading.Event) -> None:
+        """Process jobs until `stop` is set, polling while the queues are empty."""
+        logger.info("Worker %s serving %s", self.owner, ", ".join(self.stages))
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(self.poll_interval)
+
+    def run_once(self) -> bool:
+        """
+        Lease and process one job.
+
+        Returns:
+            False if no job was available
+        """
+        job = self.queue.lease(self.stages, self.owner, self.visibility_timeout)
+        if job is None:
+            return False
+        self.handle(job)
+        return True
+
+    def handle(self, job: Job) -> None:
+        """Run a leased job, keeping its lease alive, and complete or fail it."""
+        logger.info("Running %s job %s (attempt %s/%s)", job.queue, job.id, job.attempts, job.max_attempts)
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        heartbeat.start()
+        try:
+            with metrics.span(f"job.{job.queue}", kind="job"):
+                result = self._handlers[job.queue](job)
+        except Exception as e:
+            # ValueError is the services' "bad input" signal: retrying won't help
+            delay = None if isinstance(e, ValueError) else retry_delay(job.attempts)
+            logger.error("%s job %s failed: %s", job.queue, job.id, e, exc_info=True)
+            try:
+                retried = self.queue.fail(job, f"{type(e).__name__}: {e}", retry_delay=delay)
+            except LeaseLost as lost:
+                logger.warning("%s", lost)
+                return
+            finally:
+                done.set()
+            status = "retry" if retried else "dead"
+            if retried:
+                logger.info("Retrying %s job %s in %.0fs", job.queue, job.id, delay)
+        else:
+            try:
+                self.queue.complete(job, result)
+            except LeaseLost as lost:
+                # Another worker took over; its run will redo this stage
+                logger.warning("%s", lost)
+                return
+            finally:
+                done.set()
+            status = "done"
+            if job.queue == EXTRACT:
+                self._mark_if_scheduled(job.id, job.payload["source"].get("source_url"))
+            elif job.queue == SCHEDULE and job.payload.get("extract_job"):
+                self._mark_if_scheduled(job.payload["extract_job"], job.payload.get("source_url"))
+        metrics.inc("agent_jobs_total", stage=job.queue, status=status)
+
+    def _heartbeat(self, job: Job, done: threading.Event) -> None:
+        # Extend the lease well before it runs out while the job is still being worked on
+        while not done.wait(self.visibility_timeout / 3):
+            try:
+                self.queue.extend(job, self.visibility_timeout)
+            except LeaseLost as lost:
+                logger.warning("%s", lost)
+                return
+            except Exception as e:
+                logger.warning("Failed to extend lease of job %s: %s", job.id, e)
+
+    def _mark_if_scheduled(self, extract_id: str, source_url: Optional[str]) -> None:
+        """
+        Record the item as processed once its extract job and all its schedule jobs are done.
+
+        Called after each of those jobs completes; whichever completes last sees them all done.
+        """
+        extract = self.queue.job(extract_id)
+        if extract is None or extract["status"] != DONE:
+            return
+        if all((self.queue.job(job_id) or {}).get("status") == DONE for job_id in extract["result"]["jobs"]):
+            self.agent_service.mark_processed(source_url)
+
+    def _next(self, stage: str, payload: dict[str, Any], parent: dict[str, Any]) -> str:
+        payload["auto_schedule"] = parent.get("auto_schedule", False)
+        payload["calendars"] = parent.get("calendars")
+        payload["max_attempts"] = max_attempts = parent.get("max_attempts", 5)
+        return self.queue.enqueue(stage, payload, max_attempts=max_attempts)
+
+    def _enqueue_content(self, content, parent: dict[str, Any]) -> str:
+        return self._next(SUMMARIZE, {"content": content.model_dump()}, parent)
+
+    def _fetch(self, job: Job) -> dict[str, Any]:
+        from src.infra.client.content_fetcher import is_youtube_collection_url
+
+        payload = job.payload
+        url = payload.get("url")
+        if url and is_youtube_collection_url(url):
+            jobs = [self._enqueue_content(content, payload) for content in self.agent_service.process_collection(url)]
+            return {"jobs": jobs}
+        content = self.agent_service.process_content(url=url, text=payload.get("text"), path=payload.get("path"))
+        return {
+            "jobs": [self._enqueue_content(content, payload)],
+            "chars": content.character_count,
+            "source_type": content.source_type,
+        }
+
+    def _summarize(self, job: Job) -> dict[str, Any]:
+        from src.modules.agent.dto import ContentDTO
+
+        payload = job.payload
+        content = ContentDTO.model_validate(payload["content"])
+        summary = self.agent_service.summarize(content)
+        job_id = self._next(EXTRACT, {
+            "summary": summary.model_dump(),
+            # What the schedule stage needs to link events back to the source; not the text
+            "source": content.model_dump(exclude={"text"}),
+        }, payload)
+        return {"jobs": [job_id], "points": summary.points}
+
+    def _extract(self, job: Job) -> dict[str, Any]:
+        from src.modules.agent.dto import ContentDTO, SummaryDTO
+
+        payload = job.payload
+        summary = SummaryDTO.model_validate(payload["summary"])
+        actions = self.agent_service.extract_actions(summary)
+        jobs = []
+        if payload.get("auto_schedule"):
+            source = ContentDTO.model_validate({**payload["source"], "text": ""})
+            start_time = datetime.datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+            calendars = payload.get("calendars") or [str(target) for target in self.agent_service.calendar_targets]
+            # One job per event, so a failing calendar is retried without duplicating the others
+            for action, calendar in product(actions, calendars):
+                jobs.append(self._next(SCHEDULE, {
+                    "action": action,
+                    "start_time": start_time.isoformat(),
+                    "source_link": self.agent_service.source_link(source, action),
+                    "calendar": calendar,
+                    # For recording the item as processed once every schedule job is done
+                    "extract_job": job.id,
+                    "source_url": source.source_url,
+                }, payload))
+        return {"jobs": jobs, "actions": actions}
+
+    def _schedule(self, job: Job) -> dict[str, Any]:
+        from src.modules.agent.service.calendar import CalendarTarget
+
+        payload = job.payload
+        event = self.agent_service.schedule_action(
+            payload["action"],
+            datetime.datetime.fromisoformat(payload["start_time"]),
+            source_link=payload.get("source_link"),
+            target=CalendarTarget.parse(payload["calendar"]) if payload.get("calendar") else None
+        )
+        return {"event_link": event.event_link}
@@ -1,7 +1,12 @@
 """Pytest configuration and fixtures."""
+import datetime
+import os
 import pytest
 from unittest.mock import MagicMock
 
+# Settings are required at import time by the Google clients; never hit real APIs in tests
+os.environ.setdefault("GOOGLE_API_KEY", "test-api-key")
+
 
 @pytest.fixture
 def mock_genai_client():
@@ -33,3 +38,34 @@ def sample_summary_dto():
         source_type="article",
         character_count=100
     )
+
+
+@pytest.fixture
+def make_agent_service():
+    """Factory for mocked agent services returning canned results for every stage."""
+    from src.modules.agent.dto import ContentDTO, ScheduledEventDTO, SummaryDTO
+    from src.modules.agent.service.calendar import CalendarTarget
+
+    def make(actions: tuple[str, ...] = ("Read the docs",)) -> MagicMock:
+        agent_service = MagicMock()
+        agent_service.calendar_targets = [CalendarTarget()]
+        agent_service.process_content.side_effect = lambda url=None, text=None, path=None: ContentDTO(
+            text=text or "Article text", source_type="direct text" if text else "article", source_url=url
+        )
+        agent_service.summarize.return_value = SummaryDTO(points="• Point", source_type="article", character_count=12)
+        agent_service.extract_actions.return_value = list(actions)
+        agent_service.source_link.side_effect = lambda content, action: content.source_url
+        agent_service.schedule_action.side_effect = lambda action, start_time, source_link=None, target=None: (
+            ScheduledEventDTO(action=action, start_time=start_time, end_time=start_time, calendar=str(target))
+        )
+        start = datetime.datetime(2024, 1, 1, 10)
+        agent_service.schedule_actions.side_effect = lambda requests, targets=None: [
+            (action, target, ScheduledEventDTO(
+                action=action, start_time=start, end_time=start, event_link="https://calendar/1", calendar=str(target)
+            ))
+            for action, _, _ in requests
+            for target in targets or [None]
+        ]
+        return agent_service
+
+    return make
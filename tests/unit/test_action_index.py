@@ -0,0 +1,106 @@
+"""Tests for semantic action de-duplication."""
+import datetime
+import numpy as np
+from unittest.mock import MagicMock
+from src.modules.agent.dto import ScheduledEventDTO
+from src.modules.agent.service.action_index import ActionIndex, HashingVectorizer
+from src.modules.agent.service.agent import AgentService
+
+
+class TestHashingVectorizer:
+    """Tests for HashingVectorizer."""
+    
+    def test_rows_are_unit_length(self):
+        matrix = HashingVectorizer().transform(["Read the paper", "Try the tool"])
+        
+        assert matrix.shape == (2, 256)
+        assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0)
+    
+    def test_ignores_case_punctuation_and_stopwords(self):
+        matrix = HashingVectorizer().transform(["Read the paper", "read paper."])
+        
+        assert matrix[0] @ matrix[1] > 0.99
+    
+    def test_empty_text(self):
+        matrix = HashingVectorizer().transform([""])
+        
+        assert not matrix.any()
+
+
+class TestActionIndex:
+    """Tests for ActionIndex."""
+    
+    def test_find_duplicates_batch(self, tmp_path):
+        index = ActionIndex(tmp_path)
+        index.add(["Read the paper on vector search", "Try the new profiling tool"])
+        
+        matches = index.find_duplicates(["Read the paper about vector search", "Book a dentist appointment"])
+        
+        assert matches[0][0] == "Read the paper on vector search"
+        assert matches[0][1] >= 0.75
+        assert matches[1] is None
+    
+    def test_empty_index(self, tmp_path):
+        assert ActionIndex(tmp_path).find_duplicates(["Read the paper"]) == [None]
+    
+    def test_persists_across_instances(self, tmp_path):
+        ActionIndex(tmp_path).add(["Try the new profiling tool"])
+        
+        index = ActionIndex(tmp_path)
+        
+        assert len(index) == 1
+        assert index.find_duplicates(["try the new profiling tool!"])[0][0] == "Try the new profiling tool"
+    
+    def test_grows_past_initial_capacity(self, tmp_path):
+        index = ActionIndex(tmp_path)
+        index.add([f"Task {i}" for i in range(1500)])
+        index.add(["Write the quarterly report"])
+        
+        assert len(ActionIndex(tmp_path)) == 1501
+        assert index.find_duplicates(["Write the quarterly report"])[0][1] > 0.99
+    
+    def test_ignores_torn_append(self, tmp_path):
+        ActionIndex(tmp_path).add(["Write the quarterly report"])
+        with open(tmp_path / "actions.jsonl", "a") as f:
+            f.write('"Orphan text without a vector"\n')
+        
+        assert len(ActionIndex(tmp_path)) == 1
+    
+    def test_torn_append_is_repaired_before_new_appends(self, tmp_path):
+        index = ActionIndex(tmp_path)
+        index.add(["Write the quarterly report"])
+        # Crash after the vector append, before the text append
+        with open(tmp_path / "actions.f32", "ab") as f:
+            index.vectorizer.transform(["Book the dentist appointment"]).tofile(f)
+        
+        reopened = ActionIndex(tmp_path)
+        reopened.add(["Renew the passport"])
+        with open(tmp_path / "actions.jsonl", "a") as f:
+            f.write('"Torn te')
+        
+        final = ActionIndex(tmp_path)
+        assert len(final) == 2
+        assert final.find_duplicates(["Renew the passport"])[0][0] == "Renew the passport"
+        assert final.find_duplicates(["Write the quarterly report"])[0][0] == "Write the quarterly report"
+        assert final.find_duplicates(["Book the dentist appointment"]) == [None]
+        assert (tmp_path / "actions.f32").stat().st_size == 2 * final.vectorizer.dim * 4
+
+
+class TestAgentServiceActionDeduplication:
+    """Tests for action filtering in AgentService."""
+    
+    def test_scheduled_actions_are_filtered(self, tmp_path, sample_summary_dto):
+        agent = AgentService(action_index=ActionIndex(tmp_path))
+        agent.fingerprint_index = None
+        agent.ai_service = MagicMock()
+        agent.ai_service.extract_actions.return_value = ["Read the paper", "Try the tool"]
+        agent.calendar_service = MagicMock()
+        start_time = datetime.datetime(2024, 1, 1, 10, 0)
+        agent.calendar_service.add_event.return_value = ScheduledEventDTO(
+            action="Read the paper", start_time=start_time, end_time=start_time
+        )
+        
+        agent.schedule_action("Read the paper", start_time)
+        actions = agent.extract_actions(sample_summary_dto)
+        
+        assert actions == ["Try the tool"]
@@ -0,0 +1,172 @@
+"""Tests for the agent server and its remote client."""
+import datetime
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from src.modules.agent.dto import ScheduledEventDTO
+from src.modules.agent.server import AgentServer
+from src.modules.agent.service.calendar import CalendarTarget
+from src.modules.agent.service.remote import RemoteAgentService, AgentServerError
+
+
+@pytest.fixture
+def agent_server():
+    """Agent server on an ephemeral port backed by a mocked AgentService."""
+    agent_service = MagicMock()
+    server = AgentServer("127.0.0.1", 0, agent_service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestRemoteAgentService:
+    """Tests for RemoteAgentService against a live AgentServer."""
+    
+    def test_process_content(self, agent_server, sample_content_dto):
+        agent_server.agent_service.process_content.return_value = sample_content_dto
+        client = RemoteAgentService(agent_server.url)
+        
+        result = client.process_content(url="https://example.com/article")
+        
+        assert result == sample_content_dto
+        agent_server.agent_service.process_content.assert_called_once_with(
+            url="https://example.com/article", text=None
+        )
+    
+    def test_summarize_and_extract(self, agent_server, sample_content_dto, sample_summary_dto):
+        agent_server.agent_service.summarize.return_value = sample_summary_dto
+        agent_server.agent_service.extract_actions.return_value = ["Action 1", "Action 2"]
+        client = RemoteAgentService(agent_server.url)
+        
+        summary = client.summarize(sample_content_dto)
+        actions = client.extract_actions(summary)
+        
+        assert summary == sample_summary_dto
+        assert actions == ["Action 1", "Action 2"]
+        agent_server.agent_service.summarize.assert_called_once_with(sample_content_dto)
+    
+    def test_schedule_action(self, agent_server):
+        start_time = datetime.datetime(2024, 1, 1, 10, 0)
+        agent_server.agent_service.schedule_action.return_value = ScheduledEventDTO(
+            action="Do it",
+            start_time=start_time,
+            end_time=start_time + datetime.timedelta(hours=1),
+            event_link="https://calendar.google.com/event"
+        )
+        client = RemoteAgentService(agent_server.url)
+        
+        event = client.schedule_action("Do it", start_time)
+        
+        assert event.event_link == "https://calendar.google.com/event"
+        agent_server.agent_service.schedule_action.assert_called_once_with("Do it", start_time, 1, None, None)
+    
+    def test_schedule_actions_into_named_and_default_calendars(self, agent_server):
+        start_time = datetime.datetime(2024, 1, 1, 10, 0)
+        service = agent_server.agent_service
+        service.schedule_action.side_effect = lambda action, start, hours, link, target: ScheduledEventDTO(
+            action=action, start_time=start, end_time=start, calendar=str(target)
+        )
+        service.schedule_actions.return_value = iter([
+            ("Do it", CalendarTarget("alice"), ScheduledEventDTO(
+                action="Do it", start_time=start_time, end_time=start_time, calendar="alice"
+            )),
+            ("Do it", CalendarTarget("bob"), RuntimeError("403 Forbidden")),
+        ])
+        client = RemoteAgentService(agent_server.url)
+        
+        named = list(client.schedule_actions([("Do it", start_time, None)], [CalendarTarget("carol", "team")]))
+        default = sorted(client.schedule_actions([("Do it", start_time, None)]), key=lambda r: r[1].account)
+        
+        assert named[0][1] == CalendarTarget("carol", "team")
+        assert named[0][2].calendar == "carol/team"
+        assert default[0][1] == CalendarTarget("alice")
+        assert isinstance(default[1][2], AgentServerError)
+        assert str(default[1][2]) == "403 Forbidden"
+    
+    def test_schedule_actions_without_calendar_in_response(self, agent_server):
+        start_time = datetime.datetime(2024, 1, 1, 10, 0)
+        service = agent_server.agent_service
+        service.schedule_action.return_value = ScheduledEventDTO(action="Do it", start_time=start_time, end_time=start_time)
+        service.schedule_actions.return_value = iter([
+            ("Do it", CalendarTarget(), ScheduledEventDTO(action="Do it", start_time=start_time, end_time=start_time)),
+        ])
+        client = RemoteAgentService(agent_server.url)
+        
+        named = list(client.schedule_actions([("Do it", start_time, None)], [CalendarTarget("carol", "team")]))
+        default = list(client.schedule_actions([("Do it", start_time, None)]))
+        
+        assert named[0][1] == CalendarTarget("carol", "team")
+        assert default[0][1] == CalendarTarget()
+        assert isinstance(default[0][2], ScheduledEventDTO)
+    
+    def test_summarize_packed(self, agent_server, sample_content_dto, sample_summary_dto):
+        agent_server.agent_service.summarize_packed.return_value = [
+            (sample_summary_dto, ["Action 1"]), ValueError("Empty text"),
+        ]
+        client = RemoteAgentService(agent_server.url)
+        
+        results = client.summarize_packed([sample_content_dto, sample_content_dto])
+        
+        assert results[0] == (sample_summary_dto, ["Action 1"])
+        assert isinstance(results[1], ValueError)
+        agent_server.agent_service.summarize_packed.assert_called_once_with([sample_content_dto, sample_content_dto])
+    
+    @patch('src.infra.client.content_fetcher.expand_youtube_collection')
+    def test_process_collection_skips_videos_processed_on_server(self, mock_expand, agent_server, sample_content_dto):
+        mock_expand.return_value = ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        service = agent_server.agent_service
+        service.is_processed.side_effect = lambda url: url.endswith("aaaaaaaaaaa")
+        service.process_content.return_value = sample_content_dto
+        client = RemoteAgentService(agent_server.url)
+        
+        assert list(client.process_collection("https://www.youtube.com/playlist?list=PL1")) == [sample_content_dto]
+        service.process_content.assert_called_once_with(
+            url="https://www.youtube.com/watch?v=bbbbbbbbbbb", text=None
+        )
+        
+        client.mark_processed("https://www.youtube.com/watch?v=bbbbbbbbbbb")
+        service.mark_processed.assert_called_once_with("https://www.youtube.com/watch?v=bbbbbbbbbbb")
+    
+    def test_local_file_is_read_by_the_client(self, agent_server, tmp_path):
+        path = tmp_path / "notes.md"
+        path.write_text("# Notes\n\nShip the release on Friday.\n")
+        client = RemoteAgentService(agent_server.url)
+        
+        content = client.process_content(path=str(path))
+        
+        assert content.text == "# Notes\n\nShip the release on Friday.\n"
+        assert content.source_type == "file"
+        assert content.source_path is None
+        agent_server.agent_service.process_content.assert_not_called()
+    
+    def test_server_rejects_file_paths(self, agent_server, sample_content_dto):
+        client = RemoteAgentService(agent_server.url)
+        
+        with pytest.raises(ValueError, match="Local files are not accepted"):
+            client._post('/content', {'path': '/etc/passwd'})
+        with pytest.raises(ValueError, match="Local files are not accepted"):
+            client.summarize(sample_content_dto.model_copy(update={'source_path': '/etc/passwd', 'source_size': 10}))
+        agent_server.agent_service.process_content.assert_not_called()
+        agent_server.agent_service.summarize.assert_not_called()
+    
+    def test_value_error_is_propagated(self, agent_server):
+        agent_server.agent_service.process_content.side_effect = ValueError("Invalid URL format")
+        client = RemoteAgentService(agent_server.url)
+        
+        with pytest.raises(ValueError, match="Invalid URL format"):
+            client.process_content(url="not-a-url")
+    
+    def test_server_error(self, agent_server, sample_content_dto):
+        agent_server.agent_service.summarize.side_effect = RuntimeError("quota exceeded")
+        client = RemoteAgentService(agent_server.url)
+        
+        with pytest.raises(AgentServerError, match="quota exceeded"):
+            client.summarize(sample_content_dto)
+    
+    def test_unreachable_server(self):
+        client = RemoteAgentService("http://127.0.0.1:9", timeout=1)
+        
+        with pytest.raises(AgentServerError, match="unreachable"):
+            client.process_content(text="hello")
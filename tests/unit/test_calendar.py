@@ -0,0 +1,162 @@
+"""Tests for multi-account calendar scheduling."""
+import datetime
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.infra.client.google_client import CalendarServicePool
+from src.modules.agent.service.calendar import CalendarService, CalendarTarget
+
+
+class TestCalendarTarget:
+    """Tests for CalendarTarget."""
+
+    def test_parse(self):
+        assert CalendarTarget.parse("alice") == CalendarTarget("alice", "primary")
+        assert CalendarTarget.parse("bob/team@group.calendar.google.com") == CalendarTarget(
+            "bob", "team@group.calendar.google.com"
+        )
+        assert CalendarTarget.parse_list("alice, bob/team,") == [CalendarTarget("alice"), CalendarTarget("bob", "team")]
+
+    def test_str_round_trips(self):
+        for spec in ("alice", "bob/team"):
+            assert str(CalendarTarget.parse(spec)) == spec
+
+    def test_empty_account(self):
+        with pytest.raises(ValueError, match="Invalid calendar target"):
+            CalendarTarget.parse("/team")
+
+    def test_invalid_account_name(self):
+        with pytest.raises(ValueError, match="Invalid calendar account name"):
+            CalendarTarget.parse("../secrets/team")
+
+
+class TestCalendarServicePool:
+    """Tests for CalendarServicePool."""
+
+    def test_token_paths(self, tmp_path):
+        pool = CalendarServicePool(tmp_path, tmp_path / "credentials.json")
+
+        assert pool.token_path() == tmp_path / "token.json"
+        assert pool.token_path("alice@example.com") == tmp_path / "alice@example.com.json"
+        with pytest.raises(ValueError, match="Invalid calendar account name"):
+            pool.token_path("../secrets")
+
+    def test_accounts(self, tmp_path):
+        (tmp_path / "token.json").write_text("{}")
+        (tmp_path / "alice.json").write_text("{}")
+
+        assert CalendarServicePool(tmp_path, tmp_path / "credentials.json").accounts() == ["alice", "default"]
+
+    @patch('googleapiclient.discovery.build')
+    @patch('src.infra.client.google_client._load_credentials')
+    def test_builds_each_account_once(self, mock_load, mock_build, tmp_path):
+        mock_build.side_effect = lambda *args, credentials: MagicMock(name=credentials)
+        pool = CalendarServicePool(tmp_path, tmp_path / "credentials.json")
+
+        alice = pool.get("alice")
+        assert pool.get("alice") is alice
+        assert pool.get("bob") is not alice
+        assert [call.args[0] for call in mock_load.call_args_list] == [tmp_path / "alice.json", tmp_path / "bob.json"]
+
+
+    @patch('google_auth_oauthlib.flow.InstalledAppFlow')
+    def test_unauthorized_account_does_not_start_oauth_flow(self, mock_flow, tmp_path):
+        (tmp_path / "credentials.json").write_text("{}")
+        pool = CalendarServicePool(tmp_path, tmp_path / "credentials.json")
+
+        assert not pool.is_authorized("alice")
+        with pytest.raises(ValueError, match="not authorized.*agent calendar auth"):
+            pool.get("alice")
+        mock_flow.from_client_secrets_file.assert_not_called()
+
+
+class TestAddEventQuota:
+    """Tests for quota use around Calendar inserts."""
+
+    @pytest.mark.parametrize("status, reason, drained", [
+        (429, "rateLimitExceeded", True),
+        (403, "userRateLimitExceeded", True),
+        (403, "forbidden", False),
+    ])
+    def test_rate_limit_drains_shared_quota(self, status, reason, drained):
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        quota = MagicMock()
+        pool = MagicMock()
+        pool.get.return_value.events.return_value.insert.return_value.execute.side_effect = HttpError(
+            httplib2.Response({"status": status}),
+            f'{{"error": {{"message": "no", "errors": [{{"reason": "{reason}"}}]}}}}'.encode()
+        )
+        pool.lock.return_value = threading.Lock()
+
+        with patch('src.modules.agent.service.calendar.get_quota_manager', return_value=quota), \
+                patch('src.modules.agent.service.calendar.get_calendar_pool', return_value=pool):
+            with pytest.raises(HttpError):
+                CalendarService().add_event("Do it", datetime.datetime(2024, 1, 1, 10))
+
+        assert quota.drain.called is drained
+
+
+class TestAddEvents:
+    """Tests for CalendarService.add_events."""
+
+    @patch('src.modules.agent.service.calendar.get_quota_manager', return_value=None)
+    def test_accounts_are_scheduled_concurrently(self, _, tmp_path):
+        pool = CalendarServicePool(tmp_path, tmp_path / "credentials.json")
+        active = {}
+        overlap = {"accounts": 0, "same_account": 0}
+        lock = threading.Lock()
+
+        def service(account):
+            def insert(calendarId, body):
+                def execute():
+                    with lock:
+                        active[account] = active.get(account, 0) + 1
+                        overlap["accounts"] = max(overlap["accounts"], sum(1 for n in active.values() if n))
+                        overlap["same_account"] = max(overlap["same_account"], active[account])
+                    time.sleep(0.05)
+                    with lock:
+                        active[account] -= 1
+                    return {"htmlLink": f"https://calendar/{account}/{calendarId}/{body['summary']}"}
+                return MagicMock(execute=execute)
+            return MagicMock(**{"events.return_value.insert.side_effect": insert})
+
+        pool._services = {account: service(account) for account in ("alice", "bob", "carol")}
+        start = datetime.datetime(2024, 1, 1, 10)
+        targets = [CalendarTarget("alice"), CalendarTarget("bob", "team"), CalendarTarget("carol")]
+
+        with patch('src.modules.agent.service.calendar.get_calendar_pool', return_value=pool):
+            results = list(CalendarService(max_workers=6).add_events(
+                [("Read", start, None), ("Write", start, "https://example.com")], targets
+            ))
+
+        assert len(results) == 6
+        links = {event.event_link for _, _, event in results}
+        assert "https://calendar/bob/team/Write" in links
+        assert {event.calendar for _, _, event in results} == {"alice", "bob/team", "carol"}
+        assert overlap["accounts"] > 1
+        # One account's service (a single httplib2 connection) is never used concurrently
+        assert overlap["same_account"] == 1
+
+    @patch('src.modules.agent.service.calendar.get_quota_manager', return_value=None)
+    def test_failure_is_reported_per_calendar(self, _, tmp_path):
+        pool = CalendarServicePool(tmp_path, tmp_path / "credentials.json")
+        pool._services = {
+            "alice": MagicMock(**{"events.return_value.insert.return_value.execute.return_value": {"htmlLink": "ok"}}),
+            "bob": MagicMock(**{"events.return_value.insert.return_value.execute.side_effect": RuntimeError("403")}),
+        }
+
+        with patch('src.modules.agent.service.calendar.get_calendar_pool', return_value=pool):
+            results = {
+                target.account: result
+                for _, target, result in CalendarService().add_events(
+                    [("Read", datetime.datetime(2024, 1, 1, 10), None)], [CalendarTarget("alice"), CalendarTarget("bob")]
+                )
+            }
+
+        assert results["alice"].event_link == "ok"
+        assert isinstance(results["bob"], RuntimeError)
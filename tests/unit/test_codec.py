@@ -0,0 +1,92 @@
+"""Tests for the binary record codec."""
+import datetime
+import json
+import sqlite3
+
+import pytest
+
+from src.core import codec
+from src.infra.queue.sqlite_queue import SQLiteJobQueue
+from src.modules.agent.bench import run_benchmark
+
+
+class TestCodec:
+    """Tests for dumps and loads."""
+
+    @pytest.mark.parametrize("value", [
+        None, True, False, 0, 127, 128, 65536, 2 ** 64 - 1, -1, -33, -2 ** 63, 1.5, "", "é" * 40, b"\x00\xff",
+        [], [1, [2, None]], {"a": {"b": [True]}}, {str(i): i for i in range(20)}, list(range(70_000)),
+        datetime.datetime(2024, 1, 1, 10, 30), datetime.datetime(2024, 1, 1, 10, tzinfo=datetime.timezone.utc),
+    ])
+    def test_round_trip(self, value):
+        assert codec.loads(codec.dumps(value)) == value
+
+    def test_msgpack_wire_format(self):
+        data = codec.dumps({"n": 300, "s": "hi", "l": [None, -1]})
+
+        assert data[4:] == b"\x83\xa1n\xcd\x01\x2c\xa1s\xa2hi\xa1l\x92\xc0\xff"
+
+    def test_text_is_raw_utf8(self):
+        text = "сводка " * 100
+
+        assert len(codec.dumps(text)) < len(json.dumps(text)) / 2
+
+    def test_long_strings_are_compressed_above_threshold(self):
+        record = {"text": "the agent read the article " * 200, "source_type": "article"}
+
+        compressed = codec.dumps(record, compress_min=1024)
+
+        assert len(compressed) < len(codec.dumps(record)) / 10
+        assert codec.loads(compressed) == record
+        assert codec.dumps({"text": "short"}, compress_min=1024) == codec.dumps({"text": "short"})
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError, match="Cannot encode set"):
+            codec.dumps({"ids": {1, 2}})
+
+    @pytest.mark.parametrize("data", [b"", b'{"a": 1}', codec.dumps([1, 2])[:-1], codec.dumps(1) + b"\x00"])
+    def test_invalid_data(self, data):
+        with pytest.raises(ValueError):
+            codec.loads(data)
+
+
+class TestSQLiteJobQueueRecords:
+    """SQLite job queue storage of payloads and results."""
+
+    def test_payloads_are_binary_and_compressed(self, tmp_path):
+        queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3", compress_min=1024)
+        payload = {"content": {"text": "a long article " * 1000, "source_type": "article"}}
+        job_id = queue.enqueue("summarize", payload)
+
+        stored = sqlite3.connect(tmp_path / "jobs.sqlite3").execute(
+            "SELECT payload FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()[0]
+
+        assert isinstance(stored, bytes)
+        assert len(stored) < 1000
+        assert queue.lease(["summarize"], "w1", 60).payload == payload
+        queue.close()
+
+    def test_reads_json_rows(self, tmp_path):
+        queue = SQLiteJobQueue(tmp_path / "jobs.sqlite3")
+        job_id = queue.enqueue("fetch", {})
+        queue.close()
+        with sqlite3.connect(tmp_path / "jobs.sqlite3") as conn:
+            conn.execute(
+                "UPDATE jobs SET payload = ?, result = ? WHERE id = ?",
+                (json.dumps({"url": "https://example.com"}), json.dumps({"chars": 10}), job_id)
+            )
+
+        assert queue.lease(["fetch"], "w1", 60).payload == {"url": "https://example.com"}
+        assert queue.job(job_id)["result"] == {"chars": 10}
+        queue.close()
+
+
+def test_benchmark_round_trips_every_method():
+    results = run_benchmark(text_chars=5_000, iterations=1)
+
+    assert {result.method for result in results} == {
+        "json", "pydantic json", "binary", "binary + zlib", "binary + model_construct"
+    }
+    sizes = {(result.dto, result.method): result.size for result in results}
+    assert sizes["ContentDTO", "binary + zlib"] < sizes["ContentDTO", "json"] / 2
@@ -1,6 +1,16 @@
 """Tests for content fetcher utilities."""
+import threading
 import pytest
-from src.infra.client.content_fetcher import is_url, is_youtube_url
+from unittest.mock import MagicMock, patch
+from src.core.concurrency import imap_unordered
+from src.core.transcript import Transcript, TranscriptCache
+from src.infra.client.content_fetcher import (
+    is_url,
+    is_youtube_url,
+    is_youtube_collection_url,
+    expand_youtube_collection,
+    fetch_transcripts
+)
 
 
 class TestIsUrl:
@@ -45,3 +55,99 @@ class TestIsYoutubeUrl:
     
     def test_not_url(self):
         assert is_youtube_url("just text") is False
+
+
+class TestIsYoutubeCollectionUrl:
+    """Tests for is_youtube_collection_url function."""
+    
+    def test_playlist_url(self):
+        assert is_youtube_collection_url("https://www.youtube.com/playlist?list=PLabc123") is True
+    
+    def test_channel_urls(self):
+        assert is_youtube_collection_url("https://www.youtube.com/@PyConUS") is True
+        assert is_youtube_collection_url("https://youtube.com/channel/UC1234567890/videos") is True
+        assert is_youtube_collection_url("https://www.youtube.com/c/SomeName") is True
+    
+    def test_video_urls_are_not_collections(self):
+        assert is_youtube_collection_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLabc123") is False
+        assert is_youtube_collection_url("https://youtu.be/dQw4w9WgXcQ") is False
+    
+    def test_not_youtube(self):
+        assert is_youtube_collection_url("https://example.com/playlist?list=PLabc123") is False
+
+
+class TestExpandYoutubeCollection:
+    """Tests for expand_youtube_collection function."""
+    
+    @patch('requests.get')
+    def test_playlist_ids_in_order_without_duplicates(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, content=b"", text=(
+            '"playlistVideoRenderer":{"videoId":"aaaaaaaaaaa"} "videoId":"zzzzzzzzzzz" '
+            '"playlistVideoRenderer":{"videoId":"bbbbbbbbbbb"} "playlistVideoRenderer":{"videoId":"aaaaaaaaaaa"}'
+        ))
+        
+        video_ids = expand_youtube_collection("https://youtube.com/playlist?list=PLabc123")
+        
+        assert video_ids == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        assert mock_get.call_args[0][0] == "https://www.youtube.com/playlist?list=PLabc123"
+    
+    @patch('requests.get')
+    def test_channel_videos_tab_with_limit(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, content=b"", text=(
+            '"videoRenderer":{"videoId":"aaaaaaaaaaa"} "videoRenderer":{"videoId":"bbbbbbbbbbb"}'
+        ))
+        
+        video_ids = expand_youtube_collection("https://www.youtube.com/@PyConUS", limit=1)
+        
+        assert video_ids == ["aaaaaaaaaaa"]
+        assert mock_get.call_args[0][0] == "https://www.youtube.com/@PyConUS/videos"
+    
+    def test_rejects_video_url(self):
+        with pytest.raises(ValueError):
+            expand_youtube_collection("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+
+class TestFetchTranscripts:
+    """Tests for fetch_transcripts function."""
+    
+    @patch('src.infra.client.content_fetcher.fetch_transcript')
+    def test_fetches_through_cache_and_reports_errors(self, mock_fetch, tmp_path):
+        cache = TranscriptCache(tmp_path)
+        
+        def fetch(url, cache=None):
+            video_id = url[-11:]
+            if video_id == "bbbbbbbbbbb":
+                raise ValueError("No transcripts found")
+            return Transcript.from_segments(video_id, [("fresh", 0.0, 1.0)])
+        mock_fetch.side_effect = fetch
+        
+        results = dict(fetch_transcripts(["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"], cache=cache, max_workers=2))
+        
+        # A cached transcript is not a processed video: every video is yielded
+        assert set(results) == {"aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"}
+        assert results["aaaaaaaaaaa"].text == "fresh"
+        assert isinstance(results["bbbbbbbbbbb"], ValueError)
+        assert all(call.kwargs["cache"] is cache for call in mock_fetch.call_args_list)
+
+
+class TestImapUnordered:
+    """Tests for the bounded pool helper."""
+    
+    def test_bounds_pending_calls(self):
+        lock = threading.Lock()
+        started = []
+        
+        def work(item):
+            with lock:
+                started.append(item)
+            return item * 2
+        
+        results = imap_unordered(work, range(100), max_workers=2, max_pending=3)
+        item, future = next(results)
+        
+        # One result consumed: at most the initial window plus one refill has been submitted
+        assert len(started) <= 4
+        assert future.result() == item * 2
+        assert sorted(future.result() for _, future in results) == sorted(
+            2 * i for i in range(100) if i != item
+        )
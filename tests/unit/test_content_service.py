@@ -1,7 +1,8 @@
 """Tests for ContentService."""
 import pytest
 from unittest.mock import patch, MagicMock
-from src.modules.agent.service.content import ContentService
+from src.core.transcript import Transcript
+from src.modules.agent.service.content import ContentService, transcript_cache
 from src.modules.agent.dto import ContentDTO
 
 
@@ -19,7 +20,7 @@ class TestContentService:
     
     def test_fetch_content_no_input(self):
         """Test that ValueError is raised when no input provided."""
-        with pytest.raises(ValueError, match="Either url or text must be provided"):
+        with pytest.raises(ValueError, match="Either url, text or path must be provided"):
             ContentService.fetch_content()
     
     @patch('src.modules.agent.service.content.fetch_article_text')
@@ -39,21 +40,23 @@ class TestContentService:
         assert result.source_url == "https://example.com/article"
         mock_fetch.assert_called_once_with("https://example.com/article")
     
-    @patch('src.modules.agent.service.content.fetch_video_transcript')
+    @patch('src.modules.agent.service.content.fetch_transcript')
     @patch('src.modules.agent.service.content.is_url')
     @patch('src.modules.agent.service.content.is_youtube_url')
     def test_fetch_content_with_youtube_url(self, mock_is_youtube, mock_is_url, mock_fetch):
         """Test fetching content from YouTube URL."""
         mock_is_youtube.return_value = True
         mock_is_url.return_value = True
-        mock_fetch.return_value = "Video transcript content"
+        transcript = Transcript.from_segments("test", [("Video transcript", 0.0, 1.5), ("content", 1.5, 1.0)])
+        mock_fetch.return_value = transcript
         
         result = ContentService.fetch_content(url="https://youtube.com/watch?v=test")
         
         assert isinstance(result, ContentDTO)
         assert result.text == "Video transcript content"
         assert result.source_type == "video transcript"
-        mock_fetch.assert_called_once_with("https://youtube.com/watch?v=test")
+        assert result.transcript is transcript
+        mock_fetch.assert_called_once_with("https://youtube.com/watch?v=test", cache=transcript_cache)
     
     def test_fetch_content_invalid_url_format(self):
         """Test that ValueError is raised for invalid URL format."""
@@ -71,3 +74,38 @@ class TestContentService:
         
         with pytest.raises(ValueError, match="Could not extract text"):
             ContentService.fetch_content(url="https://example.com/article")
+    
+    @patch('src.modules.agent.service.content.fetch_transcripts')
+    @patch('src.modules.agent.service.content.expand_youtube_collection')
+    def test_fetch_collection_streams_new_videos(self, mock_expand, mock_fetch):
+        """Test fetching a playlist yields fetched videos and skips failures."""
+        mock_expand.return_value = ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        mock_fetch.return_value = iter([
+            ("bbbbbbbbbbb", Transcript.from_segments("bbbbbbbbbbb", [("Second talk", 0.0, 2.0)])),
+            ("aaaaaaaaaaa", ValueError("No transcripts found")),
+        ])
+        
+        results = list(ContentService.fetch_collection("https://www.youtube.com/playlist?list=PLabc123"))
+        
+        assert [result.source_url for result in results] == ["https://www.youtube.com/watch?v=bbbbbbbbbbb"]
+        assert results[0].text == "Second talk"
+        assert mock_fetch.call_args.kwargs["cache"] is transcript_cache
+    
+    @patch('src.modules.agent.service.content.fetch_transcripts')
+    @patch('src.modules.agent.service.content.expand_youtube_collection')
+    def test_fetch_collection_skips_processed_videos(self, mock_expand, mock_fetch):
+        """Test that videos the skip predicate accepts are not fetched."""
+        mock_expand.return_value = ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        mock_fetch.return_value = iter([])
+        
+        list(ContentService.fetch_collection(
+            "https://www.youtube.com/playlist?list=PLabc123",
+            skip=lambda url: url.endswith("aaaaaaaaaaa")
+        ))
+        
+        assert mock_fetch.call_args.args[0] == ["bbbbbbbbbbb"]
+    
+    def test_fetch_content_rejects_collection_url(self):
+        """Test that playlist URLs are not fetched as a single video."""
+        with pytest.raises(ValueError, match="fetch_collection"):
+            ContentService.fetch_content(url="https://www.youtube.com/playlist?list=PLabc123")
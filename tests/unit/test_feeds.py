@@ -0,0 +1,144 @@
+"""Tests for RSS/Atom feed polling."""
+import datetime
+from unittest.mock import MagicMock, patch
+from src.infra.client.feed_fetcher import FeedEntry, FeedResponse, fetch_feed, parse_feed
+from src.modules.agent.service.feeds import FeedService, FeedState, FeedStore, new_entries
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Blog</title>
+  <item><title>Second</title><link>https://blog.example.com/2</link><guid>post-2</guid>
+    <pubDate>Tue, 07 Sep 2021 10:00:00 +0000</pubDate></item>
+  <item><title>First</title><link>https://blog.example.com/1</link><guid>post-1</guid>
+    <pubDate>Mon, 06 Sep 2021 10:00:00 +0000</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Blog</title>
+  <entry><title>Post</title><id>tag:example.com,2021:1</id>
+    <link rel="alternate" href="https://example.com/post"/><link rel="edit" href="https://example.com/edit"/>
+    <updated>2021-09-06T10:00:00Z</updated></entry>
+</feed>"""
+
+
+def utc(day: int) -> datetime.datetime:
+    return datetime.datetime(2021, 9, day, 10, tzinfo=datetime.timezone.utc)
+
+
+class TestParseFeed:
+    """Tests for parse_feed."""
+    
+    def test_rss(self):
+        entries = parse_feed(RSS)
+        
+        assert [entry.id for entry in entries] == ["post-2", "post-1"]
+        assert entries[0].link == "https://blog.example.com/2"
+        assert entries[0].published == utc(7)
+    
+    def test_atom(self):
+        entries = parse_feed(ATOM)
+        
+        assert entries == [FeedEntry(id="tag:example.com,2021:1", link="https://example.com/post", title="Post", published=utc(6))]
+
+
+class TestFetchFeed:
+    """Tests for fetch_feed."""
+    
+    @patch('requests.get')
+    def test_sends_validators_and_handles_not_modified(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=304, content=b"")
+        
+        response = fetch_feed("https://blog.example.com/feed", etag='"abc"', last_modified="Mon, 06 Sep 2021 10:00:00 GMT")
+        
+        headers = mock_get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+        assert headers["If-Modified-Since"] == "Mon, 06 Sep 2021 10:00:00 GMT"
+        assert response.not_modified
+        assert response.etag == '"abc"'
+        assert response.entries == []
+    
+    @patch('requests.get')
+    def test_parses_modified_feed(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, content=RSS, headers={"ETag": '"new"'})
+        
+        response = fetch_feed("https://blog.example.com/feed")
+        
+        assert response.etag == '"new"'
+        assert len(response.entries) == 2
+
+
+class TestNewEntries:
+    """Tests for new_entries."""
+    
+    def test_first_poll_emits_newest(self):
+        entries = parse_feed(RSS)
+        
+        assert [entry.id for entry in new_entries(FeedState(url="u"), entries, initial_entries=1)] == ["post-2"]
+        assert new_entries(FeedState(url="u"), entries, initial_entries=0) == []
+    
+    def test_only_entries_past_high_water_mark(self):
+        state = FeedState(url="u", high_water=utc(7), seen_ids={"post-2", "post-1"})
+        entries = [
+            FeedEntry(id="post-3", link="l3", published=utc(8)),
+            FeedEntry(id="post-2b", link="l2b", published=utc(7)),
+            FeedEntry(id="post-late", link="l0", published=utc(5)),
+            FeedEntry(id="undated", link="lu"),
+        ] + parse_feed(RSS)
+        
+        assert [entry.id for entry in new_entries(state, entries)] == ["undated", "post-2b", "post-3"]
+
+
+class TestFeedService:
+    """Tests for FeedService."""
+    
+    @patch('src.modules.agent.service.feeds.fetch_feed')
+    def test_poll_emits_once_and_uses_validators(self, mock_fetch, tmp_path):
+        store = FeedStore(tmp_path / "feeds.sqlite3")
+        store.add("https://blog.example.com/feed")
+        service = FeedService(store, initial_entries=5)
+        mock_fetch.return_value = FeedResponse(
+            url="https://blog.example.com/feed", status=200, etag='"v1"', entries=parse_feed(RSS)
+        )
+        
+        updates = list(service.poll())
+        assert [entry.id for entry in updates[0].entries] == ["post-1", "post-2"]
+        
+        # Not committed yet: the same entries come back
+        assert len(list(service.poll())) == 1
+        mock_fetch.assert_called_with("https://blog.example.com/feed", etag=None, last_modified=None)
+        
+        service.commit(updates[0])
+        assert list(service.poll()) == []
+        mock_fetch.assert_called_with("https://blog.example.com/feed", etag='"v1"', last_modified=None)
+        
+        mock_fetch.return_value = FeedResponse(url="https://blog.example.com/feed", status=304, etag='"v1"')
+        assert list(service.poll()) == []
+        assert store.states()[0].high_water == utc(7)
+    
+    @patch('src.modules.agent.service.feeds.fetch_feed')
+    def test_failed_feed_is_skipped(self, mock_fetch, tmp_path):
+        store = FeedStore(tmp_path / "feeds.sqlite3")
+        store.add("https://down.example.com/feed")
+        mock_fetch.side_effect = ConnectionError("down")
+        
+        assert list(FeedService(store).poll()) == []
+        assert store.states()[0].is_new
+    
+    @patch('src.modules.agent.service.feeds.fetch_feed')
+    def test_failed_entry_is_emitted_again(self, mock_fetch, tmp_path):
+        store = FeedStore(tmp_path / "feeds.sqlite3")
+        store.add("https://blog.example.com/feed")
+        service = FeedService(store, initial_entries=5)
+        mock_fetch.return_value = FeedResponse(
+            url="https://blog.example.com/feed", status=200, etag='"v1"', entries=parse_feed(RSS)
+        )
+        
+        # post-1 (older) failed, post-2 went through
+        service.commit(next(service.poll()), failed={"post-1"})
+        
+        updates = list(service.poll())
+        assert [entry.id for entry in updates[0].entries] == ["post-1"]
+        # The failed poll's ETag was not kept, so the feed is fetched in full again
+        mock_fetch.assert_called_with("https://blog.example.com/feed", etag=None, last_modified=None)
+        
+        service.commit(updates[0])
+        assert list(service.poll()) == []
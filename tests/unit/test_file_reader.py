@@ -0,0 +1,122 @@
+"""Tests for chunked local file ingestion."""
+import tracemalloc
+import pytest
+from unittest.mock import MagicMock
+from src.infra.client.file_reader import FileDocument
+from src.modules.agent.dto import ContentDTO
+from src.modules.agent.service.agent import AgentService
+from src.modules.agent.service.ai import AIService
+from src.modules.agent.service.content import ContentService
+
+
+class TestFileDocument:
+    """Tests for FileDocument."""
+    
+    def test_chunks_preserve_text_and_bounds(self, tmp_path):
+        text = "".join(f"Paragraph {i}: naïve café ünïcödé words and more words.\n\n" for i in range(200))
+        path = tmp_path / "notes.md"
+        path.write_text(text, encoding="utf-8")
+        
+        chunks = list(FileDocument(path).chunks(500))
+        
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= 500 for chunk in chunks)
+        assert all(chunk.endswith("\n\n") for chunk in chunks)
+    
+    def test_hard_cut_keeps_utf8_characters(self, tmp_path):
+        path = tmp_path / "dense.txt"
+        path.write_text("é" * 1000, encoding="utf-8")
+        
+        chunks = list(FileDocument(path).chunks(101))
+        
+        assert "".join(chunks) == "é" * 1000
+    
+    def test_html_is_reduced_to_text(self, tmp_path):
+        path = tmp_path / "export.html"
+        path.write_text(
+            "<html><head><style>p { color: red }</style></head><body>"
+            + "<p>Fish &amp; chips are served daily.</p><script>track()</script>" * 50
+            + "</body></html>"
+        )
+        
+        text = "\n".join(FileDocument(path).chunks(200))
+        
+        assert text.count("Fish & chips are served daily.") == 50
+        assert "track()" not in text and "color" not in text
+    
+    @pytest.mark.parametrize("content, message", [(b"", "empty"), (b"\x00\x01binary", "Not a text file")])
+    def test_validate_rejects(self, tmp_path, content, message):
+        path = tmp_path / "input.txt"
+        path.write_bytes(content)
+        
+        with pytest.raises(ValueError, match=message):
+            FileDocument(path).validate()
+    
+    def test_peak_memory_does_not_grow_with_file_size(self, tmp_path):
+        path = tmp_path / "large.txt"
+        line = "A fairly ordinary sentence about quarterly planning and follow-ups.\n"
+        with open(path, "w") as f:
+            for _ in range(300_000):  # ~20 MB
+                f.write(line)
+        
+        tracemalloc.start()
+        try:
+            total = sum(len(chunk) for chunk in FileDocument(path).chunks(100_000))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        assert total == path.stat().st_size
+        assert peak < 2_000_000
+
+
+class TestFileContent:
+    """Tests for file sources in ContentService, AIService and AgentService."""
+    
+    def test_fetch_content_with_path(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("Some notes")
+        
+        content = ContentService.fetch_content(path=str(path))
+        
+        assert content.text == ""
+        assert content.source_path == str(path.resolve())
+        assert content.character_count == 10
+        assert ContentService.source_link(content, "Read notes") == path.resolve().as_uri()
+    
+    def test_summarize_chunks_condenses_notes(self, monkeypatch):
+        notes = MagicMock(side_effect=lambda text: f"notes({len(text)})")
+        summarize = MagicMock(return_value="• Summary")
+        monkeypatch.setattr(AIService, "_notes", staticmethod(notes))
+        monkeypatch.setattr(AIService, "summarize_text", staticmethod(summarize))
+        
+        result = AIService.summarize_chunks(iter(["a" * 10, "b" * 10, "c" * 10, "d" * 10]), max_chars=20)
+        
+        assert result == "• Summary"
+        # Four chunk notes plus one condensation once the notes passed 20 characters
+        assert notes.call_count == 5
+        summarize.assert_called_once()
+    
+    def test_single_chunk_is_summarized_directly(self, monkeypatch):
+        summarize = MagicMock(return_value="• Summary")
+        monkeypatch.setattr(AIService, "summarize_text", staticmethod(summarize))
+        
+        assert AIService.summarize_chunks(iter(["only chunk"]), max_chars=20) == "• Summary"
+        summarize.assert_called_once_with("only chunk")
+    
+    def test_agent_streams_file_to_summarizer(self, tmp_path):
+        path = tmp_path / "report.md"
+        path.write_text("Quarterly planning notes with follow-ups for the team.\n" * 100)
+        agent = AgentService(fingerprint_index=MagicMock(), action_index=None)
+        agent.fingerprint_index.find.return_value = None
+        agent.ai_service = MagicMock()
+        agent.ai_service.summarize_chunks.side_effect = lambda chunks, max_chars: f"{sum(1 for _ in chunks)} chunks"
+        agent.chunk_chars = 1000
+        
+        summary = agent.summarize(ContentDTO(text="", source_type="file", source_path=str(path), source_size=path.stat().st_size))
+        
+        assert summary.points == "6 chunks"
+        assert summary.character_count == path.stat().st_size
+        url_key, fingerprint = agent.fingerprint_index.find.call_args[0]
+        assert url_key is None and fingerprint is not None
+        agent.ai_service.summarize_text.assert_not_called()
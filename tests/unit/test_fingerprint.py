@@ -0,0 +1,158 @@
+"""Tests for near-duplicate content detection."""
+import pytest
+from unittest.mock import MagicMock
+from src.modules.agent.dto import ContentDTO
+from src.modules.agent.service.action_index import ActionIndex
+from src.modules.agent.service.agent import AgentService
+from src.modules.agent.service.fingerprint import FingerprintIndex, SimHasher, hamming_distance, normalize_url, simhash
+
+ARTICLE = " ".join(
+    f"Paragraph {i} explains how the new compiler release improves startup time and memory usage."
+    for i in range(40)
+)
+
+
+class TestNormalizeUrl:
+    """Tests for normalize_url."""
+    
+    def test_strips_tracking_params_and_fragment(self):
+        assert normalize_url("https://example.com/post?utm_source=x&id=1&fbclid=abc#top") == "https://example.com/post?id=1"
+    
+    def test_host_and_scheme_variants(self):
+        assert normalize_url("http://WWW.Example.com/post/") == normalize_url("https://example.com/post")
+    
+    def test_amp_variants(self):
+        assert normalize_url("https://example.com/post/amp") == "https://example.com/post"
+        assert normalize_url("https://amp.example.com/post?amp=1") == "https://example.com/post"
+    
+    def test_query_order(self):
+        assert normalize_url("https://example.com/?b=2&a=1") == normalize_url("https://example.com/?a=1&b=2")
+
+
+class TestSimhash:
+    """Tests for simhash."""
+    
+    def test_identical_text(self):
+        assert simhash(ARTICLE) == simhash(ARTICLE)
+    
+    def test_near_duplicate_is_close(self):
+        syndicated = "Originally published on Example Blog. " + ARTICLE.replace("Paragraph 7", "Section 7")
+        assert hamming_distance(simhash(ARTICLE), simhash(syndicated)) <= 3
+    
+    def test_different_text_is_far(self):
+        other = " ".join(f"Recipe step {i}: whisk eggs with sugar, then fold in flour slowly." for i in range(40))
+        assert hamming_distance(simhash(ARTICLE), simhash(other)) > 10
+    
+    def test_too_short(self):
+        assert simhash("two words") is None
+    
+    def test_incremental_matches_whole_text(self):
+        words = ARTICLE.split(" ")
+        hasher = SimHasher()
+        for i in range(0, len(words), 7):
+            hasher.update(" ".join(words[i:i + 7]))
+        
+        assert hasher.digest() == simhash(ARTICLE)
+
+
+class TestFingerprintIndex:
+    """Tests for FingerprintIndex."""
+    
+    def test_find_by_fingerprint_after_reload(self, tmp_path):
+        index = FingerprintIndex(tmp_path / "fp.sqlite3")
+        item_id = index.add(None, simhash(ARTICLE), "• Summary", "article", len(ARTICLE))
+        index.close()
+        
+        match = FingerprintIndex(tmp_path / "fp.sqlite3").find(None, simhash(ARTICLE) ^ 0b101)
+        
+        assert match.id == item_id
+        assert match.distance == 2
+        assert match.summary_points == "• Summary"
+    
+    def test_find_by_url(self, tmp_path):
+        index = FingerprintIndex(tmp_path / "fp.sqlite3")
+        index.add("https://example.com/post", None, "• Summary", "article", 10)
+        
+        assert index.find("https://example.com/post", None).distance == 0
+        assert index.find("https://example.com/other", None) is None
+    
+    def test_changed_content_at_known_url_is_not_a_match(self, tmp_path):
+        index = FingerprintIndex(tmp_path / "fp.sqlite3", max_distance=1)
+        index.add("https://example.com/post", 0, "• Old summary", "article", 10)
+        
+        assert index.find("https://example.com/post", 0b1).summary_points == "• Old summary"
+        assert index.find("https://example.com/post", 0b111) is None
+        
+        index.add("https://example.com/post", 0b111, "• New summary", "article", 12)
+        assert index.find("https://example.com/post", 0b111).summary_points == "• New summary"
+    
+    def test_sees_items_added_by_another_process(self, tmp_path):
+        reader = FingerprintIndex(tmp_path / "fp.sqlite3")
+        assert reader.find(None, simhash(ARTICLE)) is None
+        
+        item_id = FingerprintIndex(tmp_path / "fp.sqlite3").add(None, simhash(ARTICLE), "• Summary", "article", 10)
+        
+        assert reader.find(None, simhash(ARTICLE) ^ 0b1).id == item_id
+    
+    def test_no_match_beyond_distance(self, tmp_path):
+        index = FingerprintIndex(tmp_path / "fp.sqlite3", max_distance=1)
+        index.add(None, 0, "• Summary", "article", 10)
+        
+        assert index.find(None, 0b11) is None
+    
+    def test_actions_roundtrip(self, tmp_path):
+        index = FingerprintIndex(tmp_path / "fp.sqlite3")
+        index.add(None, 0, "• Summary", "article", 10)
+        
+        assert index.find_actions("• Summary") is None
+        index.set_actions("• Summary", ["Read the paper"])
+        assert index.find_actions("• Summary") == ["Read the paper"]
+    
+    def test_processed_roundtrip(self, tmp_path):
+        index = FingerprintIndex(tmp_path / "fp.sqlite3")
+        
+        assert not index.is_processed("youtube.com/watch?v=aaaaaaaaaaa")
+        index.mark_processed("youtube.com/watch?v=aaaaaaaaaaa")
+        index.mark_processed("youtube.com/watch?v=aaaaaaaaaaa")
+        assert index.is_processed("youtube.com/watch?v=aaaaaaaaaaa")
+    
+    def test_rejects_unsupported_distance(self, tmp_path):
+        with pytest.raises(ValueError):
+            FingerprintIndex(tmp_path / "fp.sqlite3", max_distance=4)
+
+
+class TestAgentServiceDeduplication:
+    """Tests for summary and action reuse in AgentService."""
+    
+    def test_near_duplicate_reuses_summary_and_actions(self, tmp_path):
+        agent = AgentService(
+            fingerprint_index=FingerprintIndex(tmp_path / "fp.sqlite3"),
+            action_index=ActionIndex(tmp_path / "actions")
+        )
+        agent.ai_service = MagicMock()
+        agent.ai_service.summarize_text.return_value = "• Point"
+        agent.ai_service.extract_actions.return_value = ["Try the compiler"]
+        original = ContentDTO(text=ARTICLE, source_type="article", source_url="https://example.com/post")
+        copy = ContentDTO(text=ARTICLE + " Share this post.", source_type="article", source_url="https://mirror.example.org/p/1")
+        
+        first_actions = agent.extract_actions(agent.summarize(original))
+        summary = agent.summarize(copy)
+        actions = agent.extract_actions(summary)
+        
+        assert summary.points == "• Point"
+        assert summary.character_count == len(copy.text)
+        assert actions == first_actions == ["Try the compiler"]
+        agent.ai_service.summarize_text.assert_called_once()
+        agent.ai_service.extract_actions.assert_called_once()
+    
+    def test_summarized_item_is_not_processed_until_marked(self, tmp_path):
+        agent = AgentService(fingerprint_index=FingerprintIndex(tmp_path / "fp.sqlite3"), action_index=None)
+        agent.ai_service = MagicMock()
+        agent.ai_service.summarize_text.return_value = "• Point"
+        content = ContentDTO(text=ARTICLE, source_type="video transcript", source_url="https://youtu.be/aaaaaaaaaaa")
+        
+        agent.summarize(content)
+        assert not agent.is_processed("https://www.youtube.com/watch?v=aaaaaaaaaaa")
+        
+        agent.mark_processed(content.source_url)
+        assert agent.is_processed("https://www.youtube.com/watch?v=aaaaaaaaaaa")
@@ -0,0 +1,116 @@
+"""Tests for the headless JSON Lines output mode."""
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+import typer
+
+from src.infra.client.google_client import CalendarServicePool
+from src.modules.agent.commands import _calendar_targets, _run_headless
+from src.modules.agent.dto import ContentDTO
+from src.modules.agent.headless import HeadlessRun, JsonlWriter, read_inputs
+from src.modules.agent.service.calendar import CalendarTarget
+
+
+@pytest.fixture
+def agent_service(make_agent_service):
+    return make_agent_service()
+
+
+def run(agent_service, inputs, **kwargs):
+    out = io.StringIO()
+    errors = HeadlessRun(agent_service, JsonlWriter(out), **kwargs).run(inputs)
+    return errors, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestHeadlessRun:
+    """Tests for HeadlessRun."""
+
+    def test_one_record_per_stage(self, agent_service):
+        errors, records = run(agent_service, [{"url": "https://example.com/a"}])
+
+        assert errors == 0
+        assert [record["stage"] for record in records] == ["content", "summary", "actions", "done"]
+        assert records[0]["item"] == 1
+        assert records[0]["source_url"] == "https://example.com/a"
+        assert records[1]["points"] == "• Point"
+        assert records[2]["actions"] == ["Read the docs"]
+        assert records[-1] == {"stage": "done", "items": 1, "errors": 0, "elapsed_ms": records[-1]["elapsed_ms"]}
+        assert all("elapsed_ms" in record for record in records)
+
+    def test_failed_item_does_not_stop_the_run(self, agent_service):
+        agent_service.summarize.side_effect = [RuntimeError("quota exceeded"), agent_service.summarize.return_value]
+
+        errors, records = run(agent_service, [{"text": "first"}, {"text": "second"}])
+
+        assert errors == 1
+        error = records[1]
+        assert (error["item"], error["stage"], error["error"], error["error_type"]) == (
+            1, "summary", "quota exceeded", "RuntimeError"
+        )
+        assert [(record.get("item"), record["stage"]) for record in records[2:]] == [
+            (2, "content"), (2, "summary"), (2, "actions"), (None, "done")
+        ]
+        assert records[-1]["errors"] == 1
+
+    def test_auto_schedule_writes_one_record_per_event(self, agent_service):
+        errors, records = run(agent_service, [{"text": "Some text"}], auto_schedule=True, targets=[CalendarTarget("alice"), CalendarTarget("bob", "team")])
+
+        assert errors == 0
+        scheduled = [record for record in records if record["stage"] == "schedule"]
+        assert [(record["action"], record["calendar"]) for record in scheduled] == [
+            ("Read the docs", "alice"), ("Read the docs", "bob/team")
+        ]
+        assert scheduled[0]["event_link"] == "https://calendar/1"
+
+    def test_collection_is_expanded_per_video(self, agent_service):
+        agent_service.process_collection.return_value = iter([
+            ContentDTO(text="one", source_type="youtube", source_url="https://youtu.be/1"),
+            ContentDTO(text="two", source_type="youtube", source_url="https://youtu.be/2"),
+        ])
+
+        errors, records = run(agent_service, [{"url": "https://www.youtube.com/playlist?list=PL123"}])
+
+        assert errors == 0
+        assert [record["source_url"] for record in records if record["stage"] == "content"] == [
+            "https://youtu.be/1", "https://youtu.be/2"
+        ]
+        assert records[-1]["items"] == 2
+
+
+class TestRunHeadless:
+    """Tests for the `run --output jsonl` entry points."""
+
+    def test_invalid_calendar_is_a_usage_error(self):
+        assert _calendar_targets(["alice", "bob/team"], check_tokens=False) == [
+            CalendarTarget("alice"), CalendarTarget("bob", "team")
+        ]
+        with pytest.raises(typer.BadParameter, match="Invalid calendar target"):
+            _calendar_targets(["alice", "/team"], check_tokens=False)
+        with pytest.raises(typer.BadParameter, match="Invalid calendar account name"):
+            _calendar_targets(["../alice"], check_tokens=False)
+
+    def test_unknown_calendar_account_is_a_usage_error(self, tmp_path):
+        (tmp_path / "alice.json").write_text("{}")
+        pool = CalendarServicePool(tmp_path, tmp_path / "credentials.json")
+
+        with patch("src.infra.client.google_client.get_calendar_pool", return_value=pool):
+            assert _calendar_targets(["alice/team"]) == [CalendarTarget("alice", "team")]
+            with pytest.raises(typer.BadParameter, match="'alcie' is not authorized"):
+                _calendar_targets(["alice", "alcie"])
+
+    def test_terminal_stdin_is_a_usage_error(self, agent_service):
+        with patch("sys.stdin") as stdin, pytest.raises(typer.BadParameter, match="stdin is a terminal"):
+            stdin.isatty.return_value = True
+            _run_headless(agent_service, url=None, text=None, file=None, auto_schedule=False)
+        agent_service.process_content.assert_not_called()
+
+
+class TestReadInputs:
+    """Tests for read_inputs."""
+
+    def test_urls_and_text(self):
+        lines = ["https://example.com/a\n", "\n", "  some note to self  \n"]
+
+        assert list(read_inputs(lines)) == [{"url": "https://example.com/a"}, {"text": "some note to self"}]
@@ -0,0 +1,97 @@
+"""Tests for the inbox and file system watchers."""
+import threading
+from src.core.watch import PollingWatcher, open_watcher
+from src.modules.agent.service.inbox import Inbox
+
+
+def drain(inbox):
+    items = []
+    for item in inbox.pending():
+        items.append(item)
+        inbox.commit(item)
+    return items
+
+
+class TestInboxFile:
+    """Tests for a line-per-item inbox file."""
+    
+    def test_resumes_from_persisted_offset(self, tmp_path):
+        path, state = tmp_path / "inbox.txt", tmp_path / "state.json"
+        path.write_text("https://example.com/a\n\nRemember to renew the passport\n")
+        
+        items = drain(Inbox(path, state))
+        assert [(item.url, item.text) for item in items] == [
+            ("https://example.com/a", None), (None, "Remember to renew the passport")
+        ]
+        
+        with open(path, "a") as f:
+            f.write("https://example.com/b\nhalf a li")
+        # A fresh instance (restart) only sees the new complete line
+        assert [item.url for item in drain(Inbox(path, state))] == ["https://example.com/b"]
+        
+        with open(path, "a") as f:
+            f.write("ne\n")
+        assert [item.text for item in drain(Inbox(path, state))] == ["half a line"]
+    
+    def test_uncommitted_items_are_returned_again(self, tmp_path):
+        path = tmp_path / "inbox.txt"
+        path.write_text("one\ntwo\n")
+        inbox = Inbox(path, tmp_path / "state.json")
+        
+        inbox.commit(next(inbox.pending()))
+        
+        assert [item.text for item in Inbox(path, tmp_path / "state.json").pending()] == ["two"]
+    
+    def test_rewritten_file_is_read_from_start(self, tmp_path):
+        path, state = tmp_path / "inbox.txt", tmp_path / "state.json"
+        path.write_text("first item here\n")
+        drain(Inbox(path, state))
+        
+        path.write_text("other\n")
+        
+        assert [item.text for item in drain(Inbox(path, state))] == ["other"]
+    
+    def test_missing_file_has_no_items(self, tmp_path):
+        assert list(Inbox(tmp_path / "inbox.txt", tmp_path / "state.json").pending()) == []
+
+
+class TestInboxDirectory:
+    """Tests for a file-per-item inbox directory."""
+    
+    def test_each_file_processed_once(self, tmp_path):
+        inbox_dir = tmp_path / "inbox"
+        inbox_dir.mkdir()
+        (inbox_dir / "a.txt").write_text("https://example.com/a\n")
+        (inbox_dir / "b.md").write_text("Notes\nacross lines")
+        (inbox_dir / "c.tmp").write_text("partial")
+        state = tmp_path / "state.json"
+        
+        items = drain(Inbox(inbox_dir, state))
+        
+        assert {item.key for item in items} == {"a.txt", "b.md"}
+        assert list(Inbox(inbox_dir, state).pending()) == []
+        
+        (inbox_dir / "d.txt").write_text("new")
+        assert [item.key for item in drain(Inbox(inbox_dir, state))] == ["d.txt"]
+
+
+class TestWatchers:
+    """Tests for change watchers."""
+    
+    def test_open_watcher_reports_append(self, tmp_path):
+        path = tmp_path / "inbox.txt"
+        path.write_text("")
+        watcher = open_watcher(path, interval=0.05)
+        try:
+            assert watcher.wait(timeout=0.1) is False
+            threading.Timer(0.05, lambda: path.write_text("https://example.com\n")).start()
+            assert watcher.wait(timeout=5) is True
+        finally:
+            watcher.close()
+    
+    def test_polling_watcher_reports_new_file(self, tmp_path):
+        watcher = PollingWatcher(tmp_path, interval=0.01)
+        
+        assert watcher.wait(timeout=0.05) is False
+        (tmp_path / "item.txt").write_text("x")
+        assert watcher.wait(timeout=1) is True
@@ -0,0 +1,292 @@
+"""Tests for the durable job queue and pipeline workers."""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.infra.queue.base import DEAD, DONE, LEASED, READY, LeaseLost, open_job_queue
+from src.infra.queue.sqlite_queue import SQLiteJobQueue
+from src.modules.agent.dto import ContentDTO
+from src.modules.agent.service.calendar import CalendarTarget
+from src.modules.agent.worker import EXTRACT, FETCH, SCHEDULE, SUMMARIZE, Worker, retry_delay, submit
+
+
+def sqlite_queue(tmp_path):
+    return SQLiteJobQueue(tmp_path / "jobs.sqlite3")
+
+
+def redis_queue(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    from src.infra.queue.redis_queue import RedisJobQueue
+    return RedisJobQueue(fakeredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture(params=[sqlite_queue, redis_queue], ids=["sqlite", "redis"])
+def queue(request, tmp_path):
+    queue = request.param(tmp_path)
+    yield queue
+    queue.close()
+
+
+class TestJobQueue:
+    """Backend-independent queue semantics."""
+
+    def test_lease_hides_job_until_completed(self, queue):
+        job_id = queue.enqueue("fetch", {"url": "https://example.com"})
+
+        job = queue.lease(["fetch"], "w1", visibility_timeout=60)
+
+        assert job.id == job_id
+        assert job.payload == {"url": "https://example.com"}
+        assert job.attempts == 1
+        assert queue.lease(["fetch"], "w2", visibility_timeout=60) is None
+        queue.complete(job, {"chars": 10})
+        assert queue.job(job_id)["status"] == DONE
+        assert queue.job(job_id)["result"] == {"chars": 10}
+
+    def test_leases_only_requested_queues_oldest_first(self, queue):
+        queue.enqueue("summarize", {"n": 1})
+        first = queue.enqueue("fetch", {"n": 2})
+        queue.enqueue("fetch", {"n": 3})
+
+        assert queue.lease(["fetch"], "w1", 60).id == first
+        assert queue.lease(["extract"], "w1", 60) is None
+
+    def test_delayed_job_is_not_visible_yet(self, queue):
+        queue.enqueue("fetch", {}, delay=60)
+
+        assert queue.lease(["fetch"], "w1", 60) is None
+
+    def test_expired_lease_is_handed_to_another_worker(self, queue):
+        queue.enqueue("fetch", {})
+        stale = queue.lease(["fetch"], "w1", visibility_timeout=0.05)
+        time.sleep(0.1)
+
+        job = queue.lease(["fetch"], "w2", visibility_timeout=60)
+
+        assert job.id == stale.id
+        assert job.attempts == 2
+        with pytest.raises(LeaseLost):
+            queue.complete(stale)
+        queue.complete(job)
+
+    def test_extend_keeps_job_leased(self, queue):
+        queue.enqueue("fetch", {})
+        job = queue.lease(["fetch"], "w1", visibility_timeout=0.1)
+
+        queue.extend(job, 60)
+        time.sleep(0.15)
+
+        assert queue.lease(["fetch"], "w2", 60) is None
+
+    def test_failed_job_is_retried_until_max_attempts(self, queue):
+        job_id = queue.enqueue("fetch", {}, max_attempts=2)
+
+        assert queue.fail(queue.lease(["fetch"], "w1", 60), "boom", retry_delay=0) is True
+        job = queue.lease(["fetch"], "w1", 60)
+        assert job.attempts == 2
+        assert queue.fail(job, "boom again", retry_delay=0) is False
+
+        assert queue.lease(["fetch"], "w1", 60) is None
+        assert queue.job(job_id)["status"] == DEAD
+        assert queue.job(job_id)["last_error"] == "boom again"
+
+    def test_fail_without_retry_delay_is_dead(self, queue):
+        job_id = queue.enqueue("fetch", {})
+
+        assert queue.fail(queue.lease(["fetch"], "w1", 60), "bad input") is False
+        assert queue.job(job_id)["status"] == DEAD
+
+    def test_expired_lease_after_last_attempt_is_dead(self, queue):
+        job_id = queue.enqueue("fetch", {}, max_attempts=1)
+        queue.lease(["fetch"], "w1", visibility_timeout=0.05)
+        time.sleep(0.1)
+
+        assert queue.lease(["fetch"], "w2", 60) is None
+        assert queue.job(job_id)["status"] == DEAD
+
+    def test_stats(self, queue):
+        queue.enqueue("fetch", {})
+        queue.enqueue("fetch", {})
+        queue.lease(["fetch"], "w1", 60)
+
+        stats = {s.queue: s.counts for s in queue.stats()}
+
+        assert stats["fetch"][READY] == 1
+        assert stats["fetch"][LEASED] == 1
+
+
+class TestRedisJobQueue:
+    """Redis-specific claim semantics."""
+
+    def test_interrupted_claim_leaves_job_ready(self, tmp_path):
+        queue = redis_queue(tmp_path)
+        job_id = queue.enqueue("fetch", {})
+        from redis.client import Pipeline
+
+        with patch.object(Pipeline, "execute", side_effect=ConnectionError("worker died")):
+            with pytest.raises(ConnectionError):
+                queue.lease(["fetch"], "w1", 60)
+
+        job = queue.lease(["fetch"], "w2", 60)
+        assert job.id == job_id
+        assert job.attempts == 1
+
+    def test_concurrent_workers_lease_each_job_once(self, tmp_path):
+        queue = redis_queue(tmp_path)
+        job_ids = {queue.enqueue("fetch", {"n": n}) for n in range(40)}
+        leased, lock = [], threading.Lock()
+
+        def work(owner):
+            while (job := queue.lease(["fetch"], owner, 60)) is not None:
+                with lock:
+                    leased.append(job.id)
+
+        threads = [threading.Thread(target=work, args=(f"w{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(leased) == sorted(job_ids)
+
+
+class TestOpenJobQueue:
+    """Tests for open_job_queue."""
+
+    def test_sqlite_url(self, tmp_path):
+        queue = open_job_queue(f"sqlite:///{tmp_path / 'jobs.sqlite3'}")
+
+        assert isinstance(queue, SQLiteJobQueue)
+        assert queue.path == tmp_path / "jobs.sqlite3"
+
+    def test_unknown_scheme(self):
+        with pytest.raises(ValueError, match="Unsupported job queue URL scheme"):
+            open_job_queue("amqp://localhost")
+
+
+@pytest.fixture
+def agent_service(make_agent_service):
+    return make_agent_service(actions=("Read the docs", "Write tests"))
+
+
+class TestWorker:
+    """Tests for the pipeline Worker."""
+
+    def test_runs_all_stages(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        worker = Worker(queue, agent_service)
+        fetch_id = submit(queue, url="https://example.com/a", auto_schedule=True)
+
+        while worker.run_once():
+            pass
+
+        assert queue.job(fetch_id)["status"] == DONE
+        assert {s.queue: s.counts for s in queue.stats()} == {
+            FETCH: {DONE: 1}, SUMMARIZE: {DONE: 1}, EXTRACT: {DONE: 1}, SCHEDULE: {DONE: 2}
+        }
+        summarized = agent_service.summarize.call_args.args[0]
+        assert summarized.text == "Article text"
+        assert agent_service.schedule_action.call_count == 2
+        assert agent_service.schedule_action.call_args.kwargs["source_link"] == "https://example.com/a"
+        agent_service.mark_processed.assert_called_once_with("https://example.com/a")
+
+    def test_item_is_not_processed_until_every_schedule_job_is_done(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        worker = Worker(queue, agent_service)
+        submit(queue, url="https://example.com/a", auto_schedule=True)
+        agent_service.schedule_action.side_effect = ValueError("Calendar account is not authorized")
+
+        while worker.run_once():
+            pass
+
+        assert {s.queue: s.counts for s in queue.stats()}[SCHEDULE] == {DEAD: 2}
+        agent_service.mark_processed.assert_not_called()
+
+    def test_schedules_each_action_into_each_calendar(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        worker = Worker(queue, agent_service)
+        submit(queue, text="Some text", auto_schedule=True, calendars=["alice", "bob/team"])
+
+        while worker.run_once():
+            pass
+
+        scheduled = {
+            (call.args[0], call.kwargs["target"]) for call in agent_service.schedule_action.call_args_list
+        }
+        assert scheduled == {
+            (action, target)
+            for action in ("Read the docs", "Write tests")
+            for target in (CalendarTarget("alice"), CalendarTarget("bob", "team"))
+        }
+
+    def test_without_auto_schedule_records_actions(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        worker = Worker(queue, agent_service)
+        submit(queue, text="Some text")
+
+        while worker.run_once():
+            pass
+
+        agent_service.schedule_action.assert_not_called()
+        stats = {s.queue: s.counts for s in queue.stats()}
+        assert SCHEDULE not in stats
+        assert stats[EXTRACT] == {DONE: 1}
+
+    def test_serves_only_its_stages(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        submit(queue, text="Some text")
+
+        while Worker(queue, agent_service, stages=(FETCH,)).run_once():
+            pass
+
+        agent_service.summarize.assert_not_called()
+        assert {s.queue: s.counts for s in queue.stats()}[SUMMARIZE] == {READY: 1}
+
+    def test_transient_error_is_retried_with_backoff(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        agent_service.process_content.side_effect = ConnectionError("timeout")
+        job_id = submit(queue, url="https://example.com/a")
+
+        Worker(queue, agent_service).run_once()
+
+        job = queue.job(job_id)
+        assert job["status"] == READY
+        assert job["last_error"] == "ConnectionError: timeout"
+        # Backing off: not visible yet
+        assert queue.lease([FETCH], "w", 60) is None
+
+    def test_bad_input_is_dead_at_once(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        agent_service.process_content.side_effect = ValueError("Invalid URL")
+        job_id = submit(queue, url="notaurl")
+
+        Worker(queue, agent_service).run_once()
+
+        assert queue.job(job_id)["status"] == DEAD
+
+    def test_heartbeat_extends_lease_of_slow_job(self, tmp_path, agent_service):
+        queue = sqlite_queue(tmp_path)
+        agent_service.process_content.side_effect = lambda **kwargs: (
+            time.sleep(0.5), ContentDTO(text="Slow", source_type="text")
+        )[1]
+        job_id = submit(queue, text="Slow")
+
+        Worker(queue, agent_service, stages=(FETCH,), visibility_timeout=0.2).run_once()
+
+        job = queue.job(job_id)
+        assert job["status"] == DONE
+        assert job["attempts"] == 1
+
+    def test_submit_requires_input(self, tmp_path):
+        with pytest.raises(ValueError, match="Either url, text or path"):
+            submit(sqlite_queue(tmp_path))
+
+    def test_unknown_stage(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown stages"):
+            Worker(sqlite_queue(tmp_path), MagicMock(), stages=("render",))
+
+    def test_retry_delay_is_exponential_and_capped(self):
+        assert [retry_delay(n) for n in (1, 2, 3)] == [5, 10, 20]
+        assert retry_delay(20) == 600
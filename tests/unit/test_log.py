@@ -0,0 +1,61 @@
+"""Tests for logging helpers."""
+import json
+import logging
+import queue
+import sys
+from src.core.log import JsonFormatter, RecordQueueHandler
+
+
+def _record(msg, *args, exc_info=None, level=logging.INFO):
+    return logging.LogRecord("src.test", level, __file__, 10, msg, args, exc_info)
+
+
+def _exc_info():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        return sys.exc_info()
+
+
+class TestRecordQueueHandler:
+    """Tests for RecordQueueHandler."""
+    
+    def test_prepare_merges_args(self):
+        handler = RecordQueueHandler(queue.Queue())
+        
+        record = handler.prepare(_record("Extracted %d actions from %s", 3, "article"))
+        
+        assert record.msg == "Extracted 3 actions from article"
+        assert record.args is None
+    
+    def test_prepare_keeps_traceback_out_of_message(self):
+        handler = RecordQueueHandler(queue.Queue())
+        
+        record = handler.prepare(_record("Failed: %s", "boom", exc_info=_exc_info(), level=logging.ERROR))
+        
+        assert record.msg == "Failed: boom"
+        assert record.exc_info is None
+        assert "ValueError: boom" in record.exc_text
+
+
+class TestJsonFormatter:
+    """Tests for JsonFormatter."""
+    
+    def test_format_line(self):
+        entry = json.loads(JsonFormatter().format(_record("hello %s", "world")))
+        
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "src.test"
+        assert "exception" not in entry
+    
+    def test_format_exception_and_error_id(self):
+        record = _record("failed", exc_info=_exc_info(), level=logging.ERROR)
+        record.error_id = "abc"
+        
+        line = JsonFormatter().format(record)
+        
+        assert "\n" not in line
+        entry = json.loads(line)
+        assert entry["error_id"] == "abc"
+        assert "ValueError: boom" in entry["exception"]
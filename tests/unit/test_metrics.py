@@ -0,0 +1,84 @@
+"""Tests for the metrics registry."""
+import json
+import pytest
+from src.core.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestSpans:
+    """Tests for MetricsRegistry.span."""
+    
+    def test_span_records_timing(self, registry):
+        with registry.span("summarize", chars=100):
+            pass
+        
+        [timing] = registry.timings()
+        assert timing.name == "summarize"
+        assert timing.kind == "stage"
+        assert timing.calls == 1
+        assert timing.errors == 0
+    
+    def test_span_records_error_and_reraises(self, registry):
+        with pytest.raises(ValueError):
+            with registry.span("fetch"):
+                raise ValueError("boom")
+        
+        [span] = registry.spans()
+        assert span.error == "ValueError"
+        assert 'agent_span_total{kind="stage",span="fetch",status="error"} 1' in registry.to_prometheus()
+    
+    def test_nested_span_has_parent(self, registry):
+        with registry.span("fetch"):
+            with registry.span("http.get", kind="call"):
+                pass
+        
+        inner, outer = registry.spans()
+        assert inner.parent == "fetch"
+        assert outer.parent is None
+    
+    def test_size_and_cache_attributes_become_counters(self, registry):
+        with registry.span("http.get", kind="call") as span:
+            span.set(bytes=2048, cache_hit=False)
+        with registry.span("http.get", kind="call", bytes=1024, cache_hit=True):
+            pass
+        
+        output = registry.to_prometheus()
+        assert 'agent_bytes_total{span="http.get"} 3072' in output
+        assert 'agent_cache_total{result="hit",span="http.get"} 1' in output
+        assert 'agent_cache_total{result="miss",span="http.get"} 1' in output
+
+
+class TestExport:
+    """Tests for metrics exporters."""
+    
+    def test_prometheus_histogram(self, registry):
+        registry.observe("latency_seconds", 0.02, span="x")
+        registry.observe("latency_seconds", 3.0, span="x")
+        
+        output = registry.to_prometheus()
+        assert "# TYPE latency_seconds histogram" in output
+        assert 'latency_seconds_bucket{span="x",le="0.025"} 1' in output
+        assert 'latency_seconds_bucket{span="x",le="+Inf"} 2' in output
+        assert 'latency_seconds_count{span="x"} 2' in output
+    
+    def test_write_json(self, registry, tmp_path):
+        with registry.span("extract"):
+            pass
+        
+        path = registry.write(tmp_path / "metrics.json")
+        
+        data = json.loads(path.read_text())
+        assert data["timings"][0]["name"] == "extract"
+        assert "agent_span_duration_seconds" in data["histograms"]
+    
+    def test_write_textfile(self, registry, tmp_path):
+        registry.inc("events_total", 3)
+        
+        path = registry.write(tmp_path / "agent.prom")
+        
+        assert "events_total 3" in path.read_text()
+        assert list(tmp_path.iterdir()) == [path]
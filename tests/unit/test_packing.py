@@ -0,0 +1,167 @@
+"""Tests for multi-item prompt packing."""
+import json
+import re
+from unittest.mock import MagicMock, patch
+
+from src.modules.agent.dto import ContentDTO
+from src.modules.agent.service import ai
+from src.modules.agent.service.agent import AgentService
+from src.modules.agent.service.ai import AIService, pack
+from src.modules.agent.service.fingerprint import FingerprintIndex
+
+
+def packed_response(prompt: str, **kwargs) -> str:
+    ids = re.findall(r'<item id="(\d+)">', prompt)
+    return json.dumps([{"id": int(i), "summary": f"- point {i}", "actions": [f"Task {i}"]} for i in ids])
+
+
+class TestPack:
+    """Tests for pack."""
+
+    def test_respects_token_budget_and_item_limit(self):
+        texts = ["x" * 400] * 5  # ~100 tokens each
+
+        assert list(pack(texts, token_budget=250, max_items=10)) == [[0, 1], [2, 3], [4]]
+        assert list(pack(texts, token_budget=10_000, max_items=3)) == [[0, 1, 2], [3, 4]]
+
+    def test_oversized_text_gets_its_own_batch(self):
+        assert list(pack(["a", "x" * 4000, "b"], token_budget=100, max_items=10)) == [[0], [1], [2]]
+
+
+class TestParsePacked:
+    """Tests for _parse_packed."""
+
+    def test_valid_response_in_any_order(self):
+        text = json.dumps([
+            {"id": 1, "summary": "- b", "actions": ["Do b"]},
+            {"id": 0, "summary": "- a", "actions": [" Do a ", ""]},
+        ])
+
+        assert ai._parse_packed(text, 2) == {0: ("- a", ["Do a"]), 1: ("- b", ["Do b"])}
+
+    def test_code_fence_and_wrapper_object(self):
+        text = '```json\n{"items": [{"id": "0", "summary": "- a", "actions": []}]}\n```'
+
+        assert ai._parse_packed(text, 1) == {0: ("- a", [])}
+
+    def test_malformed_entries_are_dropped(self):
+        text = json.dumps([
+            {"id": 0, "summary": "", "actions": []},
+            {"id": 1, "summary": "- b", "actions": "Do b"},
+            {"id": 2, "summary": "- c", "actions": ["Do c"]},
+            {"id": 2, "summary": "- c again", "actions": []},
+            {"id": 7, "summary": "- out of range", "actions": []},
+            "junk",
+        ])
+
+        assert ai._parse_packed(text, 3) == {2: ("- c", ["Do c"])}
+
+    def test_invalid_json(self):
+        assert ai._parse_packed("Sure! Here are the summaries:", 2) == {}
+
+
+class TestSummarizePacked:
+    """Tests for AIService.summarize_packed."""
+
+    def test_one_request_for_all_items(self):
+        with patch.object(ai, '_generate', side_effect=packed_response) as mock_generate:
+            results = AIService.summarize_packed(["first", "second", "third"])
+
+        assert results == [("- point 0", ["Task 0"]), ("- point 1", ["Task 1"]), ("- point 2", ["Task 2"])]
+        mock_generate.assert_called_once()
+        assert mock_generate.call_args.kwargs["json_output"] is True
+
+    def test_missing_item_falls_back_to_individual_calls(self):
+        def generate(prompt, json_output=False, **kwargs):
+            if json_output:
+                return json.dumps([{"id": 0, "summary": "- point 0", "actions": ["Task 0"]}])
+            return "- single point" if prompt.startswith(ai.SUMMARY_PROMPT) else "1. Single task"
+
+        with patch.object(ai, '_generate', side_effect=generate) as mock_generate:
+            results = AIService.summarize_packed(["first", "second"])
+
+        assert results == [("- point 0", ["Task 0"]), ("- single point", ["Single task"])]
+        prompts = [call.args[0] for call in mock_generate.call_args_list]
+        assert prompts[1] == ai.SUMMARY_PROMPT + "second"
+        assert prompts[2] == ai.ACTIONS_PROMPT + "- single point"
+
+    def test_failed_fallback_is_reported_in_its_own_slot(self):
+        def generate(prompt, json_output=False, **kwargs):
+            if json_output:
+                return json.dumps([{"id": 0, "summary": "- point 0", "actions": ["Task 0"]}])
+            raise RuntimeError("429 Too Many Requests")
+
+        with patch.object(ai, '_generate', side_effect=generate):
+            results = AIService.summarize_packed(["first", "second"])
+
+        assert results[0] == ("- point 0", ["Task 0"])
+        assert isinstance(results[1], RuntimeError)
+
+
+class TestAgentSummarizePacked:
+    """Tests for AgentService.summarize_packed."""
+
+    def make_agent(self, fingerprint_index=None):
+        agent = AgentService(fingerprint_index=fingerprint_index)
+        agent.fingerprint_index = fingerprint_index
+        agent.action_index = None
+        agent.ai_service = MagicMock()
+        agent.ai_service.summarize_packed.side_effect = lambda texts: [
+            (f"- packed {text}", [f"Do {text}"]) for text in texts
+        ]
+        agent.ai_service.summarize_text.return_value = "- long summary"
+        agent.ai_service.extract_actions.return_value = ["Long task"]
+        agent.pack_max_item_chars = 100
+        agent.pack_token_budget = 1000
+        agent.pack_max_items = 2
+        return agent
+
+    def test_short_items_are_packed_and_long_ones_processed_alone(self):
+        agent = self.make_agent()
+        contents = [
+            ContentDTO(text="a", source_type="direct text"),
+            ContentDTO(text="x" * 500, source_type="article"),
+            ContentDTO(text="b", source_type="direct text"),
+            ContentDTO(text="c", source_type="direct text"),
+        ]
+
+        results = agent.summarize_packed(contents)
+
+        assert [(summary.points, actions) for summary, actions in results] == [
+            ("- packed a", ["Do a"]), ("- long summary", ["Long task"]), ("- packed b", ["Do b"]), ("- packed c", ["Do c"])
+        ]
+        assert results[1][0].character_count == 500
+        # PACK_MAX_ITEMS = 2: a and b share a request, c gets the next one
+        assert [call.args[0] for call in agent.ai_service.summarize_packed.call_args_list] == [["a", "b"], ["c"]]
+
+    def test_failed_batch_is_reported_per_item(self):
+        agent = self.make_agent()
+        agent.ai_service.summarize_packed.side_effect = RuntimeError("quota exceeded")
+
+        results = agent.summarize_packed([ContentDTO(text="a", source_type="direct text")])
+
+        assert isinstance(results[0], RuntimeError)
+
+    def test_failed_item_keeps_the_rest_of_its_batch(self):
+        agent = self.make_agent()
+        agent.ai_service.summarize_packed.side_effect = lambda texts: [
+            ("- packed a", ["Do a"]), RuntimeError("429 Too Many Requests")
+        ]
+
+        results = agent.summarize_packed([
+            ContentDTO(text="a", source_type="direct text"), ContentDTO(text="b", source_type="direct text")
+        ])
+
+        assert (results[0][0].points, results[0][1]) == ("- packed a", ["Do a"])
+        assert isinstance(results[1], RuntimeError)
+
+    def test_results_are_stored_and_reused(self, tmp_path):
+        agent = self.make_agent(FingerprintIndex(tmp_path / "fingerprints.sqlite3"))
+        content = ContentDTO(text="a tweet about trying the new tool", source_type="direct text")
+
+        first = agent.summarize_packed([content])
+        second = agent.summarize_packed([content])
+
+        assert second == first
+        agent.ai_service.summarize_packed.assert_called_once()
+        agent.ai_service.extract_actions.assert_not_called()
@@ -0,0 +1,35 @@
+"""Tests for profiling hooks."""
+import pstats
+import tracemalloc
+from src.core.profiling import ProfileMode, profile
+
+
+def _busy_work():
+    return sum(i * i for i in range(200_000))
+
+
+class TestProfile:
+    """Tests for the profile context manager."""
+    
+    def test_cpu_profile_writes_pstats_and_collapsed(self, tmp_path):
+        with profile(ProfileMode.cpu, output_dir=tmp_path, top=20) as report:
+            _busy_work()
+        
+        pstats_path, collapsed_path = report.files
+        assert pstats_path.suffix == ".pstats"
+        assert pstats.Stats(str(pstats_path)).total_calls > 0
+        assert collapsed_path.suffix == ".collapsed"
+        for line in collapsed_path.read_text().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert "test_profiling.py" in report.summary
+    
+    def test_mem_profile_writes_snapshot(self, tmp_path):
+        with profile(ProfileMode.mem, output_dir=tmp_path, top=5) as report:
+            data = [bytes(1024) for _ in range(100)]
+        
+        [snapshot_path] = report.files
+        assert tracemalloc.Snapshot.load(str(snapshot_path)).traces
+        assert "peak" in report.summary
+        assert not tracemalloc.is_tracing()
+        assert data
@@ -0,0 +1,115 @@
+"""Tests for the cross-process quota manager."""
+import multiprocessing
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from src.core.quota import GEMINI_REQUESTS, GEMINI_TOKENS, QuotaLimit, QuotaManager, QuotaTimeout
+from src.modules.agent.service import ai
+
+
+def make_manager(path, capacity=5, per_second=50.0):
+    return QuotaManager(path, {"test": QuotaLimit(capacity, per_second)}, poll_interval=0.01)
+
+
+def _worker(path, name, count, results):
+    manager = make_manager(path)
+    for _ in range(count):
+        manager.acquire("test")
+        results.put((name, time.time()))
+
+
+class TestQuotaManager:
+    """Tests for QuotaManager."""
+    
+    def test_burst_then_refill_rate(self, tmp_path):
+        manager = make_manager(tmp_path / "quota.sqlite3", capacity=5, per_second=50)
+        
+        start = time.monotonic()
+        for _ in range(15):
+            manager.acquire("test")
+        
+        # 5 from the burst, 10 refilled at 50/s
+        assert time.monotonic() - start >= 0.18
+    
+    def test_waits_without_polling_the_database(self, tmp_path):
+        manager = make_manager(tmp_path / "quota.sqlite3", capacity=1, per_second=5)
+        manager.acquire("test")
+        transaction = manager._transaction
+        calls = []
+        manager._transaction = lambda: calls.append(1) or transaction()
+        
+        assert manager.acquire("test") >= 0.15
+        # Enqueue, a check before and after sleeping until the refill: not one per poll_interval
+        assert len(calls) <= 5
+    
+    def test_consume_and_drain(self, tmp_path):
+        manager = make_manager(tmp_path / "quota.sqlite3", capacity=10, per_second=0.001)
+        
+        manager.consume("test", 4)
+        assert manager.available("test") == pytest.approx(6, abs=0.01)
+        manager.drain("test")
+        assert manager.available("test") < 0.01
+    
+    def test_timeout(self, tmp_path):
+        manager = make_manager(tmp_path / "quota.sqlite3", capacity=1, per_second=0.01)
+        manager.acquire("test")
+        
+        with pytest.raises(QuotaTimeout):
+            manager.acquire("test", timeout=0.05)
+        # The abandoned wait left no queued ticket behind
+        manager.limits["test"] = QuotaLimit(1, 1000)
+        assert manager.acquire("test", timeout=1) < 1
+    
+    def test_unknown_bucket_is_unlimited(self, tmp_path):
+        assert make_manager(tmp_path / "quota.sqlite3").acquire("other", 1e9) == 0.0
+    
+    def test_shared_fairly_across_processes(self, tmp_path):
+        path = tmp_path / "quota.sqlite3"
+        make_manager(path).acquire("test", 5)  # start with an empty bucket
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [context.Process(target=_worker, args=(path, name, 10, results)) for name in "abc"]
+        start = time.time()
+        for worker in workers:
+            worker.start()
+        served = [results.get(timeout=20) for _ in range(30)]
+        for worker in workers:
+            worker.join(timeout=5)
+        
+        # 30 tokens at 50/s across all processes: the limit is host-wide
+        assert max(t for _, t in served) - start >= 0.5
+        # Round-robin by process: in the first half, every process got a fair share
+        first_half = [name for name, _ in sorted(served, key=lambda item: item[1])[:15]]
+        assert all(first_half.count(name) >= 3 for name in "abc")
+
+
+class TestGenerateQuota:
+    """Tests for quota use around Gemini calls."""
+    
+    def test_reserves_and_reconciles_tokens(self):
+        quota = MagicMock()
+        client = MagicMock()
+        client.models.generate_content.return_value = MagicMock(
+            text="• Point", usage_metadata=MagicMock(total_token_count=1000)
+        )
+        
+        with patch.object(ai, "get_quota_manager", return_value=quota), patch.object(ai, "get_genai_client", return_value=client):
+            assert ai._generate("x" * 400) == "• Point"
+        
+        estimate = 100 + ai.EXPECTED_OUTPUT_TOKENS
+        quota.acquire.assert_any_call(GEMINI_REQUESTS)
+        quota.acquire.assert_any_call(GEMINI_TOKENS, estimate)
+        quota.consume.assert_called_once_with(GEMINI_TOKENS, 1000 - estimate)
+    
+    def test_rate_limit_drains_shared_quota(self):
+        quota = MagicMock()
+        client = MagicMock()
+        error = RuntimeError("429 RESOURCE_EXHAUSTED")
+        error.code = 429
+        client.models.generate_content.side_effect = error
+        
+        with patch.object(ai, "get_quota_manager", return_value=quota), patch.object(ai, "get_genai_client", return_value=client):
+            with pytest.raises(RuntimeError):
+                ai._generate("prompt")
+        
+        quota.drain.assert_called_once_with(GEMINI_REQUESTS)
@@ -0,0 +1,57 @@
+"""Import-time budget for CLI startup."""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative `import cli` time, in milliseconds; override on slow machines
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 120))
+
+# Heavy dependencies that must only be loaded once a command actually needs them
+LAZY_MODULES = [
+    "google.genai",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "bs4",
+    "requests",
+    "youtube_transcript_api",
+    "pydantic_settings",
+    "numpy",
+    "src.modules.agent.service.agent",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@pytest.fixture(scope="module")
+def cli_imports() -> dict[str, int]:
+    """Run `python -X importtime -c 'import cli'` and return cumulative microseconds per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import cli"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            imports[match.group(4)] = int(match.group(2))
+    return imports
+
+
+class TestStartup:
+    """Tests for CLI startup cost."""
+    
+    @pytest.mark.parametrize("module", LAZY_MODULES)
+    def test_heavy_module_not_imported(self, cli_imports, module):
+        assert module not in cli_imports
+    
+    def test_import_time_budget(self, cli_imports):
+        assert cli_imports["cli"] / 1000 < IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,121 @@
+"""Tests for the segmented transcript model."""
+import threading
+
+import pytest
+
+from src.core.transcript import Transcript, TranscriptCache, TranscriptSegment
+from src.modules.agent.dto import ContentDTO
+from src.modules.agent.service.content import ContentService
+
+
+def make_transcript():
+    return Transcript.from_segments("abcdefghijk", [
+        ("Welcome to  the show", 0.0, 2.5),
+        ("", 2.5, 0.5),
+        ("today we review vector databases", 3.0, 4.0),
+        ("then benchmark the index", 7.0, 3.0),
+        ("thanks for watching", 10.0, 2.0),
+    ])
+
+
+class TestTranscript:
+    """Tests for Transcript."""
+    
+    def test_from_segments_normalizes_and_drops_empty(self):
+        transcript = make_transcript()
+        
+        assert len(transcript) == 4
+        assert transcript.text.startswith("Welcome to the show today we review")
+        assert transcript.segment(1) == TranscriptSegment("today we review vector databases", 3.0, 4.0)
+        assert transcript.duration == 12.0
+    
+    def test_time_at_char_offset(self):
+        transcript = make_transcript()
+        
+        assert transcript.time_at(transcript.text.index("benchmark")) == 7.0
+        assert transcript.time_at(0) == 0.0
+    
+    def test_chunks_follow_segment_boundaries(self):
+        transcript = make_transcript()
+        
+        chunks = list(transcript.chunks(60))
+        
+        assert " ".join(chunks) == transcript.text
+        assert len(chunks) == 2
+        assert all(len(chunk) <= 60 for chunk in chunks)
+        assert chunks[1] == "then benchmark the index thanks for watching"
+    
+    def test_trim_keeps_whole_segments(self):
+        trimmed = make_transcript().trim(25)
+        
+        assert trimmed.text == "Welcome to the show"
+        assert len(trimmed) == 1
+    
+    def test_bytes_roundtrip(self):
+        transcript = make_transcript()
+        
+        restored = Transcript.from_bytes(transcript.to_bytes())
+        
+        assert restored.video_id == transcript.video_id
+        assert restored.text == transcript.text
+        assert list(restored) == list(transcript)
+    
+    def test_locate_and_url_at(self):
+        transcript = make_transcript()
+        
+        seconds = transcript.locate("Benchmark the vector index")
+        
+        assert seconds == 3.0
+        assert transcript.url_at(seconds) == f"https://youtu.be/abcdefghijk?t={int(seconds)}"
+        assert transcript.locate("Call the dentist") is None
+
+
+class TestTranscriptCache:
+    """Tests for TranscriptCache."""
+    
+    def test_put_and_get(self, tmp_path):
+        cache = TranscriptCache(tmp_path)
+        
+        assert cache.get("abcdefghijk") is None
+        cache.put(make_transcript())
+        
+        assert "abcdefghijk" in cache
+        assert cache.get("abcdefghijk").text == make_transcript().text
+    
+    @pytest.mark.parametrize("damage", [lambda data: data[:-3], lambda data: data[:5], lambda data: data[:30] + b"\x00" * 40])
+    def test_corrupt_entry_is_a_miss(self, tmp_path, damage):
+        cache = TranscriptCache(tmp_path)
+        cache.put(make_transcript())
+        path = tmp_path / "abcdefghijk.bin"
+        path.write_bytes(damage(path.read_bytes()))
+        
+        assert cache.get("abcdefghijk") is None
+        assert not path.exists()
+    
+    def test_concurrent_puts_leave_a_complete_entry(self, tmp_path):
+        cache = TranscriptCache(tmp_path)
+        threads = [threading.Thread(target=cache.put, args=(make_transcript(),)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert cache.get("abcdefghijk").text == make_transcript().text
+        assert [path.name for path in tmp_path.iterdir()] == ["abcdefghijk.bin"]
+
+
+class TestSourceLink:
+    """Tests for ContentService.source_link."""
+    
+    def test_links_to_transcript_timestamp(self):
+        content = ContentDTO(
+            text="...", source_type="YouTube Transcript",
+            source_url="https://youtube.com/watch?v=abcdefghijk", transcript=make_transcript()
+        )
+        
+        assert ContentService.source_link(content, "Review vector databases") == "https://youtu.be/abcdefghijk?t=3"
+    
+    def test_falls_back_to_source_url(self):
+        content = ContentDTO(text="...", source_type="Article", source_url="https://example.com/a")
+        
+        assert ContentService.source_link(content, "Read more") == "https://example.com/a"